@@ -1,18 +1,55 @@
 import streamlit as st
+import io
 import uuid
+import tempfile
 from datetime import datetime
 from core.config_manager import ConfigManager
 from core.db import (
-    init_db, save_jd, save_resume, save_evaluation,
+    init_db, save_resume,
     get_jds, get_resumes_by_jd, get_evaluations_by_jd,
     get_unreviewed_resumes_by_jd, get_evaluations_by_jd_and_tier,
-    mark_resume_reviewed
+    get_jd_stats, CANDIDATE_TIERS, save_pool_resume,
+    count_provisional_evaluations, get_runs, set_resume_priority_flag, search_evaluations
 )
-from core.duplicate_guard import register_file_or_skip
+from core.cache import get_cache_stats, clear_cache
+from core.llm_client import get_llm_latency_stats
+from core.tracing import (
+    trace_batch, enable_tracing, tracing_enabled,
+    stage_histograms, get_last_batch, export_chrome_trace
+)
+from core.ingest_buffer import admit
+from core.duplicate_guard import register_file_or_skip, compute_file_hash
+from core.text_store import save_text
+from core.identity import lookup_upload, register_identity, identity_keys
 from core.utils import extract_text
-from core.jd_parser import parse_jd
+from core.jd_ingest import ingest_jd_files
 from core.resume_parser import parse_resume
-from core.scorer import score_resume, assign_candidate_tier
+from core.matching import match_pool
+from core.live_results import ResultsSubscription, LIVE_POLL_SECONDS
+from core.anytime_ranking import rank_anytime
+from core.rescore import rescore_provisional
+from core.retention import close_jd, archive_jd, restore_jd
+from core.run_planner import run_evaluation, resume_run, plan_run, usage_report, PRIORITIES
+from core.export import export_evaluations, EXPORT_FORMATS
+from core.skills import resume_skills
+
+POOL_OPTION = "__shared_pool__"
+
+
+def format_run_usage(run: dict) -> str:
+    report = usage_report(run)
+    actual = f"{report['actual_tokens']:,} actual" if report["actual_tokens"] is not None else "actual not reported"
+    return (
+        f"Tokens: ~{report['estimated_tokens']:,} estimated, {actual} "
+        f"({report['requests']} request(s), {report['unmetered_requests']} unmetered)"
+    )
+
+def show_oversized(oversized: list):
+    if oversized:
+        st.warning(
+            f"⚠️ {len(oversized)} resume(s) need more tokens than the whole budget and were skipped: "
+            + ", ".join(item["candidate_name"] for item in oversized)
+        )
 
 # ---------------- CONFIG ----------------
 st.set_page_config(
@@ -54,11 +91,85 @@ with st.sidebar:
     
     page = st.radio(
         "Choose a page",
-        ["📝 Upload JD", "👤 Upload Resume", "📊 Results"],
+        ["📝 Upload JD", "👤 Upload Resume", "📊 Results", "🔎 Candidate Search"],
         label_visibility="collapsed"
     )
     
     st.markdown("---")
+
+    # Diagnostics - read cache effectiveness for this server process
+    with st.expander("🩺 Diagnostics", expanded=False):
+        cache_stats = get_cache_stats()
+        st.caption(f"Cached reads: {cache_stats['entries']} entries")
+        st.dataframe(
+            [
+                {
+                    "read": name,
+                    "hits": fn["hits"],
+                    "misses": fn["misses"],
+                    "hit rate": "-" if fn["hit_rate"] is None else f"{fn['hit_rate']:.0%}"
+                }
+                for name, fn in cache_stats["functions"].items()
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+        if st.button("Clear read cache", use_container_width=True):
+            clear_cache()
+
+        # Timing spans for the ingest/scoring hot paths (core/tracing.py).
+        # The switch is process-wide: it shows the current state and only
+        # changes it when toggled, so other sessions' reruns don't reset it
+        st.session_state["trace_toggle"] = tracing_enabled()
+        st.checkbox(
+            "Record timing traces (all sessions)",
+            key="trace_toggle",
+            on_change=lambda: enable_tracing(st.session_state["trace_toggle"])
+        )
+        histograms = stage_histograms()
+        if histograms:
+            st.dataframe(
+                [
+                    {"stage": name, "count": h["count"], "p50 ms": h["p50_ms"],
+                     "p90 ms": h["p90_ms"], "p99 ms": h["p99_ms"], "total ms": h["total_ms"]}
+                    for name, h in sorted(histograms.items(), key=lambda item: -item[1]["total_ms"])
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
+        last_batch = get_last_batch()
+        if last_batch:
+            trace_file = io.StringIO()
+            export_chrome_trace(last_batch["events"], trace_file)
+            st.download_button(
+                f"Download trace: {last_batch['name']}",
+                data=trace_file.getvalue(),
+                file_name=f"{last_batch['name']}.trace.json",
+                mime="application/json",
+                use_container_width=True
+            )
+
+        llm_stats = get_llm_latency_stats()
+        if llm_stats:
+            st.caption("LLM latency by stage (recent calls)")
+            st.dataframe(
+                [
+                    {
+                        "stage": stage,
+                        "calls": stage_stats["calls"],
+                        "p50 s": stage_stats["p50"],
+                        "p90 s": stage_stats["p90"],
+                        "p99 s": stage_stats["p99"],
+                        "timeouts": stage_stats["timeouts"],
+                        "hedges": stage_stats["hedges"],
+                        "prompt tokens": stage_stats["prompt_tokens"],
+                        "completion tokens": stage_stats["completion_tokens"],
+                    }
+                    for stage, stage_stats in llm_stats.items()
+                ],
+                hide_index=True,
+                use_container_width=True
+            )
     
     # Footer Info
     st.markdown(
@@ -73,6 +184,18 @@ with st.sidebar:
 # Clean page names for logic
 page = page.split(" ", 1)[1] if " " in page else page
 
+
+def close_live_ranking():
+    subscription = st.session_state.pop("results_subscription", None)
+    if subscription is not None:
+        subscription.close()
+
+
+# The live ranking subscription (thread + change stream) only runs while
+# the Results page shows it; abandoned sessions time out on their own
+if page != "Results":
+    close_live_ranking()
+
 # ---------------- HEADER ----------------
 st.markdown(
     """
@@ -123,22 +246,23 @@ if page == "Upload JD":
             unsafe_allow_html=True
         )
         
-        jd_file = st.file_uploader(
-            "Upload JD file",
+        jd_files = st.file_uploader(
+            "Upload JD files",
             type=["pdf", "docx", "txt"],
+            accept_multiple_files=True,
             key="jd_uploader",
             help="Supported formats: PDF, DOCX, TXT",
             label_visibility="collapsed"
         )
         
-        if jd_file:
+        if jd_files:
             st.markdown(
                 f"""
                 <div style='background: #e8f5e9; padding: 1rem; border-radius: 10px; 
                             border-left: 4px solid #4caf50; margin: 1.5rem 0;'>
                     <span style='font-size: 1.2rem;'>✅</span>
-                    <strong style='color: #2e7d32;'> File Selected:</strong> 
-                    <span style='color: #1b5e20;'>{jd_file.name}</span>
+                    <strong style='color: #2e7d32;'> Files Selected:</strong> 
+                    <span style='color: #1b5e20;'>{len(jd_files)} file(s)</span>
                 </div>
                 """,
                 unsafe_allow_html=True
@@ -146,30 +270,48 @@ if page == "Upload JD":
             
             col_a, col_b, col_c = st.columns([1, 2, 1])
             with col_b:
-                if st.button("🚀 Parse & Save JD", type="primary", use_container_width=True):
-                    with st.spinner("🔄 Processing job description..."):
-                        is_new, _ = register_file_or_skip(jd_file, file_type="jd")
-                        if not is_new:
-                            st.toast("⚠️ JD already uploaded earlier", icon="⚠️")
-                        else:
-                            raw_text = extract_text(jd_file)
-                            parsed_jd = parse_jd(raw_text)
-                            jd_id = str(uuid.uuid4())
+                parse_clicked = st.button("🚀 Parse & Save JDs", type="primary", use_container_width=True)
+
+            if parse_clicked:
+                progress_bar = st.progress(0)
+                done = []
 
-                            save_jd({
-                                "jd_id": jd_id,
-                                "role": parsed_jd.get("role", "Unknown"),
-                                "parsed_jd_json": parsed_jd,
-                                "created_at": datetime.utcnow()
-                            })
+                def track(row):
+                    done.append(row)
+                    progress_bar.progress(len(done) / len(jd_files))
 
-                            st.success("✅ Job description saved successfully!")
+                with st.spinner("🔄 Processing job descriptions..."), trace_batch("upload_jds", files=len(jd_files)):
+                    rows = ingest_jd_files(jd_files, on_status=track)
+                progress_bar.empty()
+
+                saved = sum(1 for row in rows if row["status"] == "SAVED")
+                if saved:
+                    st.success(f"✅ {saved} job description(s) saved successfully!")
+                if any(row["status"] != "SAVED" for row in rows):
+                    st.toast("⚠️ Some JDs were skipped or failed", icon="⚠️")
+
+                st.dataframe(
+                    [
+                        {
+                            "File": row["file"],
+                            "Status": row["status"],
+                            "Role": row["role"] or "",
+                            "Details": row["error"] or (
+                                "Already uploaded earlier" if row["status"] == "DUPLICATE" else ""
+                            )
+                        }
+                        for row in rows
+                    ],
+                    hide_index=True,
+                    use_container_width=True
+                )
 
 # ===================================================== 
 # LAYER 2 — RESUME UPLOAD (JD-SCOPED)
 # ===================================================== 
 elif page == "Upload Resume":
-    jds = get_jds()
+    # Closed JDs take no new resumes
+    jds = [jd for jd in get_jds() if jd.get("status") != "CLOSED"]
     
     if not jds:
         st.markdown(
@@ -214,6 +356,7 @@ elif page == "Upload Resume":
         )
         
         jd_map = {jd["jd_id"]: jd["role"] for jd in jds}
+        jd_map[POOL_OPTION] = "🌐 Shared Candidate Pool (match against all JDs)"
         jd_options = ["-- Select a Job Description --"] + list(jd_map.keys())
         
         selected_jd_display = st.selectbox(
@@ -226,6 +369,7 @@ elif page == "Upload Resume":
         
         # Check if JD is selected
         selected_jd_id = None if selected_jd_display == "-- Select a Job Description --" else selected_jd_display
+        to_pool = selected_jd_id == POOL_OPTION
         
         # Resume Upload - Updated heading style
         st.markdown(
@@ -272,36 +416,69 @@ elif page == "Upload Resume":
                         
                         skipped_files = []
                         saved_count = 0
+                        reused_count = 0
 
-                        for idx, file in enumerate(resume_files):
-                            status_text.markdown(f"**Processing:** `{file.name}`")
+                        with trace_batch("upload_resumes", files=len(resume_files)):
+                            for idx, file in enumerate(resume_files):
+                                status_text.markdown(f"**Processing:** `{file.name}`")
 
-                            is_new, skipped_name = register_file_or_skip(
-                                file,
-                                file_type="resume",
-                                jd_id=selected_jd_id
-                            )
+                                # Hashing and extraction share the upload's buffer; admit() bounds
+                                # the bytes all sessions hold in extraction at once
+                                with admit(file):
+                                    file_hash = compute_file_hash(file)
+                                    is_new, skipped_name = register_file_or_skip(
+                                        file,
+                                        file_type="resume",
+                                        jd_id=None if to_pool else selected_jd_id,
+                                        file_hash=file_hash
+                                    )
+
+                                    if not is_new:
+                                        skipped_files.append(skipped_name)
+                                        continue
+
+                                    raw_text = extract_text(file)
+                                save_text(file_hash, raw_text)
 
-                            if not is_new:
-                                skipped_files.append(skipped_name)
-                                continue
+                                # Same candidate under another file name: skip if
+                                # already uploaded here, else reuse the earlier
+                                # parse of an unchanged file or text
+                                identity = lookup_upload(raw_text, file_hash)
+                                prior_resumes = identity["prior_resumes"]
+                                if any(r.get("jd_id") == (None if to_pool else selected_jd_id) for r in prior_resumes):
+                                    skipped_files.append(file.name)
+                                    continue
 
-                            raw_text = extract_text(file)
-                            parsed_resume = parse_resume(raw_text)
+                                if identity["prior_parse"]:
+                                    parsed_resume = identity["prior_parse"]
+                                    reused_count += 1
+                                else:
+                                    parsed_resume = parse_resume(raw_text)
+                                candidate_id = register_identity(
+                                    identity_keys(raw_text, parsed_resume),
+                                    identity["candidate_id"]
+                                )
 
-                            resume_id = str(uuid.uuid4())
-                            candidate_name = parsed_resume.get("candidate_name", "Unknown")
+                                resume_id = str(uuid.uuid4())
+                                candidate_name = parsed_resume.get("candidate_name", "Unknown")
 
-                            save_resume({
-                                "resume_id": resume_id,
-                                "candidate_name": candidate_name,
-                                "jd_id": selected_jd_id,
-                                "parsed_resume_json": parsed_resume,
-                                "created_at": datetime.utcnow()
-                            })
+                                resume_doc = {
+                                    "resume_id": resume_id,
+                                    "candidate_name": candidate_name,
+                                    "jd_id": selected_jd_id,
+                                    "candidate_id": candidate_id,
+                                    "file_hash": file_hash,
+                                    "parsed_resume_json": parsed_resume,
+                                    "canonical_skills": resume_skills(parsed_resume, raw_text),
+                                    "created_at": datetime.utcnow()
+                                }
+                                if to_pool:
+                                    save_pool_resume(resume_doc)
+                                else:
+                                    save_resume(resume_doc)
 
-                            saved_count += 1
-                            progress_bar.progress((idx + 1) / len(resume_files))
+                                saved_count += 1
+                                progress_bar.progress((idx + 1) / len(resume_files))
 
                         status_text.empty()
                         progress_bar.empty()
@@ -311,9 +488,12 @@ elif page == "Upload Resume":
                             st.success(f"✅ Successfully saved {saved_count} resume(s)!")
                             st.toast(f"✅ {saved_count} resume(s) saved successfully!", icon="✅")
 
+                        if reused_count:
+                            st.info(f"♻️ {reused_count} known candidate(s) reused their earlier parse")
+
                         if skipped_files:
                             st.warning(
-                                "⚠️ Skipped (already uploaded for this JD): "
+                                "⚠️ Skipped (file or candidate already uploaded for this JD): "
                                 + ", ".join(skipped_files)
                             )
 
@@ -379,6 +559,8 @@ elif page == "Results":
         
         # Check if JD is selected
         selected_jd_id = None if selected_jd_display == "-- Select a Job Description --" else selected_jd_display
+        if not selected_jd_id:
+            close_live_ranking()
     
     with col2:
         st.markdown(
@@ -401,6 +583,79 @@ elif page == "Results":
     # Run Evaluation Button
     col_a, col_b, col_c = st.columns([1, 2, 1])
     with col_b:
+        anytime_mode = st.toggle(
+            f"⚡ Stop once the top {top_n} is stable",
+            key="anytime_mode",
+            help="Score the most promising resumes first (local skill/experience prior) "
+                 "and stop when no remaining resume could plausibly reach the top"
+        )
+        with st.expander("💰 Run budget & priority"):
+            run_priority = st.selectbox(
+                "Scoring order",
+                options=PRIORITIES,
+                disabled=anytime_mode,
+                help="Stopping once the top is stable always scores the best local prior first",
+                format_func={
+                    "newest": "Newest uploads first",
+                    "prior": "Best local prior first",
+                    "flagged": "Flagged resumes first"
+                }.get,
+                key="run_priority"
+            )
+            budget_col1, budget_col2 = st.columns(2)
+            with budget_col1:
+                token_budget = st.number_input("Token budget (0 = none)", min_value=0, value=0, step=10000, key="run_token_budget")
+            with budget_col2:
+                request_budget = st.number_input("Request budget (0 = none)", min_value=0, value=0, step=10, key="run_request_budget")
+            run_budget = {"tokens": token_budget or None, "requests": request_budget or None}
+
+            if selected_jd_id:
+                selected_jd = next(jd for jd in jds if jd["jd_id"] == selected_jd_id)
+                pending = get_unreviewed_resumes_by_jd(selected_jd_id)
+
+                if run_priority == "flagged" and pending:
+                    pending_names = {resume["_id"]: resume["candidate_name"] for resume in pending}
+                    flagged = st.multiselect(
+                        "Flag resumes to score first",
+                        options=list(pending_names),
+                        default=[resume["_id"] for resume in pending if resume.get("priority_flag")],
+                        format_func=pending_names.get,
+                        key="run_flagged"
+                    )
+                    if st.button("🚩 Save Flags", use_container_width=True):
+                        set_resume_priority_flag([r for r in pending_names if r not in flagged], flagged=False)
+                        set_resume_priority_flag(flagged, flagged=True)
+                        st.rerun()
+
+                if pending and st.button("🧮 Estimate Run", use_container_width=True):
+                    plan = plan_run(selected_jd, pending, run_priority, run_budget)
+                    st.info(
+                        f"{len(plan['items'])} resume(s), ~{plan['estimated_tokens']:,} tokens; "
+                        f"the budget covers {plan['within_budget']} (~{plan['within_budget_tokens']:,} tokens)"
+                    )
+                    if plan["oversized"]:
+                        st.warning(
+                            f"⚠️ {len(plan['oversized'])} resume(s) need more tokens than the whole budget "
+                            "and will be skipped"
+                        )
+
+                resumable = get_runs(selected_jd_id, status="PAUSED", limit=3) + get_runs(selected_jd_id, status="FAILED", limit=3)
+                for paused in resumable:
+                    st.caption(
+                        f"{'⏸️ Paused' if paused['status'] == 'PAUSED' else '❌ Failed'} run from "
+                        f"{paused['started_at']:%Y-%m-%d %H:%M}: "
+                        f"{paused['scored']} scored, {paused['remaining']} remaining"
+                    )
+                    if st.button("▶️ Resume Run", key=f"resume_run_{paused['run_id']}", use_container_width=True):
+                        with st.spinner("🔄 Resuming evaluation run..."):
+                            run = resume_run(
+                                paused["run_id"],
+                                budget=run_budget if any(run_budget.values()) else None
+                            )
+                        st.success(f"✅ Run {run['status'].lower()}: {run['scored']} scored, {run['remaining']} remaining")
+                        st.caption(format_run_usage(run))
+                        show_oversized(run["oversized"])
+
         if st.button("▶️ Run AI Evaluation", type="primary", use_container_width=True, 
                      help="Click to evaluate all unreviewed resumes"):
             # Validation: Check if JD is selected
@@ -413,33 +668,155 @@ elif page == "Results":
                 
                 if not resumes:
                     st.toast("ℹ️ No unreviewed resumes for this JD.", icon="ℹ️")
+                elif anytime_mode:
+                    status_text = st.empty()
+                    live_ranking = st.empty()
+
+                    def show_ranking(evaluation, ranking):
+                        status_text.markdown(
+                            f"**Scored:** `{evaluation['candidate_name']}` "
+                            f"({evaluation['overall_score']:.1f})"
+                        )
+                        live_ranking.dataframe(
+                            [
+                                {
+                                    "#": rank,
+                                    "Candidate": row["candidate_name"],
+                                    "Score": row["overall_score"],
+                                    "Tier": row["candidate_tier"]
+                                }
+                                for rank, row in enumerate(ranking, 1)
+                            ],
+                            hide_index=True,
+                            use_container_width=True
+                        )
+
+                    summary = rank_anytime(
+                        jd, resumes, top_n,
+                        budget=run_budget if any(run_budget.values()) else None,
+                        on_result=show_ranking
+                    )
+                    status_text.empty()
+                    live_ranking.empty()
+                    if summary["budget_reached"]:
+                        st.warning(
+                            f"⏸️ Budget reached before the top {top_n} settled: {summary['scored']} scored, "
+                            f"{summary['skipped']} left unreviewed"
+                        )
+                    else:
+                        st.success(
+                            f"✅ Top {top_n} settled after {summary['scored']} of {len(resumes)} "
+                            f"resume(s); {summary['skipped']} left unreviewed"
+                        )
+                        st.toast("✅ Evaluation completed!", icon="🎯")
+                    st.caption(format_run_usage(summary))
+                    show_oversized([{"candidate_name": name} for name in summary["oversized"]])
                 else:
                     progress_bar = st.progress(0)
                     status_text = st.empty()
+                    live_scores = st.empty()
+                    counts = {"provisional": 0}
                     
-                    for idx, resume in enumerate(resumes):
-                        status_text.markdown(f"**Evaluating:** `{resume['candidate_name']}`")
-                        result = score_resume(
-                            jd["parsed_jd_json"],
-                            resume["parsed_resume_json"]
-                        )
-                        save_evaluation({
-                            "jd_id": selected_jd_id,
-                            "resume_id": str(resume["_id"]),
-                            "candidate_name": resume["candidate_name"],
-                            "category_scores": result["category_scores"],
-                            "category_explanations": result["category_explanations"],
-                            "overall_score": result["final_score"],
-                            "candidate_tier": assign_candidate_tier(result["final_score"]),
-                            "evaluated_at": datetime.utcnow()
-                        })
-                        mark_resume_reviewed(resume["_id"])
-                        progress_bar.progress((idx + 1) / len(resumes))
+                    # Category scores appear as they stream in
+                    streamed = []
+
+                    def show_category(category, value):
+                        streamed.append(f"- **{category}:** {value['score']}")
+                        live_scores.markdown("\n".join(streamed))
+
+                    def reset_categories():
+                        # A retried attempt streams every category again
+                        streamed.clear()
+                        live_scores.empty()
+
+                    def show_progress(evaluation, done, total):
+                        counts["provisional"] += evaluation["provisional"]
+                        streamed.clear()
+                        status_text.markdown(f"**Evaluated:** `{evaluation['candidate_name']}`")
+                        progress_bar.progress(done / total)
+
+                    # Streamed completions report no token usage, so runs
+                    # with a token budget are not streamed and are metered exactly
+                    run = run_evaluation(
+                        jd,
+                        priority=run_priority,
+                        budget=run_budget if any(run_budget.values()) else None,
+                        on_result=show_progress,
+                        on_category=None if run_budget["tokens"] else show_category,
+                        on_retry=reset_categories
+                    )
+                    provisional_count = counts["provisional"]
                     
                     status_text.empty()
+                    live_scores.empty()
                     progress_bar.empty()
-                    st.success("✅ Evaluation completed successfully!")
-                    st.toast("✅ Evaluation completed!", icon="🎯")
+                    if run["status"] == "PAUSED":
+                        st.warning(
+                            f"⏸️ Budget reached: {run['scored']} scored, {run['remaining']} left unreviewed. "
+                            "Resume the run later from 💰 Run budget & priority."
+                        )
+                    else:
+                        st.success("✅ Evaluation completed successfully!")
+                        st.toast("✅ Evaluation completed!", icon="🎯")
+                    st.caption(format_run_usage(run))
+                    show_oversized(run["oversized"])
+                    if provisional_count:
+                        st.warning(
+                            f"⚠️ The AI service was unavailable: {provisional_count} resume(s) got "
+                            "provisional local scores and are queued for AI re-scoring."
+                        )
+
+        if selected_jd_id and count_provisional_evaluations(selected_jd_id):
+            if st.button("♻️ Re-score Provisional Results", use_container_width=True,
+                         help="Replace provisional local scores with AI scores"):
+                with st.spinner("🔄 Re-scoring provisional results..."):
+                    summary = rescore_provisional(jd_id=selected_jd_id)
+                if summary["llm_unavailable"]:
+                    st.warning(f"⚠️ AI service still unavailable; {summary['remaining']} result(s) remain provisional")
+                else:
+                    st.success(f"✅ Re-scored {summary['rescored']} provisional result(s)")
+
+        if st.button("🔀 Match Candidate Pool to All JDs", use_container_width=True,
+                     help="Score shared-pool resumes against their most promising open JDs"):
+            progress_bar = st.progress(0)
+            summary = match_pool(
+                on_progress=lambda done, total: progress_bar.progress(done / total)
+            )
+            progress_bar.empty()
+
+            if not summary["resumes"]:
+                st.toast("ℹ️ The shared candidate pool is empty.", icon="ℹ️")
+            else:
+                st.success(
+                    f"✅ Scored {summary['scored_pairs']} of {summary['candidate_pairs']} "
+                    f"candidate/JD pairs for {summary['resumes']} pooled resume(s)"
+                )
+                if summary["failed"]:
+                    st.warning(f"⚠️ {len(summary['failed'])} resume(s) failed to match")
+
+        if selected_jd_id:
+            selected_jd = next(jd for jd in jds if jd["jd_id"] == selected_jd_id)
+            if selected_jd.get("archive"):
+                st.caption(
+                    f"🗄️ Archived ({selected_jd['archive']['target']}): "
+                    f"{selected_jd['archive']['resumes']} resume(s), "
+                    f"{selected_jd['archive']['evaluations']} evaluation(s)"
+                )
+                if st.button("♻️ Restore Archived JD", use_container_width=True,
+                             help="Move this JD's resumes and evaluations back and reopen it"):
+                    with st.spinner("🔄 Restoring from archive..."):
+                        counts = restore_jd(selected_jd_id)
+                    st.success(f"✅ Restored {counts['resumes']} resume(s) and {counts['evaluations']} evaluation(s)")
+            elif selected_jd.get("status") == "CLOSED":
+                if st.button("🗄️ Archive Closed JD", use_container_width=True,
+                             help="Move this JD's resumes and evaluations to compressed cold storage"):
+                    with st.spinner("🔄 Archiving..."):
+                        counts = archive_jd(selected_jd_id)
+                    st.success(f"✅ Archived {counts['resumes']} resume(s) and {counts['evaluations']} evaluation(s)")
+            elif st.button("🔒 Close JD", use_container_width=True,
+                           help="Stop accepting resumes for this JD; closed JDs can be archived"):
+                close_jd(selected_jd_id)
+                st.rerun()
     
     st.markdown("<br>", unsafe_allow_html=True)
     st.markdown("---")
@@ -447,6 +824,56 @@ elif page == "Results":
     
     # Results Section - Only show if JD is selected
     if selected_jd_id:
+        # Header summary - one point read of the materialized JD stats
+        jd_stats = get_jd_stats(selected_jd_id)
+        tier_counts = jd_stats["tier_counts"]
+
+        m1, m2, m3, m4 = st.columns(4)
+        m1.metric("Resumes", jd_stats["resume_count"])
+        m2.metric("Pending Review", jd_stats["pending_count"])
+        m3.metric("Evaluated", jd_stats["evaluated_count"])
+        m4.metric(
+            "Average Score",
+            "-" if jd_stats["avg_overall_score"] is None else f"{jd_stats['avg_overall_score']:.1f}"
+        )
+
+        # Live ranking - fed by a change stream (or polling) subscription
+        # kept per session, so refreshes only apply new changes
+        if st.toggle("🔴 Live ranking", key="live_ranking",
+                     help="Update the top candidates as evaluations land, without rerunning the page"):
+            subscription = st.session_state.get("results_subscription")
+            if subscription is None or subscription.closed or \
+                    (subscription.jd_id, subscription.top_n) != (selected_jd_id, top_n):
+                close_live_ranking()
+                subscription = ResultsSubscription(selected_jd_id, top_n)
+                st.session_state["results_subscription"] = subscription
+
+            @st.fragment(run_every=LIVE_POLL_SECONDS)
+            def live_ranking_panel():
+                deltas, ranking = subscription.drain()
+                st.caption(
+                    f"Live via {subscription.mode.replace('_', ' ')} · "
+                    f"{len(deltas)} change(s) since last refresh"
+                )
+                st.dataframe(
+                    [
+                        {
+                            "#": rank,
+                            "Candidate": row["candidate_name"],
+                            "Score": row["overall_score"],
+                            "Tier": row["candidate_tier"],
+                            "Provisional": row["provisional"]
+                        }
+                        for rank, row in enumerate(ranking, 1)
+                    ],
+                    hide_index=True,
+                    use_container_width=True
+                )
+
+            live_ranking_panel()
+        else:
+            close_live_ranking()
+
         st.markdown("### 🏆 Ranked Candidates")
         
         col1, col2 = st.columns([2, 1])
@@ -454,10 +881,38 @@ elif page == "Results":
         with col1:
             tier_filter = st.selectbox(
                 "Filter candidates by tier",
-                ["ALL", "TOP", "BEST", "MODERATE", "LOW", "VERY_LOW"],
-                format_func=lambda x: f"🎯 {x}",
+                ["ALL"] + CANDIDATE_TIERS,
+                format_func=lambda x: (
+                    f"🎯 {x} ({jd_stats['evaluated_count'] if x == 'ALL' else tier_counts.get(x, 0)})"
+                ),
                 key="tier_filter"
             )
+
+        with col2:
+            export_format = st.selectbox(
+                "Export format",
+                EXPORT_FORMATS,
+                format_func=str.upper,
+                key="export_format"
+            )
+            if st.button("📦 Prepare Export", use_container_width=True):
+                # Streamed to a temp file chunk by chunk; only the finished
+                # file is handed to the download button
+                with tempfile.TemporaryFile() as export_file:
+                    try:
+                        exported = export_evaluations(
+                            selected_jd_id, export_format, export_file, tier=tier_filter
+                        )
+                    except RuntimeError as e:
+                        st.error(f"❌ {e}")
+                    else:
+                        export_file.seek(0)
+                        st.download_button(
+                            f"⬇️ Download {exported} row(s)",
+                            data=export_file.read(),
+                            file_name=f"evaluations_{selected_jd_id}.{export_format}",
+                            use_container_width=True
+                        )
         
         evaluations = get_evaluations_by_jd_and_tier(
             selected_jd_id, tier_filter, limit=top_n
@@ -476,7 +931,8 @@ elif page == "Results":
                 tier_color = tier_colors.get(ev['candidate_tier'], "#6b7280")
                 
                 # Expander for detailed breakdown - starts collapsed
-                with st.expander(f"**#{idx}** {ev['candidate_name']}", expanded=False):
+                provisional_tag = " · _provisional_" if ev.get("provisional") else ""
+                with st.expander(f"**#{idx}** {ev['candidate_name']}{provisional_tag}", expanded=False):
                     # Score and tier info
                     col_score, col_tier = st.columns(2)
                     
@@ -571,4 +1027,83 @@ elif page == "Results":
             </div>
             """,
             unsafe_allow_html=True
-        )
\ No newline at end of file
+        )
+
+
+# ===================================================== 
+# LAYER 4 — CANDIDATE SEARCH (ACROSS JDS)
+# ===================================================== 
+elif page == "Candidate Search":
+    st.markdown(
+        """
+        <div style='text-align: center; padding: 3rem 2rem; 
+                    background: linear-gradient(135deg, #43e97b 0%, #38f9d7 100%); 
+                    border-radius: 20px; margin-bottom: 3rem; box-shadow: 0 10px 40px rgba(67, 233, 123, 0.3);'>
+            <div style='font-size: 5rem; margin-bottom: 1rem;'>🔎</div>
+            <h2 style='color: white; margin: 0; font-size: 2rem; font-weight: 700;'>Candidate Search</h2>
+            <p style='color: rgba(255,255,255,0.95); margin-top: 1rem; font-size: 1.1rem;'>
+                Find evaluated candidates across every Job Description, best result first
+            </p>
+        </div>
+        """,
+        unsafe_allow_html=True
+    )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        search_skills = st.text_input("Skills (comma-separated, all required)", placeholder="Kafka, Python")
+        search_text = st.text_input("Titles / domain experience", placeholder="data engineer fintech")
+    with col2:
+        min_experience = st.number_input("Minimum experience (years)", min_value=0.0, value=0.0, step=1.0)
+        min_score = st.slider("Minimum overall score", min_value=0, max_value=100, value=0)
+    search_tier = st.selectbox("Tier", ["ALL"] + CANDIDATE_TIERS, key="search_tier")
+
+    filters = {
+        "skills": [skill.strip() for skill in search_skills.split(",") if skill.strip()],
+        "min_experience": min_experience or None,
+        "min_score": min_score or None,
+        "text": search_text.strip() or None,
+        "tier": search_tier,
+    }
+
+    # Keyset pages: a stack of `after` tokens, reset when filters change
+    if st.session_state.get("search_filters") != filters:
+        st.session_state["search_filters"] = filters
+        st.session_state["search_pages"] = [None]
+    pages = st.session_state["search_pages"]
+
+    results, next_page = search_evaluations(**filters, after=pages[-1], limit=25)
+    jd_roles = {jd["jd_id"]: jd["role"] for jd in get_jds()}
+
+    if results:
+        st.dataframe(
+            [
+                {
+                    "Candidate": ev["candidate_name"],
+                    "Best JD": jd_roles.get(ev["jd_id"], ev["jd_id"]),
+                    "Score": ev["overall_score"],
+                    "Matched JDs": ", ".join(jd_roles.get(jd_id, jd_id) for jd_id in ev["jd_ids"]),
+                    "Tier": ev["candidate_tier"],
+                    "Experience (yrs)": ev.get("total_experience_years"),
+                    "Skills": ", ".join(ev.get("canonical_skills") or []),
+                    "Titles": ", ".join(ev.get("titles") or []),
+                }
+                for ev in results
+            ],
+            hide_index=True,
+            use_container_width=True
+        )
+    else:
+        st.info("No evaluated candidates match these filters.")
+
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if len(pages) > 1 and st.button("⬅️ Previous", use_container_width=True):
+            pages.pop()
+            st.rerun()
+    with page_col:
+        st.caption(f"Page {len(pages)}")
+    with next_col:
+        if next_page and st.button("Next ➡️", use_container_width=True):
+            pages.append(next_page)
+            st.rerun()
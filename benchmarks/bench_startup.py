@@ -0,0 +1,131 @@
+"""
+Startup-time benchmark.
+
+Measures, each in a fresh interpreter:
+- import time of app-facing core modules, and which heavy
+  dependencies (pdfplumber, docx, groq) each import drags in
+- time-to-first-render of every page in app.py, via Streamlit's AppTest
+
+Usage (from the repo root, with MONGODB_URI / DB_NAME set for the
+page renders):
+    python benchmarks/bench_startup.py [--runs 5] [--skip-pages]
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+HEAVY_MODULES = ["pdfplumber", "docx", "groq"]
+
+IMPORT_TARGETS = [
+    "core.db",
+    "core.duplicate_guard",
+    "core.utils",
+    "core.llm_client",
+    "core.jd_parser",
+    "core.resume_parser",
+    "core.scorer",
+]
+
+PAGES = ["📝 Upload JD", "👤 Upload Resume", "📊 Results", "🔎 Candidate Search"]
+
+
+_IMPORT_SNIPPET = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": elapsed,
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+_PAGE_SNIPPET = """
+import json, sys, time
+from streamlit.testing.v1 import AppTest
+
+at = AppTest.from_file("app.py", default_timeout=120)
+start = time.perf_counter()
+at.run()
+first_run = time.perf_counter() - start
+
+page = {page!r}
+render = first_run
+if at.sidebar.radio[0].value != page:
+    start = time.perf_counter()
+    at.sidebar.radio[0].set_value(page).run()
+    render = time.perf_counter() - start
+
+print(json.dumps({{
+    "first_script_run": first_run,
+    "page_render": render,
+    "exceptions": [str(e.value) for e in at.exception],
+    "heavy": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def _run_snippet(code: str) -> dict:
+    proc = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def _summary(samples: list[float]) -> str:
+    return (
+        f"median {statistics.median(samples) * 1000:8.1f} ms   "
+        f"min {min(samples) * 1000:8.1f} ms   "
+        f"max {max(samples) * 1000:8.1f} ms"
+    )
+
+
+def bench_imports(runs: int):
+    print("IMPORT TIME (fresh interpreter per run)")
+    for module in IMPORT_TARGETS:
+        samples, heavy = [], []
+        for _ in range(runs):
+            result = _run_snippet(_IMPORT_SNIPPET.format(module=module, heavy=HEAVY_MODULES))
+            samples.append(result["seconds"])
+            heavy = result["heavy"]
+        print(f"  {module:<22} {_summary(samples)}   heavy loaded: {heavy or '-'}")
+
+
+def bench_pages(runs: int):
+    print("TIME TO FIRST RENDER (fresh interpreter per run)")
+    for page in PAGES:
+        renders, heavy, errors = [], [], []
+        for _ in range(runs):
+            result = _run_snippet(_PAGE_SNIPPET.format(page=page, heavy=HEAVY_MODULES))
+            renders.append(result["page_render"])
+            heavy = result["heavy"]
+            errors = result["exceptions"]
+        print(f"  {page:<22} {_summary(renders)}   heavy loaded: {heavy or '-'}")
+        for error in errors:
+            print(f"    ! {error}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--skip-pages", action="store_true", help="only measure imports")
+    args = parser.parse_args()
+
+    bench_imports(args.runs)
+    if not args.skip_pages:
+        print()
+        bench_pages(args.runs)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Concurrent-user load test for the Streamlit data paths.
+
+Simulates M concurrent sessions running the page flows recruiters use,
+calling the core/db and pipeline functions directly:
+- results: list JDs, pick one, read its stats, filter a tier, page
+  through the ranked evaluations
+- upload: hash, register, extract, parse and save N resumes for a JD,
+  then score them
+
+against a local MongoDB (a throwaway database, dropped afterwards) and a
+fake LLM backend with a configurable latency. For each M it reports
+flow throughput, flow and per-stage latency percentiles (from
+core/tracing spans) and MongoDB connection counts from serverStatus.
+
+Usage (from the repo root, mongod running locally):
+    python benchmarks/load_test.py --sessions 1,5,10,25 --duration 20
+"""
+
+import argparse
+import io
+import json
+import os
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT))
+
+# Only dependency-free core modules at import time; the rest are imported
+# after main() points the environment at the throwaway database
+from core.rubric import RUBRIC_CATEGORIES
+
+SKILLS = ["Python", "SQL", "AWS", "Docker", "Kubernetes", "React", "Java", "Kafka",
+          "Spark", "Airflow", "Terraform", "Git", "Jira", "MongoDB", "PostgreSQL"]
+
+
+# -------------------------------------------------
+# FAKE LLM BACKEND
+# -------------------------------------------------
+class _FakeCompletions:
+    def __init__(self, latency: float):
+        self._latency = latency
+
+    def create(self, model, messages, temperature=0, stream=False, **kwargs):
+        prompt = messages[-1]["content"]
+        time.sleep(random.uniform(0.5, 1.5) * self._latency)
+        content = json.dumps(self._answer(prompt))
+        message = type("Message", (), {"content": content})
+        choice = type("Choice", (), {"message": message})
+        return type("Response", (), {"choices": [choice], "usage": None})
+
+    @staticmethod
+    def _answer(prompt: str) -> dict:
+        if "resume evaluation engine" in prompt:
+            return {
+                category: {"score": random.randint(20, 95), "explanation": "Synthetic score."}
+                for category in RUBRIC_CATEGORIES
+            }
+        if "Job Description text" in prompt:
+            return {
+                "role": "Engineer", "location": None, "experience_required": 3,
+                "mandatory_skills": random.sample(SKILLS, 4), "supporting_skills": random.sample(SKILLS, 2),
+                "tools": ["Git"], "domain_knowledge": [], "responsibilities": ["Build services"],
+            }
+        return {
+            "candidate_name": f"Candidate {random.randint(1, 10**6)}",
+            "total_experience_years": random.randint(0, 12),
+            "location": None,
+            "titles_with_dates": [],
+            "career_progression": [],
+            "skills_with_context": [{"skill": s, "context": "used at work"} for s in random.sample(SKILLS, 5)],
+            "tools_with_context": [{"tool": "Git", "context": "daily"}],
+            "domain_experience": [],
+            "projects": [],
+            "impact_metrics": [],
+            "leadership_signals": [],
+            "professional_presence_links": [],
+        }
+
+
+class FakeGroq:
+    def __init__(self, latency: float):
+        self.chat = type("Chat", (), {"completions": _FakeCompletions(latency)})()
+
+    def with_options(self, **kwargs):
+        return self
+
+
+# -------------------------------------------------
+# SEED DATA
+# -------------------------------------------------
+def _resume_file(idx: int) -> io.BytesIO:
+    text = (
+        f"Candidate {idx}\ncandidate{idx}-{random.random()}@example.com\n"
+        f"SKILLS\n{', '.join(random.sample(SKILLS, 6))}\n"
+        f"EXPERIENCE\nEngineer at Company {idx} 2018 - 2024\n"
+    )
+    file = io.BytesIO(text.encode("utf-8"))
+    file.name = f"resume_{idx}_{random.random():.8f}.txt"
+    file.type = "text/plain"
+    return file
+
+
+def seed(db, jds: int, evaluations_per_jd: int) -> list[str]:
+    from datetime import datetime
+    from core.db import save_jds, rebuild_jd_stats, CANDIDATE_TIERS
+
+    jd_ids = [f"load-jd-{idx}" for idx in range(jds)]
+    save_jds([
+        {
+            "jd_id": jd_id,
+            "role": f"Role {idx}",
+            "parsed_jd_json": _FakeCompletions._answer("Job Description text"),
+            "created_at": datetime.utcnow(),
+        }
+        for idx, jd_id in enumerate(jd_ids)
+    ])
+
+    for jd_id in jd_ids:
+        docs = []
+        for idx in range(evaluations_per_jd):
+            score = random.uniform(0, 100)
+            docs.append({
+                "jd_id": jd_id,
+                "resume_id": f"{jd_id}-resume-{idx}",
+                "candidate_name": f"Candidate {idx}",
+                "category_scores": {category: random.randint(0, 100) for category in RUBRIC_CATEGORIES},
+                "category_explanations": {category: "Synthetic explanation." for category in RUBRIC_CATEGORIES},
+                "overall_score": round(score, 2),
+                "candidate_tier": CANDIDATE_TIERS[min(int((100 - score) // 20), 4)],
+                "evaluated_at": datetime.utcnow(),
+            })
+        if docs:
+            db.evaluations.insert_many(docs)
+    rebuild_jd_stats()
+    return jd_ids
+
+
+# -------------------------------------------------
+# PAGE FLOWS
+# -------------------------------------------------
+def results_flow(jd_ids: list[str]):
+    from core.db import get_jds, get_jd_stats, get_evaluations_by_jd_and_tier, CANDIDATE_TIERS
+
+    get_jds()
+    jd_id = random.choice(jd_ids)
+    get_jd_stats(jd_id)
+    tier = random.choice(["ALL"] + CANDIDATE_TIERS)
+    for page_size in (5, 10, 25, 50):
+        get_evaluations_by_jd_and_tier(jd_id, tier, limit=page_size)
+
+
+def upload_flow(jd_ids: list[str], resumes: int):
+    import uuid
+    from datetime import datetime
+    from core.db import (
+        get_jds, save_resume, save_evaluation, mark_resume_reviewed, get_unreviewed_resumes_by_jd,
+        candidate_search_fields
+    )
+    from core.duplicate_guard import compute_file_hash, register_file_or_skip
+    from core.resume_parser import parse_resume
+    from core.scorer import score_resume
+    from core.text_store import save_text
+    from core.utils import extract_text
+
+    jd = next(jd for jd in get_jds() if jd["jd_id"] == random.choice(jd_ids))
+    for idx in range(resumes):
+        file = _resume_file(idx)
+        file_hash = compute_file_hash(file)
+        is_new, _ = register_file_or_skip(file, "resume", jd_id=jd["jd_id"], file_hash=file_hash)
+        if not is_new:
+            continue
+        raw_text = extract_text(file)
+        save_text(file_hash, raw_text)
+        parsed = parse_resume(raw_text)
+        save_resume({
+            "resume_id": str(uuid.uuid4()),
+            "candidate_name": parsed.get("candidate_name", "Unknown"),
+            "jd_id": jd["jd_id"],
+            "file_hash": file_hash,
+            "parsed_resume_json": parsed,
+            "created_at": datetime.utcnow(),
+        })
+
+    for resume in get_unreviewed_resumes_by_jd(jd["jd_id"]):
+        result = score_resume(
+            jd["parsed_jd_json"], resume["parsed_resume_json"], jd_context=jd.get("scoring_context")
+        )
+        save_evaluation({
+            "jd_id": jd["jd_id"],
+            "resume_id": str(resume["_id"]),
+            "candidate_name": resume["candidate_name"],
+            "category_scores": result["category_scores"],
+            "category_explanations": result["category_explanations"],
+            "overall_score": result["final_score"],
+            "candidate_tier": result["candidate_tier"],
+            "provisional": result["provisional"],
+            "evaluated_at": datetime.utcnow(),
+            **candidate_search_fields(resume),
+        })
+        mark_resume_reviewed(resume["_id"])
+
+
+# -------------------------------------------------
+# DRIVER
+# -------------------------------------------------
+def _session(jd_ids, args, deadline, results, lock):
+    while time.monotonic() < deadline:
+        kind = "upload" if random.random() < args.upload_ratio else "results"
+        start = time.perf_counter()
+        error = None
+        try:
+            if kind == "upload":
+                upload_flow(jd_ids, args.resumes)
+            else:
+                results_flow(jd_ids)
+        except Exception as exc:
+            error = f"{type(exc).__name__}: {exc}"
+        elapsed = time.perf_counter() - start
+        with lock:
+            results.append((kind, elapsed, error))
+
+
+def _connections(db) -> dict:
+    return db.client.admin.command("serverStatus")["connections"]
+
+
+def _pct(samples: list[float], p: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * p), len(ordered) - 1)]
+
+
+def run_level(db, jd_ids, sessions: int, args):
+    from core.tracing import reset_tracing, stage_histograms
+
+    reset_tracing()
+    before = _connections(db)
+    results, lock = [], threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    threads = [
+        threading.Thread(target=_session, args=(jd_ids, args, deadline, results, lock))
+        for _ in range(sessions)
+    ]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    peak = before["current"]
+    while any(thread.is_alive() for thread in threads):
+        peak = max(peak, _connections(db)["current"])
+        time.sleep(0.5)
+    wall = time.perf_counter() - started
+    after = _connections(db)
+
+    print(f"M = {sessions} session(s), {wall:.1f} s")
+    for kind in ("results", "upload"):
+        samples = [elapsed for k, elapsed, error in results if k == kind and not error]
+        if samples:
+            print(
+                f"  {kind:<8} {len(samples) / wall:8.2f} flows/s   "
+                f"p50 {_pct(samples, 0.5) * 1000:8.1f} ms   "
+                f"p90 {_pct(samples, 0.9) * 1000:8.1f} ms   "
+                f"p99 {_pct(samples, 0.99) * 1000:8.1f} ms   (n={len(samples)})"
+            )
+    errors = [error for _, _, error in results if error]
+    if errors:
+        print(f"  errors: {len(errors)} (first: {errors[0]})")
+    print(
+        f"  connections: current {after['current']} (peak {peak}), "
+        f"created during run {after['totalCreated'] - before['totalCreated']}"
+    )
+
+    slowest = sorted(stage_histograms().items(), key=lambda item: -item[1]["total_ms"])[:args.top_stages]
+    for name, h in slowest:
+        print(
+            f"    {name:<40} n={h['count']:<6} p50 {h['p50_ms']:8.2f} ms   "
+            f"p99 {h['p99_ms']:8.2f} ms   total {h['total_ms'] / 1000:7.2f} s"
+        )
+    print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sessions", default="1,5,10,25", help="comma-separated M values")
+    parser.add_argument("--duration", type=float, default=20, help="seconds per M")
+    parser.add_argument("--resumes", type=int, default=5, help="resumes per upload flow")
+    parser.add_argument("--upload-ratio", type=float, default=0.2, help="share of flows that upload")
+    parser.add_argument("--jds", type=int, default=20)
+    parser.add_argument("--evaluations", type=int, default=2000, help="seeded evaluations per JD")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="mean fake LLM latency, seconds")
+    parser.add_argument("--top-stages", type=int, default=8)
+    parser.add_argument("--no-read-cache", action="store_true", help="disable core/cache read caching")
+    parser.add_argument("--keep-data", action="store_true", help="keep the load-test database")
+    args = parser.parse_args()
+
+    # Configure before any core module reads its settings
+    os.environ.setdefault("MONGODB_URI", "mongodb://localhost:27017")
+    os.environ["DB_NAME"] = f"loadtest_{int(time.time())}"
+    os.environ["TRACE_DIR"] = ""
+    if args.no_read_cache:
+        os.environ["READ_CACHE_TTL_SECONDS"] = "0"
+
+    from core import llm_client
+    from core.db import init_db
+    from core.tracing import enable_tracing
+
+    llm_client._client = FakeGroq(args.llm_latency)
+    enable_tracing()
+    db = init_db()
+
+    print(f"Seeding {os.environ['DB_NAME']}: {args.jds} JD(s) x {args.evaluations} evaluation(s)")
+    jd_ids = seed(db, args.jds, args.evaluations)
+    print()
+
+    try:
+        for sessions in [int(m) for m in args.sessions.split(",")]:
+            run_level(db, jd_ids, sessions, args)
+    finally:
+        if not args.keep_data:
+            db.client.drop_database(os.environ["DB_NAME"])
+
+
+if __name__ == "__main__":
+    main()
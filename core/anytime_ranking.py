@@ -0,0 +1,160 @@
+"""
+Progressive ("anytime") ranking for one JD.
+
+Unreviewed resumes are ordered by a cheap local prior (the heuristic
+scorer's provisional final score) and LLM-scored best-prior first. The
+ranking is reported after every result, and scoring stops once no
+remaining candidate's prior could plausibly reach the current top N:
+
+    next prior + margin < N-th best score so far
+
+The margin starts at ANYTIME_PRIOR_MARGIN and widens to the largest
+amount the LLM has scored above the prior in this run, so a prior that
+underestimates candidates stops later rather than missing them. An
+optional run budget (core/run_budget.py) also stops scoring before the
+resume that would overrun it, and skips resumes above the whole token
+budget. Resumes not scored stay NOT_REVIEWED for a later full run.
+"""
+
+from datetime import datetime
+from typing import Dict, Any, List
+
+from core.config_manager import ConfigManager
+from core.db import get_evaluations_by_jd, save_evaluation, mark_resume_reviewed, candidate_search_fields
+from core.llm_client import usage_meter
+from core.run_budget import estimate_score_tokens, fits_budget, exceeds_budget, spent_tokens
+from core.scorer import score_resume, score_resume_heuristic
+
+ANYTIME_PRIOR_MARGIN = float(ConfigManager.get("ANYTIME_PRIOR_MARGIN", 15))
+
+
+def order_by_prior(parsed_jd: Dict[str, Any], resumes: List[Dict[str, Any]]) -> List[tuple]:
+    """
+    Returns [(prior, resume)], highest prior first.
+    """
+    ranked = [
+        (
+            score_resume_heuristic(parsed_jd, resume["parsed_resume_json"], resume.get("canonical_skills"))["final_score"],
+            resume
+        )
+        for resume in resumes
+    ]
+    ranked.sort(key=lambda pair: pair[0], reverse=True)
+    return ranked
+
+
+def _evaluate(jd: Dict[str, Any], resume: Dict[str, Any], prior: float, on_category=None) -> Dict[str, Any]:
+    result = score_resume(
+        jd["parsed_jd_json"],
+        resume["parsed_resume_json"],
+        on_category=on_category,
+        jd_context=jd.get("scoring_context")
+    )
+    evaluation = {
+        "jd_id": jd["jd_id"],
+        "resume_id": str(resume["_id"]),
+        "candidate_name": resume["candidate_name"],
+        "category_scores": result["category_scores"],
+        "category_explanations": result["category_explanations"],
+        "overall_score": result["final_score"],
+        "candidate_tier": result["candidate_tier"],
+        "provisional": result["provisional"],
+        "match_prior": prior,
+        "evaluated_at": datetime.utcnow(),
+        **candidate_search_fields(resume)
+    }
+    save_evaluation(evaluation)
+    mark_resume_reviewed(resume["_id"])
+    return evaluation
+
+
+def rank_anytime(
+    jd: Dict[str, Any],
+    resumes: List[Dict[str, Any]],
+    top_n: int,
+    margin: float = ANYTIME_PRIOR_MARGIN,
+    budget: Dict[str, Any] | None = None,
+    on_result=None,
+    on_category=None
+) -> Dict[str, Any]:
+    """
+    Scores resumes best-prior first until the top N is stable or the
+    budget is reached.
+
+    Args:
+        jd: JD document (jd_id, parsed_jd_json)
+        resumes: unreviewed resume documents for the JD
+        budget: {tokens, requests}; defaults to jd["run_budget"]
+        on_result: optional callback(evaluation, ranking) after each
+            result, `ranking` being the current top N (name, score, tier)
+        on_category: passed through to score_resume for streaming
+
+    Returns:
+    {
+        scored,           # resumes scored
+        skipped,          # resumes left unreviewed
+        threshold,        # N-th best score when stopping (None if < N scored)
+        ranking,          # final top N
+        budget_reached,   # stopped by the budget rather than a stable top N
+        oversized,        # names of resumes above the whole token budget
+        estimated_tokens, # of the resumes scored
+        actual            # {requests, prompt_tokens, completion_tokens, unmetered_requests}
+    }
+    """
+    budget = budget if budget is not None else (jd.get("run_budget") or {})
+    # Earlier runs' results count towards the top N
+    ranking = [
+        {"candidate_name": ev["candidate_name"], "overall_score": ev["overall_score"], "candidate_tier": ev["candidate_tier"]}
+        for ev in get_evaluations_by_jd(jd["jd_id"], limit=top_n, settled_only=True)
+    ]
+    summary = {
+        "scored": 0,
+        "skipped": 0,
+        "threshold": None,
+        "ranking": ranking,
+        "budget_reached": False,
+        "oversized": [],
+        "estimated_tokens": 0,
+        "actual": {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "unmetered_requests": 0},
+    }
+
+    spent, spent_requests = 0, 0
+    ordered = order_by_prior(jd["parsed_jd_json"], resumes)
+    for prior, resume in ordered:
+        if len(ranking) >= top_n:
+            threshold = ranking[top_n - 1]["overall_score"]
+            summary["threshold"] = threshold
+            if prior + margin < threshold:
+                break
+
+        estimate = estimate_score_tokens(jd["parsed_jd_json"], resume["parsed_resume_json"], jd.get("scoring_context"))
+        if exceeds_budget(budget, estimate):
+            summary["oversized"].append(resume["candidate_name"])
+            continue
+        if not fits_budget(budget, spent + estimate, spent_requests + 1):
+            summary["budget_reached"] = True
+            break
+
+        with usage_meter() as meter:
+            evaluation = _evaluate(jd, resume, prior, on_category)
+        summary["estimated_tokens"] += estimate
+        for key, value in meter.usage.items():
+            summary["actual"][key] += value
+        spent += spent_tokens(meter.usage, estimate)
+        spent_requests += meter.usage["requests"]
+        summary["scored"] += 1
+        margin = max(margin, evaluation["overall_score"] - prior)
+
+        ranking.append({
+            "candidate_name": evaluation["candidate_name"],
+            "overall_score": evaluation["overall_score"],
+            "candidate_tier": evaluation["candidate_tier"]
+        })
+        ranking.sort(key=lambda row: row["overall_score"], reverse=True)
+        del ranking[top_n:]
+
+        if on_result:
+            on_result(evaluation, ranking)
+
+    summary["skipped"] = len(ordered) - summary["scored"]
+    return summary
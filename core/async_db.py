@@ -0,0 +1,523 @@
+"""
+Asyncio data-access layer.
+
+Mirrors every function in core/db.py on top of Motor so an asyncio
+pipeline can overlap MongoDB writes with in-flight LLM calls on one
+event loop. Cursor-returning reads are async generators that stream
+documents instead of materializing a list. Query building and document
+shapes are shared with core/db.py; see there for the docstrings.
+"""
+
+from datetime import datetime
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import DESCENDING, ReturnDocument, UpdateOne
+from core.config_manager import ConfigManager
+from core.cache import invalidate
+from core.scoring_context import build_scoring_context
+from core.db import (
+    INDEXES,
+    SEARCH_PROJECTION,
+    candidate_search_fields,
+    _add_candidate_jds,
+    _advance_token,
+    _candidate_key,
+    _candidates_clause,
+    _changes_query,
+    _evaluation_increments,
+    _finalize_jd_stats,
+    _keyset_clause,
+    _latest_write_query,
+    _overlap_query,
+    _search_query,
+    _start_token,
+    _stats_document,
+    _status_totals,
+    _with,
+)
+
+_client = None
+_db = None
+
+
+def init_db():
+    """
+    Creates the shared Motor client (one connection pool per process).
+    Safe to call repeatedly; the pool is built only once. Indexes are
+    created by ensure_indexes, which needs the event loop.
+    """
+    global _client, _db
+
+    if _db is not None:
+        return _db
+
+    uri = ConfigManager.get("MONGODB_URI")
+    db_name = ConfigManager.get("DB_NAME")
+    max_pool_size = int(ConfigManager.get("MONGODB_MAX_POOL_SIZE", 100))
+
+    _client = AsyncIOMotorClient(uri, maxPoolSize=max_pool_size)
+    _db = _client[db_name]
+    return _db
+
+
+def get_db():
+    return _db if _db is not None else init_db()
+
+
+async def ensure_indexes():
+    """
+    Creates the same indexes as core.db.init_db.
+    """
+    for collection, keys, options in INDEXES:
+        await _db[collection].create_index(keys, **options)
+
+
+# =====================
+# JD COLLECTION
+# =====================
+async def save_jd(doc: dict):
+    doc.setdefault("scoring_context", build_scoring_context(doc["parsed_jd_json"]))
+    result = await _db.jds.insert_one(doc)
+    invalidate("jds")
+    return result.inserted_id
+
+
+async def save_jds(docs: list[dict]):
+    for doc in docs:
+        doc.setdefault("scoring_context", build_scoring_context(doc["parsed_jd_json"]))
+    try:
+        return (await _db.jds.insert_many(docs, ordered=False)).inserted_ids
+    finally:
+        # Some documents may be saved even when the bulk write fails
+        invalidate("jds")
+
+
+async def get_jds():
+    async for jd in _db.jds.find({}, {"_id": 0}):
+        yield jd
+
+
+async def backfill_scoring_contexts() -> int:
+    updated = 0
+    async for jd in _db.jds.find({"scoring_context": {"$exists": False}}, {"jd_id": 1, "parsed_jd_json": 1}):
+        await _db.jds.update_one(
+            {"_id": jd["_id"]},
+            {"$set": {"scoring_context": build_scoring_context(jd["parsed_jd_json"])}}
+        )
+        updated += 1
+    invalidate("jds")
+    return updated
+
+
+async def set_jd_status(jd_id: str, status: str):
+    update = {"status": status}
+    if status == "CLOSED":
+        update["closed_at"] = datetime.utcnow()
+    await _db.jds.update_one({"jd_id": jd_id}, {"$set": update})
+    invalidate("jds")
+
+
+async def set_jd_run_budget(jd_id: str, budget: dict | None):
+    if budget:
+        await _db.jds.update_one({"jd_id": jd_id}, {"$set": {"run_budget": budget}})
+    else:
+        await _db.jds.update_one({"jd_id": jd_id}, {"$unset": {"run_budget": ""}})
+    invalidate("jds")
+
+
+# =====================
+# RESUME COLLECTION
+# =====================
+async def save_resume(doc: dict):
+    doc["status"] = "NOT_REVIEWED"
+    result = await _db.resumes.insert_one(doc)
+    await _inc_jd_stats(doc["jd_id"], {"resume_count": 1, "pending_count": 1})
+    invalidate("resumes", "jd_stats")
+    return result.inserted_id
+
+
+async def save_pool_resume(doc: dict):
+    doc["jd_id"] = None
+    doc["status"] = "POOL"
+    result = await _db.resumes.insert_one(doc)
+    invalidate("resumes")
+    return result.inserted_id
+
+
+async def get_pool_resumes():
+    async for resume in _db.resumes.find({"status": "POOL"}):
+        yield resume
+
+
+async def update_resume_parse(file_hash: str, parsed_resume: dict, canonical_skills: list | None = None) -> int:
+    update = {
+        "parsed_resume_json": parsed_resume,
+        "candidate_name": parsed_resume.get("candidate_name", "Unknown"),
+        "reparsed_at": datetime.utcnow()
+    }
+    if canonical_skills is not None:
+        update["canonical_skills"] = canonical_skills
+
+    result = await _db.resumes.update_many({"file_hash": file_hash}, {"$set": update})
+    invalidate("resumes")
+    return result.modified_count
+
+
+async def get_resumes_by_ids(resume_ids: list) -> dict:
+    ids = [ObjectId(resume_id) for resume_id in resume_ids if ObjectId.is_valid(resume_id)]
+    return {str(r["_id"]): r async for r in _db.resumes.find({"_id": {"$in": ids}})}
+
+
+async def get_resumes_by_candidate(candidate_id: str):
+    async for resume in _db.resumes.find({"candidate_id": candidate_id}).sort("created_at", DESCENDING):
+        yield resume
+
+
+async def find_resumes_by_skills(skills: list, jd_id: str | None = None, match_all: bool = True, limit: int = 50):
+    query = {"canonical_skills": {"$all" if match_all else "$in": skills}}
+    if jd_id:
+        query["jd_id"] = jd_id
+
+    async for resume in _db.resumes.find(query, {"parsed_resume_json": 0}).limit(limit):
+        yield resume
+
+
+async def get_unreviewed_resumes_by_jd(jd_id):
+    cursor = _db.resumes.find({
+        "jd_id": jd_id,
+        "status": "NOT_REVIEWED"
+    })
+    async for resume in cursor:
+        yield resume
+
+
+async def set_resume_priority_flag(resume_ids: list, flagged: bool = True) -> int:
+    result = await _db.resumes.update_many(
+        {"_id": {"$in": list(resume_ids)}},
+        {"$set": {"priority_flag": flagged}}
+    )
+    invalidate("resumes")
+    return result.modified_count
+
+
+async def mark_resume_reviewed(resume_id):
+    resume = await _db.resumes.find_one_and_update(
+        {"_id": resume_id, "status": "NOT_REVIEWED"},
+        {"$set": {"status": "REVIEWED"}},
+        projection={"jd_id": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if resume:
+        await _inc_jd_stats(resume["jd_id"], {"pending_count": -1, "reviewed_count": 1})
+        invalidate("resumes", "jd_stats")
+
+
+async def get_evaluations_by_jd_and_tier(jd_id, tier=None, limit=None):
+    query = {"jd_id": jd_id}
+
+    if tier and tier != "ALL":
+        query["candidate_tier"] = tier
+
+    cursor = _db.evaluations.find(query).sort("overall_score", -1)
+
+    if limit:
+        cursor = cursor.limit(limit)
+
+    async for ev in cursor:
+        yield ev
+
+
+async def get_resumes_by_jd(jd_id: str):
+    async for resume in _db.resumes.find({"jd_id": jd_id}, {"_id": 0}):
+        yield resume
+
+
+# =====================
+# EVALUATION COLLECTION
+# =====================
+async def save_evaluation(doc: dict):
+    if "canonical_skills" not in doc:
+        resume = (await get_resumes_by_ids([doc["resume_id"]])).get(doc["resume_id"])
+        if resume:
+            doc.update(candidate_search_fields(resume))
+    inserted_id = doc.setdefault("_id", ObjectId())
+    result = await _db.evaluations.update_one(
+        {"_id": inserted_id},
+        {
+            "$setOnInsert": {key: value for key, value in doc.items() if key != "_id"},
+            "$currentDate": {"written_at": True}
+        },
+        upsert=True
+    )
+    # A retried write matches the existing document: counted once
+    if result.upserted_id is not None:
+        await _inc_jd_stats(doc["jd_id"], _evaluation_increments(doc))
+    invalidate("evaluations", "jd_stats")
+    return inserted_id
+
+
+async def get_provisional_evaluations(jd_id: str | None = None, limit: int | None = None):
+    query = {"provisional": True}
+    if jd_id:
+        query["jd_id"] = jd_id
+
+    cursor = _db.evaluations.find(query).sort("evaluated_at", 1)
+    if limit:
+        cursor = cursor.limit(limit)
+    async for ev in cursor:
+        yield ev
+
+
+async def count_provisional_evaluations(jd_id: str) -> int:
+    return await _db.evaluations.count_documents({"jd_id": jd_id, "provisional": True})
+
+
+async def replace_provisional_scores(evaluation: dict, scores: dict) -> bool:
+    result = await _db.evaluations.update_one(
+        {"_id": evaluation["_id"], "provisional": True},
+        {
+            "$set": {**scores, "provisional": False, "rescored_at": datetime.utcnow()},
+            "$currentDate": {"written_at": True}
+        }
+    )
+    if not result.modified_count:
+        return False
+
+    inc = _evaluation_increments({**evaluation, **scores})
+    for key, value in _evaluation_increments(evaluation).items():
+        inc[key] = inc.get(key, 0) - value
+    await _inc_jd_stats(evaluation["jd_id"], inc)
+    invalidate("evaluations", "jd_stats")
+    return True
+
+
+async def get_evaluated_jd_ids(resume_id: str | list) -> set:
+    resume_ids = resume_id if isinstance(resume_id, list) else [resume_id]
+    return set(await _db.evaluations.distinct("jd_id", {"resume_id": {"$in": resume_ids}}))
+
+
+async def iter_evaluations_by_jd(jd_id: str, tier=None, batch_size: int = 500):
+    query = {"jd_id": jd_id}
+    if tier and tier != "ALL":
+        query["candidate_tier"] = tier
+
+    cursor = (
+        _db.evaluations.find(query, {"_id": 0})
+        .sort("overall_score", DESCENDING)
+        .batch_size(batch_size)
+    )
+    try:
+        async for ev in cursor:
+            yield ev
+    finally:
+        await cursor.close()
+
+
+async def get_evaluations_by_jd(jd_id: str, limit: int = 10, settled_only: bool = False):
+    query = {"jd_id": jd_id}
+    if settled_only:
+        query["provisional"] = {"$ne": True}
+    cursor = (
+        _db.evaluations.find(query, {"_id": 0})
+        .sort("overall_score", DESCENDING)
+        .limit(limit)
+    )
+    async for ev in cursor:
+        yield ev
+
+
+# =====================
+# LIVE RESULTS
+# =====================
+def open_evaluation_stream(jd_id: str, resume_after=None):
+    """
+    Motor change stream (iterate with `async for`); see
+    core.db.open_evaluation_stream.
+    """
+    pipeline = [{
+        "$match": {
+            "$or": [
+                {"fullDocument.jd_id": jd_id},
+                {"operationType": "delete"}
+            ]
+        }
+    }]
+    return _db.evaluations.watch(
+        pipeline,
+        full_document="updateLookup",
+        resume_after=resume_after,
+        max_await_time_ms=1000
+    )
+
+
+async def get_evaluation_changes(jd_id: str, token: dict | None = None, limit: int = 500):
+    if token == {}:
+        last = await _db.evaluations.find_one(*_latest_write_query(jd_id), sort=[("written_at", DESCENDING)])
+        recent = [ev async for ev in _db.evaluations.find(*_overlap_query(jd_id, last))] if last else []
+        return [], _start_token(last, recent)
+
+    token = token or {"since": None, "seen": {}}
+    cursor = _db.evaluations.find(_changes_query(jd_id, token)).sort("written_at", 1).limit(limit + len(token["seen"]))
+    return _advance_token(token, [ev async for ev in cursor], limit)
+
+
+# =====================
+# CANDIDATE SEARCH (ACROSS JDS)
+# =====================
+async def search_evaluations(
+    skills: list | None = None,
+    min_experience: float | None = None,
+    min_score: float | None = None,
+    text: str | None = None,
+    tier: str | None = None,
+    jd_ids: list | None = None,
+    after: dict | None = None,
+    limit: int = 25
+):
+    query = _search_query(skills, min_experience, min_score, text, tier, jd_ids)
+    projection = {**SEARCH_PROJECTION, "candidate_id": 1}
+
+    cursor = (
+        _db.evaluations.find(_with(query, *([_keyset_clause(after)] if after else [])), projection)
+        .sort([("overall_score", DESCENDING), ("_id", DESCENDING)])
+        .batch_size(limit + 1)
+    )
+    results, pending, keys = [], [], set()
+    try:
+        async for ev in cursor:
+            # A candidate's first evaluation in best-first order is their best
+            if _candidate_key(ev) in keys:
+                continue
+            keys.add(_candidate_key(ev))
+            pending.append(ev)
+            if len(results) + len(pending) > limit:
+                results += await _not_on_earlier_pages(query, after, pending)
+                pending = []
+                if len(results) > limit:
+                    break
+        results += await _not_on_earlier_pages(query, after, pending)
+    finally:
+        await cursor.close()
+
+    next_page = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_page = {"score": results[-1]["overall_score"], "id": results[-1]["_id"]}
+
+    if results:
+        evaluations = _db.evaluations.find(
+            _with(query, _candidates_clause([_candidate_key(row) for row in results])),
+            {"jd_id": 1, "candidate_id": 1, "resume_id": 1}
+        )
+        _add_candidate_jds(results, [ev async for ev in evaluations])
+    return results, next_page
+
+
+async def _not_on_earlier_pages(query: dict, after: dict | None, rows: list) -> list:
+    if not after or not rows:
+        return rows
+    listed = {
+        _candidate_key(ev)
+        async for ev in _db.evaluations.find(
+            _with(query, _candidates_clause([_candidate_key(row) for row in rows]), _keyset_clause(after, before=True)),
+            {"candidate_id": 1, "resume_id": 1}
+        )
+    }
+    return [row for row in rows if _candidate_key(row) not in listed]
+
+
+async def backfill_evaluation_search_fields(batch_size: int = 500) -> int:
+    updated = 0
+    while True:
+        evaluations = await (
+            _db.evaluations.find({"canonical_skills": {"$exists": False}}, {"resume_id": 1})
+            .limit(batch_size)
+            .to_list(length=None)
+        )
+        if not evaluations:
+            break
+
+        resumes = await get_resumes_by_ids([ev["resume_id"] for ev in evaluations])
+        await _db.evaluations.bulk_write([
+            UpdateOne(
+                {"_id": ev["_id"]},
+                # Resumes no longer on file get empty fields so the
+                # backfill does not revisit them
+                {"$set": candidate_search_fields(resumes.get(ev["resume_id"], {}))}
+            )
+            for ev in evaluations
+        ], ordered=False)
+        updated += len(evaluations)
+
+    invalidate("evaluations")
+    return updated
+
+
+# =====================
+# EVALUATION RUNS
+# =====================
+async def save_run(doc: dict):
+    return (await _db.evaluation_runs.insert_one(doc)).inserted_id
+
+
+async def update_run(run_id: str, fields: dict):
+    await _db.evaluation_runs.update_one({"run_id": run_id}, {"$set": fields})
+
+
+async def get_run(run_id: str):
+    return await _db.evaluation_runs.find_one({"run_id": run_id}, {"_id": 0})
+
+
+async def get_runs(jd_id: str, status: str | None = None, limit: int = 20):
+    query = {"jd_id": jd_id}
+    if status:
+        query["status"] = status
+    async for run in _db.evaluation_runs.find(query, {"_id": 0}).sort("started_at", DESCENDING).limit(limit):
+        yield run
+
+
+# =====================
+# JD STATS (MATERIALIZED AGGREGATES)
+# =====================
+async def _inc_jd_stats(jd_id, inc: dict):
+    await _db.jd_stats.update_one(
+        {"jd_id": jd_id},
+        {"$inc": inc, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+async def get_jd_stats(jd_id: str) -> dict:
+    stats = await _db.jd_stats.find_one({"jd_id": jd_id}, {"_id": 0})
+    return _finalize_jd_stats(stats or {"jd_id": jd_id})
+
+
+async def rebuild_jd_stats(jd_id: str | None = None) -> int:
+    if jd_id:
+        jd_ids = [jd_id]
+    else:
+        jd_ids = [jd["jd_id"] async for jd in _db.jds.find({}, {"jd_id": 1})]
+    # Archived JDs keep the stats they had when archived
+    archived = {jd["jd_id"] async for jd in _db.jds.find({"archive": {"$exists": True}}, {"jd_id": 1})}
+    jd_ids = [current_jd_id for current_jd_id in jd_ids if current_jd_id not in archived]
+
+    for current_jd_id in jd_ids:
+        status_counts = _db.resumes.aggregate([
+            {"$match": {"jd_id": current_jd_id}},
+            {"$group": {"_id": "$status", "n": {"$sum": 1}}}
+        ])
+        totals = _status_totals([row async for row in status_counts])
+
+        evaluations = _db.evaluations.find(
+            {"jd_id": current_jd_id},
+            {"_id": 0, "overall_score": 1, "candidate_tier": 1, "category_scores": 1}
+        )
+        async for ev in evaluations:
+            for key, value in _evaluation_increments(ev).items():
+                totals[key] = totals.get(key, 0) + value
+
+        stats = _stats_document(current_jd_id, totals)
+        await _db.jd_stats.replace_one({"jd_id": current_jd_id}, stats, upsert=True)
+
+    invalidate("jd_stats")
+    return len(jd_ids)
@@ -0,0 +1,118 @@
+"""
+Process-wide memoization for core/db reads.
+
+Streamlit reruns app.py top to bottom on every widget change, so the same
+reads are repeated constantly. Cached reads are keyed by function and
+arguments, expire after a TTL, and are tagged with a generation counter
+per collection. Write functions bump the generation of every collection
+they touch, so a read is never served stale after one of our own writes.
+"""
+
+import copy
+import threading
+import time
+from functools import wraps
+from core.config_manager import ConfigManager
+
+DEFAULT_TTL_SECONDS = float(ConfigManager.get("READ_CACHE_TTL_SECONDS", 30))
+MAX_ENTRIES = int(ConfigManager.get("READ_CACHE_MAX_ENTRIES", 512))
+
+_lock = threading.Lock()
+_generations: dict[str, int] = {}
+_entries: dict[tuple, tuple] = {}
+_stats: dict[str, dict] = {}
+
+
+def cached_read(*collections: str, ttl: float | None = None):
+    """
+    Decorator for read functions that depend on the given collections.
+    """
+    ttl = DEFAULT_TTL_SECONDS if ttl is None else ttl
+
+    def decorator(func):
+        name = func.__name__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            key = (name, args, tuple(sorted(kwargs.items())))
+
+            with _lock:
+                stats = _stats.setdefault(name, {"hits": 0, "misses": 0})
+                generation = tuple(_generations.get(c, 0) for c in collections)
+                entry = _entries.get(key)
+
+                if entry and entry[0] > time.monotonic() and entry[1] == generation:
+                    stats["hits"] += 1
+                    return _copy(entry[2])
+                stats["misses"] += 1
+
+            # Query outside the lock. The generation snapshot was taken
+            # before the read, so a write racing with it makes this entry
+            # invalid immediately instead of caching stale data.
+            value = func(*args, **kwargs)
+
+            with _lock:
+                if len(_entries) >= MAX_ENTRIES:
+                    _evict()
+                _entries[key] = (time.monotonic() + ttl, generation, value)
+            return _copy(value)
+
+        return wrapper
+
+    return decorator
+
+
+def invalidate(*collections: str):
+    """
+    Bumps the generation of each collection, invalidating dependent reads.
+    """
+    with _lock:
+        for collection in collections:
+            _generations[collection] = _generations.get(collection, 0) + 1
+
+
+def clear_cache():
+    with _lock:
+        _entries.clear()
+        _stats.clear()
+
+
+def get_cache_stats() -> dict:
+    """
+    Returns:
+    {
+        entries,
+        generations: {collection: n},
+        functions: {name: {hits, misses, hit_rate}}
+    }
+    """
+    with _lock:
+        functions = {}
+        for name, stats in _stats.items():
+            total = stats["hits"] + stats["misses"]
+            functions[name] = {
+                **stats,
+                "hit_rate": round(stats["hits"] / total, 3) if total else None
+            }
+        return {
+            "entries": len(_entries),
+            "generations": dict(_generations),
+            "functions": functions
+        }
+
+
+def _copy(value):
+    # Callers get their own documents, so mutating a result never
+    # changes what other sessions read from the cache
+    return copy.deepcopy(value)
+
+
+def _evict():
+    now = time.monotonic()
+    for key in [k for k, entry in _entries.items() if entry[0] <= now]:
+        del _entries[key]
+
+    # Still full: drop the oldest half (dicts keep insertion order)
+    if len(_entries) >= MAX_ENTRIES:
+        for key in list(_entries)[: MAX_ENTRIES // 2]:
+            del _entries[key]
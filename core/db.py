@@ -1,25 +1,80 @@
 import os
-from pymongo import MongoClient, DESCENDING
+from datetime import datetime, timedelta
+from bson import ObjectId
+from pymongo import MongoClient, DESCENDING, ReturnDocument, UpdateOne
 from core.config_manager import ConfigManager
+from core.cache import cached_read, invalidate
+from core.scoring_context import build_scoring_context
+from core.skills import canonicalize, resume_skills
+from core.tracing import traced
 
 _client = None
 _db = None
 
+CANDIDATE_TIERS = ["TOP", "BEST", "MODERATE", "LOW", "VERY_LOW"]
+SCORE_BUCKET_WIDTH = 10
 
+# Created by init_db (and core.async_db.ensure_indexes): (collection, keys, options)
+INDEXES = [
+    ("jd_stats", "jd_id", {"unique": True, "name": "uniq_jd_stats_jd"}),
+    ("evaluations", "resume_id", {"name": "evaluations_resume"}),
+    ("evaluations", [("jd_id", 1), ("_id", 1)], {"name": "evaluations_jd"}),
+    ("evaluations", [("jd_id", 1), ("written_at", 1)], {
+        "partialFilterExpression": {"written_at": {"$exists": True}},
+        "name": "evaluations_jd_written"
+    }),
+    ("evaluations", "jd_id", {
+        "partialFilterExpression": {"provisional": True},
+        "name": "evaluations_provisional"
+    }),
+    ("resumes", "canonical_skills", {"name": "resumes_canonical_skills"}),
+    ("resumes", "candidate_id", {"name": "resumes_candidate"}),
+    ("evaluation_runs", "run_id", {"unique": True, "name": "uniq_evaluation_runs_run"}),
+    ("evaluation_runs", [("jd_id", 1), ("status", 1)], {"name": "evaluation_runs_jd_status"}),
+    ("evaluations", [("canonical_skills", 1), ("overall_score", -1), ("total_experience_years", 1)],
+     {"name": "evaluations_search_skills"}),
+    ("evaluations", [("overall_score", -1), ("total_experience_years", 1)], {"name": "evaluations_search_score"}),
+    ("evaluations", [("total_experience_years", 1), ("overall_score", -1)], {"name": "evaluations_search_experience"}),
+    ("evaluations", [("titles", "text"), ("domain_experience", "text")], {"name": "evaluations_search_text"}),
+    ("evaluations", "candidate_id", {"name": "evaluations_candidate"}),
+    ("archive_resumes", "jd_id", {"name": "archive_resumes_jd"}),
+    ("archive_evaluations", "jd_id", {"name": "archive_evaluations_jd"}),
+]
+
+
+@traced("db.init_db")
 def init_db():
+    """
+    Connects once per process. Streamlit reruns app.py on every widget
+    change, so later calls reuse the existing client and skip index setup.
+    """
     global _client, _db
 
+    if _db is not None:
+        return _db
+
     uri = ConfigManager.get("MONGODB_URI")
     db_name = ConfigManager.get("DB_NAME")
 
     _client = MongoClient(uri)
     _db = _client[db_name]
+
+    for collection, keys, options in INDEXES:
+        _db[collection].create_index(keys, **options)
     return _db
 
 
+def get_db():
+    """
+    Returns the shared database handle, connecting on first use.
+    """
+    return _db if _db is not None else init_db()
+
+
 # =====================
 # JD COLLECTION
 # =====================
+@traced("db.save_jd")
 def save_jd(doc: dict):
     """
     Expects:
@@ -27,19 +82,85 @@ def save_jd(doc: dict):
         jd_id,
         role,
         parsed_jd_json,
+        canonical_skills,
         created_at
     }
+
+    Adds `scoring_context` (core/scoring_context.py) if missing.
+    """
+    doc.setdefault("scoring_context", build_scoring_context(doc["parsed_jd_json"]))
+    inserted_id = _db.jds.insert_one(doc).inserted_id
+    invalidate("jds")
+    return inserted_id
+
+
+@traced("db.save_jds")
+def save_jds(docs: list[dict]):
     """
-    return _db.jds.insert_one(doc).inserted_id
+    Bulk insert of JD documents (same shape as save_jd).
+    """
+    for doc in docs:
+        doc.setdefault("scoring_context", build_scoring_context(doc["parsed_jd_json"]))
+    try:
+        return _db.jds.insert_many(docs, ordered=False).inserted_ids
+    finally:
+        # Some documents may be saved even when the bulk write fails
+        invalidate("jds")
 
 
+@traced("db.get_jds")
+@cached_read("jds")
 def get_jds():
     return list(_db.jds.find({}, {"_id": 0}))
 
 
+@traced("db.backfill_scoring_contexts")
+def backfill_scoring_contexts() -> int:
+    """
+    Adds `scoring_context` to JDs saved before it existed.
+    Returns the number of JDs updated.
+    """
+    updated = 0
+    for jd in _db.jds.find({"scoring_context": {"$exists": False}}, {"jd_id": 1, "parsed_jd_json": 1}):
+        _db.jds.update_one(
+            {"_id": jd["_id"]},
+            {"$set": {"scoring_context": build_scoring_context(jd["parsed_jd_json"])}}
+        )
+        updated += 1
+    invalidate("jds")
+    return updated
+
+
+@traced("db.set_jd_status")
+def set_jd_status(jd_id: str, status: str):
+    """
+    "OPEN" | "CLOSED" (see core/retention.py). JDs saved before statuses
+    existed have none and count as open.
+    """
+    update = {"status": status}
+    if status == "CLOSED":
+        update["closed_at"] = datetime.utcnow()
+    _db.jds.update_one({"jd_id": jd_id}, {"$set": update})
+    invalidate("jds")
+
+
+@traced("db.set_jd_run_budget")
+def set_jd_run_budget(jd_id: str, budget: dict | None):
+    """
+    Default evaluation run budget for a JD (see core/run_planner.py):
+    {tokens, requests}, either may be None. None clears it.
+    """
+    if budget:
+        _db.jds.update_one({"jd_id": jd_id}, {"$set": {"run_budget": budget}})
+    else:
+        _db.jds.update_one({"jd_id": jd_id}, {"$unset": {"run_budget": ""}})
+    invalidate("jds")
+
+
 # =====================
 # RESUME COLLECTION
 # =====================
+@traced("db.save_resume")
 def save_resume(doc: dict):
     """
     Expects:
@@ -47,13 +168,86 @@ def save_resume(doc: dict):
         resume_id,
         candidate_name,
         jd_id,
+        candidate_id,
+        file_hash,
         parsed_resume_json,
+        canonical_skills,
         created_at
     }
     """
     doc["status"] = "NOT_REVIEWED"
-    return _db.resumes.insert_one(doc).inserted_id
+    inserted_id = _db.resumes.insert_one(doc).inserted_id
+    _inc_jd_stats(doc["jd_id"], {"resume_count": 1, "pending_count": 1})
+    invalidate("resumes", "jd_stats")
+    return inserted_id
+
+@traced("db.save_pool_resume")
+def save_pool_resume(doc: dict):
+    """
+    Saves a resume to the shared candidate pool (not bound to a JD).
+    Same shape as save_resume, without jd_id.
+    """
+    doc["jd_id"] = None
+    doc["status"] = "POOL"
+    inserted_id = _db.resumes.insert_one(doc).inserted_id
+    invalidate("resumes")
+    return inserted_id
 
+@traced("db.get_pool_resumes")
+@cached_read("resumes")
+def get_pool_resumes():
+    return list(_db.resumes.find({"status": "POOL"}))
+
+@traced("db.update_resume_parse")
+def update_resume_parse(file_hash: str, parsed_resume: dict, canonical_skills: list | None = None) -> int:
+    """
+    Replaces the parse of every resume uploaded from the same file.
+    Returns the number of resumes updated.
+    """
+    update = {
+        "parsed_resume_json": parsed_resume,
+        "candidate_name": parsed_resume.get("candidate_name", "Unknown"),
+        "reparsed_at": datetime.utcnow()
+    }
+    if canonical_skills is not None:
+        update["canonical_skills"] = canonical_skills
+
+    result = _db.resumes.update_many({"file_hash": file_hash}, {"$set": update})
+    invalidate("resumes")
+    return result.modified_count
+
+@traced("db.get_resumes_by_ids")
+def get_resumes_by_ids(resume_ids: list) -> dict:
+    """
+    Returns {str(_id): resume} for evaluation resume_id values.
+    """
+    ids = [ObjectId(resume_id) for resume_id in resume_ids if ObjectId.is_valid(resume_id)]
+    return {str(r["_id"]): r for r in _db.resumes.find({"_id": {"$in": ids}})}
+
+@traced("db.get_resumes_by_candidate")
+def get_resumes_by_candidate(candidate_id: str):
+    """
+    Every resume of one candidate (see core/identity.py), newest first.
+    """
+    return list(
+        _db.resumes.find({"candidate_id": candidate_id}).sort("created_at", DESCENDING)
+    )
+
+@traced("db.find_resumes_by_skills")
+def find_resumes_by_skills(skills: list, jd_id: str | None = None, match_all: bool = True, limit: int = 50):
+    """
+    Indexed lookup on the canonical skills stored at upload.
+    """
+    query = {"canonical_skills": {"$all" if match_all else "$in": skills}}
+    if jd_id:
+        query["jd_id"] = jd_id
+
+    return list(
+        _db.resumes.find(query, {"parsed_resume_json": 0}).limit(limit)
+    )
+
+@traced("db.get_unreviewed_resumes_by_jd")
+@cached_read("resumes")
 def get_unreviewed_resumes_by_jd(jd_id):
     return list(
         _db.resumes.find({
@@ -62,11 +256,34 @@ def get_unreviewed_resumes_by_jd(jd_id):
         })
     )
 
+@traced("db.set_resume_priority_flag")
+def set_resume_priority_flag(resume_ids: list, flagged: bool = True) -> int:
+    """
+    Manually flags resumes to be scored first by "flagged" priority runs.
+    """
+    result = _db.resumes.update_many(
+        {"_id": {"$in": list(resume_ids)}},
+        {"$set": {"priority_flag": flagged}}
+    )
+    invalidate("resumes")
+    return result.modified_count
+
+@traced("db.mark_resume_reviewed")
 def mark_resume_reviewed(resume_id):
-    _db.resumes.update_one(
-        {"_id": resume_id},
-        {"$set": {"status": "REVIEWED"}}
+    # Only the NOT_REVIEWED -> REVIEWED transition moves the stats counters,
+    # so re-marking an already reviewed resume is a no-op.
+    resume = _db.resumes.find_one_and_update(
+        {"_id": resume_id, "status": "NOT_REVIEWED"},
+        {"$set": {"status": "REVIEWED"}},
+        projection={"jd_id": 1},
+        return_document=ReturnDocument.BEFORE
     )
+    if resume:
+        _inc_jd_stats(resume["jd_id"], {"pending_count": -1, "reviewed_count": 1})
+        invalidate("resumes", "jd_stats")
+
+@traced("db.get_evaluations_by_jd_and_tier")
+@cached_read("evaluations")
 def get_evaluations_by_jd_and_tier(jd_id, tier=None, limit=None):
     query = {"jd_id": jd_id}
 
@@ -81,6 +298,8 @@ def get_evaluations_by_jd_and_tier(jd_id, tier=None, limit=None):
     return list(cursor)
 
 
+@traced("db.get_resumes_by_jd")
+@cached_read("resumes")
 def get_resumes_by_jd(jd_id: str):
     return list(
         _db.resumes.find(
@@ -93,6 +312,7 @@ def get_resumes_by_jd(jd_id: str):
 # =====================
 # EVALUATION COLLECTION
 # =====================
+@traced("db.save_evaluation")
 def save_evaluation(doc: dict):
     """
     Expects:
@@ -104,21 +324,628 @@ def save_evaluation(doc: dict):
         category_scores,
         overall_score,
         candidate_tier,
-        evaluated_at
+        provisional,       # True when scored by the local heuristic scorer
+        evaluated_at,
+        # candidate search fields, see candidate_search_fields
+        canonical_skills,
+        total_experience_years,
+        titles,
+        domain_experience
     }
+
+    Search fields missing from `doc` are copied from the resume. The
+    server stamps `written_at`, which get_evaluation_changes polls on.
+    Saving an `_id` that already exists (a retried write) changes nothing
+    and is not counted again in the JD stats.
     """
-    return _db.evaluations.insert_one(doc).inserted_id
+    if "canonical_skills" not in doc:
+        resume = get_resumes_by_ids([doc["resume_id"]]).get(doc["resume_id"])
+        if resume:
+            doc.update(candidate_search_fields(resume))
+    inserted_id = doc.setdefault("_id", ObjectId())
+    result = _db.evaluations.update_one(
+        {"_id": inserted_id},
+        {
+            "$setOnInsert": {key: value for key, value in doc.items() if key != "_id"},
+            "$currentDate": {"written_at": True}
+        },
+        upsert=True
+    )
+    if result.upserted_id is not None:
+        _inc_jd_stats(doc["jd_id"], _evaluation_increments(doc))
+    invalidate("evaluations", "jd_stats")
+    return inserted_id
 
 
-def get_evaluations_by_jd(jd_id: str, limit: int = 10):
+@traced("db.get_provisional_evaluations")
+def get_provisional_evaluations(jd_id: str | None = None, limit: int | None = None):
     """
-    Returns ranked results for a JD
+    Evaluations waiting for LLM re-scoring, oldest first.
     """
+    query = {"provisional": True}
+    if jd_id:
+        query["jd_id"] = jd_id
+
+    cursor = _db.evaluations.find(query).sort("evaluated_at", 1)
+    if limit:
+        cursor = cursor.limit(limit)
+    return list(cursor)
+
+
+@traced("db.count_provisional_evaluations")
+@cached_read("evaluations")
+def count_provisional_evaluations(jd_id: str) -> int:
+    return _db.evaluations.count_documents({"jd_id": jd_id, "provisional": True})
+
+
+@traced("db.replace_provisional_scores")
+def replace_provisional_scores(evaluation: dict, scores: dict) -> bool:
+    """
+    Replaces a provisional evaluation's scores with LLM scores and moves
+    the JD stats from the old scores to the new ones.
+
+    `scores` holds category_scores, category_explanations, overall_score
+    and candidate_tier. Returns False if it was already re-scored.
+    """
+    result = _db.evaluations.update_one(
+        {"_id": evaluation["_id"], "provisional": True},
+        {
+            "$set": {**scores, "provisional": False, "rescored_at": datetime.utcnow()},
+            "$currentDate": {"written_at": True}
+        }
+    )
+    if not result.modified_count:
+        return False
+
+    inc = _evaluation_increments({**evaluation, **scores})
+    for key, value in _evaluation_increments(evaluation).items():
+        inc[key] = inc.get(key, 0) - value
+    _inc_jd_stats(evaluation["jd_id"], inc)
+    invalidate("evaluations", "jd_stats")
+    return True
+
+
+@traced("db.get_evaluated_jd_ids")
+def get_evaluated_jd_ids(resume_id: str | list) -> set:
+    """
+    JDs a resume (or any of a list of resumes) already has an evaluation for.
+    """
+    resume_ids = resume_id if isinstance(resume_id, list) else [resume_id]
+    return set(_db.evaluations.distinct("jd_id", {"resume_id": {"$in": resume_ids}}))
+
+
+@traced("db.iter_evaluations_by_jd")
+def iter_evaluations_by_jd(jd_id: str, tier=None, batch_size: int = 500):
+    """
+    Streams a JD's evaluations best first from a batched cursor, holding
+    at most one batch in memory (used by core/export.py).
+    """
+    query = {"jd_id": jd_id}
+    if tier and tier != "ALL":
+        query["candidate_tier"] = tier
+
+    cursor = (
+        _db.evaluations.find(query, {"_id": 0})
+        .sort("overall_score", DESCENDING)
+        .batch_size(batch_size)
+    )
+    try:
+        yield from cursor
+    finally:
+        cursor.close()
+
+
+@traced("db.get_evaluations_by_jd")
+@cached_read("evaluations")
+def get_evaluations_by_jd(jd_id: str, limit: int = 10, settled_only: bool = False):
+    """
+    Returns ranked results for a JD; with `settled_only`, without
+    provisional (heuristic) results.
+    """
+    query = {"jd_id": jd_id}
+    if settled_only:
+        query["provisional"] = {"$ne": True}
     return list(
         _db.evaluations.find(
-            {"jd_id": jd_id},
+            query,
             {"_id": 0}
         )
         .sort("overall_score", DESCENDING)
         .limit(limit)
     )
+
+
+
+# =====================
+# LIVE RESULTS
+# =====================
+@traced("db.open_evaluation_stream")
+def open_evaluation_stream(jd_id: str, resume_after=None):
+    """
+    Change stream of a JD's evaluation inserts and updates (re-scoring),
+    plus evaluation deletes (which carry no jd_id). Requires a replica
+    set; raises pymongo.errors.OperationFailure on a standalone server.
+    """
+    pipeline = [{
+        "$match": {
+            "$or": [
+                {"fullDocument.jd_id": jd_id},
+                {"operationType": "delete"}
+            ]
+        }
+    }]
+    return _db.evaluations.watch(
+        pipeline,
+        full_document="updateLookup",
+        resume_after=resume_after,
+        max_await_time_ms=1000
+    )
+
+
+# Polls re-read this far behind the newest written_at seen: concurrent
+# writes can become visible slightly out of written_at order
+POLL_OVERLAP = timedelta(seconds=5)
+
+
+@traced("db.get_evaluation_changes")
+def get_evaluation_changes(jd_id: str, token: dict | None = None, limit: int = 500):
+    """
+    Polling fallback for open_evaluation_stream.
+
+    Polls the server-assigned `written_at` (set on insert and
+    re-scoring), not _id: ObjectIds are generated client-side, so other
+    processes' inserts are not in _id order.
+
+    `token` is the one returned by the previous call ({} for "from now
+    on", None for "from the beginning"). Returns (changed evaluations,
+    new token); deletes are not reported.
+    """
+    if token == {}:
+        last = _db.evaluations.find_one(*_latest_write_query(jd_id), sort=[("written_at", DESCENDING)])
+        recent = _db.evaluations.find(*_overlap_query(jd_id, last)) if last else []
+        return [], _start_token(last, recent)
+
+    token = token or {"since": None, "seen": {}}
+    cursor = _db.evaluations.find(_changes_query(jd_id, token)).sort("written_at", 1).limit(limit + len(token["seen"]))
+    return _advance_token(token, cursor, limit)
+
+
+def _latest_write_query(jd_id: str) -> tuple:
+    return {"jd_id": jd_id, "written_at": {"$exists": True}}, {"written_at": 1}
+
+
+def _overlap_query(jd_id: str, last: dict) -> tuple:
+    return {"jd_id": jd_id, "written_at": {"$gte": last["written_at"] - POLL_OVERLAP}}, {"written_at": 1}
+
+
+def _start_token(last: dict | None, recent) -> dict:
+    """
+    "From now on" token. The next poll re-reads the overlap window, so
+    what is in it now is marked seen.
+    """
+    if not last:
+        return {"since": datetime.utcnow(), "seen": {}}
+    return {"since": last["written_at"], "seen": {ev["_id"]: ev["written_at"] for ev in recent}}
+
+
+def _changes_query(jd_id: str, token: dict) -> dict:
+    query = {"jd_id": jd_id, "written_at": {"$exists": True}}
+    if token["since"] is not None:
+        query["written_at"] = {"$gte": token["since"] - POLL_OVERLAP}
+    return query
+
+
+def _advance_token(token: dict, evaluations, limit: int) -> tuple:
+    seen = token["seen"]
+
+    # Versions already reported inside the overlap window are skipped; a
+    # re-scored evaluation has a new written_at and is reported again
+    changed = [ev for ev in evaluations if seen.get(ev["_id"]) != ev["written_at"]][:limit]
+
+    since = max([ev["written_at"] for ev in changed] + ([token["since"]] if token["since"] else []), default=None)
+    seen = {**seen, **{ev["_id"]: ev["written_at"] for ev in changed}}
+    if since is not None:
+        seen = {key: written_at for key, written_at in seen.items() if written_at >= since - POLL_OVERLAP}
+    return changed, {"since": since, "seen": seen}
+
+
+# =====================
+# CANDIDATE SEARCH (ACROSS JDS)
+# =====================
+SEARCH_PROJECTION = {
+    "jd_id": 1,
+    "resume_id": 1,
+    "candidate_name": 1,
+    "overall_score": 1,
+    "candidate_tier": 1,
+    "provisional": 1,
+    "canonical_skills": 1,
+    "total_experience_years": 1,
+    "titles": 1,
+    "evaluated_at": 1,
+}
+
+
+def candidate_search_fields(resume: dict) -> dict:
+    """
+    Resume fields denormalized onto its evaluations for search.
+    """
+    parsed = resume.get("parsed_resume_json") or {}
+    experience = parsed.get("total_experience_years")
+    return {
+        "candidate_id": resume.get("candidate_id"),
+        "canonical_skills": resume.get("canonical_skills") or resume_skills(parsed),
+        "total_experience_years": experience if isinstance(experience, (int, float)) else None,
+        "titles": [t.get("title") for t in parsed.get("titles_with_dates") or [] if t.get("title")],
+        "domain_experience": [d for d in parsed.get("domain_experience") or [] if isinstance(d, str)],
+    }
+
+
+def _search_query(skills=None, min_experience=None, min_score=None, text=None, tier=None, jd_ids=None) -> dict:
+    query = {}
+    if skills:
+        query["canonical_skills"] = {"$all": canonicalize(skills)}
+    if min_experience is not None:
+        query["total_experience_years"] = {"$gte": min_experience}
+    if min_score is not None:
+        query["overall_score"] = {"$gte": min_score}
+    if text:
+        query["$text"] = {"$search": text}
+    if tier and tier != "ALL":
+        query["candidate_tier"] = tier
+    if jd_ids:
+        query["jd_id"] = {"$in": jd_ids}
+    return query
+
+
+def _candidate_key(ev: dict) -> str:
+    return ev.get("candidate_id") or ev["resume_id"]
+
+
+def _candidates_clause(keys: list) -> dict:
+    """
+    Evaluations of the given candidates; evaluations saved before
+    candidate_id was denormalized are keyed by resume_id.
+    """
+    return {"$or": [
+        {"candidate_id": {"$in": keys}},
+        {"candidate_id": None, "resume_id": {"$in": keys}},
+    ]}
+
+
+def _keyset_clause(after: dict, before: bool = False) -> dict:
+    """
+    Evaluations after (or, with `before`, ranked above) a page boundary
+    in (overall_score, _id) descending order.
+    """
+    op = "$gt" if before else "$lt"
+    return {"$or": [
+        {"overall_score": {op: after["score"]}},
+        {"overall_score": after["score"], "_id": {op: after["id"]}},
+    ]}
+
+
+def _with(query: dict, *clauses: dict) -> dict:
+    return {**query, "$and": list(clauses)} if clauses else query
+
+
+def _add_candidate_jds(rows: list, evaluations) -> list:
+    """
+    Adds jd_ids and evaluation_count to each row from the candidates'
+    matching evaluations.
+    """
+    by_key = {_candidate_key(row): row for row in rows}
+    for row in rows:
+        row["jd_ids"], row["evaluation_count"] = [], 0
+    for ev in evaluations:
+        row = by_key[_candidate_key(ev)]
+        row["evaluation_count"] += 1
+        if ev["jd_id"] not in row["jd_ids"]:
+            row["jd_ids"].append(ev["jd_id"])
+    return rows
+
+
+@traced("db.search_evaluations")
+def search_evaluations(
+    skills: list | None = None,
+    min_experience: float | None = None,
+    min_score: float | None = None,
+    text: str | None = None,
+    tier: str | None = None,
+    jd_ids: list | None = None,
+    after: dict | None = None,
+    limit: int = 25
+):
+    """
+    Evaluated candidates across every JD, best score first: one row per
+    candidate (candidate_id, else resume_id), being their best matching
+    evaluation plus every JD they matched in.
+
+    `skills` (all required) are canonicalized like stored skills and
+    `text` searches titles and domain experience. Pages are keyset
+    based: pass the returned `next` as `after` for the following page.
+    A page reads the index from `after` until it has `limit` new
+    candidates, so its cost grows with the page size and the candidates'
+    evaluation counts, not with the number of matches.
+
+    Returns (results, next)   # next is None on the last page
+    results: [{...SEARCH_PROJECTION, candidate_id, jd_ids, evaluation_count}]
+    """
+    query = _search_query(skills, min_experience, min_score, text, tier, jd_ids)
+    projection = {**SEARCH_PROJECTION, "candidate_id": 1}
+
+    cursor = (
+        _db.evaluations.find(_with(query, *([_keyset_clause(after)] if after else [])), projection)
+        .sort([("overall_score", DESCENDING), ("_id", DESCENDING)])
+        .batch_size(limit + 1)
+    )
+    results, pending, keys = [], [], set()
+    try:
+        for ev in cursor:
+            # A candidate's first evaluation in best-first order is their best
+            if _candidate_key(ev) in keys:
+                continue
+            keys.add(_candidate_key(ev))
+            pending.append(ev)
+            if len(results) + len(pending) > limit:
+                results += _not_on_earlier_pages(query, after, pending)
+                pending = []
+                if len(results) > limit:
+                    break
+        results += _not_on_earlier_pages(query, after, pending)
+    finally:
+        cursor.close()
+
+    next_page = None
+    if len(results) > limit:
+        results = results[:limit]
+        next_page = {"score": results[-1]["overall_score"], "id": results[-1]["_id"]}
+
+    if results:
+        evaluations = _db.evaluations.find(
+            _with(query, _candidates_clause([_candidate_key(row) for row in results])),
+            {"jd_id": 1, "candidate_id": 1, "resume_id": 1}
+        )
+        _add_candidate_jds(results, evaluations)
+    return results, next_page
+
+
+def _not_on_earlier_pages(query: dict, after: dict | None, rows: list) -> list:
+    """
+    Drops candidates with a matching evaluation ranked above `after`:
+    an earlier page already listed them.
+    """
+    if not after or not rows:
+        return rows
+    listed = {
+        _candidate_key(ev)
+        for ev in _db.evaluations.find(
+            _with(query, _candidates_clause([_candidate_key(row) for row in rows]), _keyset_clause(after, before=True)),
+            {"candidate_id": 1, "resume_id": 1}
+        )
+    }
+    return [row for row in rows if _candidate_key(row) not in listed]
+
+
+@traced("db.backfill_evaluation_search_fields")
+def backfill_evaluation_search_fields(batch_size: int = 500) -> int:
+    """
+    Adds candidate search fields to evaluations saved before they
+    existed. Returns the number of evaluations updated.
+    """
+    updated = 0
+    while True:
+        evaluations = list(
+            _db.evaluations.find({"canonical_skills": {"$exists": False}}, {"resume_id": 1}).limit(batch_size)
+        )
+        if not evaluations:
+            break
+
+        resumes = get_resumes_by_ids([ev["resume_id"] for ev in evaluations])
+        _db.evaluations.bulk_write([
+            UpdateOne(
+                {"_id": ev["_id"]},
+                # Resumes no longer on file get empty fields so the
+                # backfill does not revisit them
+                {"$set": candidate_search_fields(resumes.get(ev["resume_id"], {}))}
+            )
+            for ev in evaluations
+        ], ordered=False)
+        updated += len(evaluations)
+
+    invalidate("evaluations")
+    return updated
+
+
+# =====================
+# EVALUATION RUNS
+# =====================
+@traced("db.save_run")
+def save_run(doc: dict):
+    """
+    Expects:
+    {
+        run_id,
+        jd_id,
+        priority,            # "newest" | "prior" | "flagged"
+        budget,              # {tokens, requests}
+        status,              # "RUNNING" | "PAUSED" | "COMPLETED" | "FAILED"
+        error,               # message of the exception that failed the run
+        scored,
+        remaining,
+        oversized,           # [{resume_id, candidate_name, estimated_tokens}] above the token budget
+        estimated_tokens,
+        actual,              # {requests, prompt_tokens, completion_tokens, unmetered_requests}
+        started_at,
+        updated_at
+    }
+    """
+    return _db.evaluation_runs.insert_one(doc).inserted_id
+
+
+@traced("db.update_run")
+def update_run(run_id: str, fields: dict):
+    _db.evaluation_runs.update_one({"run_id": run_id}, {"$set": fields})
+
+
+@traced("db.get_run")
+def get_run(run_id: str):
+    return _db.evaluation_runs.find_one({"run_id": run_id}, {"_id": 0})
+
+
+@traced("db.get_runs")
+def get_runs(jd_id: str, status: str | None = None, limit: int = 20):
+    """
+    Evaluation runs of a JD, newest first.
+    """
+    query = {"jd_id": jd_id}
+    if status:
+        query["status"] = status
+    return list(
+        _db.evaluation_runs.find(query, {"_id": 0}).sort("started_at", DESCENDING).limit(limit)
+    )
+
+
+# =====================
+# JD STATS (MATERIALIZED AGGREGATES)
+# =====================
+def _score_bucket(score: float) -> str:
+    """
+    Lower bound of the histogram bucket for a 0-100 score.
+    A perfect 100 is folded into the top bucket.
+    """
+    score = min(max(score, 0), 100)
+    bucket = int(score // SCORE_BUCKET_WIDTH) * SCORE_BUCKET_WIDTH
+    return str(min(bucket, 100 - SCORE_BUCKET_WIDTH))
+
+
+def _evaluation_increments(doc: dict) -> dict:
+    """
+    $inc payload one evaluation contributes to its JD stats document.
+    """
+    inc = {
+        "evaluated_count": 1,
+        "score_sum": doc["overall_score"],
+        f"tier_counts.{doc['candidate_tier']}": 1,
+        f"score_histogram.{_score_bucket(doc['overall_score'])}": 1,
+    }
+    for category, score in doc.get("category_scores", {}).items():
+        inc[f"category_score_sums.{category}"] = score
+    return inc
+
+
+def _inc_jd_stats(jd_id, inc: dict):
+    _db.jd_stats.update_one(
+        {"jd_id": jd_id},
+        {"$inc": inc, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True
+    )
+
+
+@traced("db.get_jd_stats")
+@cached_read("jd_stats")
+def get_jd_stats(jd_id: str) -> dict:
+    """
+    Single point read of the materialized stats for a JD.
+
+    Returns:
+    {
+        jd_id,
+        resume_count,
+        pending_count,
+        reviewed_count,
+        evaluated_count,
+        tier_counts,
+        score_histogram,
+        avg_overall_score,
+        category_averages
+    }
+    """
+    stats = _db.jd_stats.find_one({"jd_id": jd_id}, {"_id": 0})
+    return _finalize_jd_stats(stats or {"jd_id": jd_id})
+
+
+def _finalize_jd_stats(stats: dict) -> dict:
+    for key in ("resume_count", "pending_count", "reviewed_count", "evaluated_count"):
+        stats.setdefault(key, 0)
+    stats.setdefault("tier_counts", {})
+    stats.setdefault("score_histogram", {})
+
+    evaluated = stats["evaluated_count"]
+    stats["avg_overall_score"] = (
+        round(stats.get("score_sum", 0) / evaluated, 2) if evaluated else None
+    )
+    stats["category_averages"] = {
+        category: round(total / evaluated, 2)
+        for category, total in stats.get("category_score_sums", {}).items()
+    } if evaluated else {}
+
+    return stats
+
+
+def _stats_document(jd_id: str, totals: dict) -> dict:
+    """
+    Expands dotted $inc paths back into a nested stats document.
+    """
+    stats = {"jd_id": jd_id, "updated_at": datetime.utcnow()}
+    for key, value in totals.items():
+        parent, _, child = key.partition(".")
+        if child:
+            stats.setdefault(parent, {})[child] = value
+        else:
+            stats[key] = value
+    return stats
+
+
+def _status_totals(status_counts) -> dict:
+    totals = {"resume_count": 0, "pending_count": 0, "reviewed_count": 0}
+    for row in status_counts:
+        totals["resume_count"] += row["n"]
+        if row["_id"] == "NOT_REVIEWED":
+            totals["pending_count"] += row["n"]
+        elif row["_id"] == "REVIEWED":
+            totals["reviewed_count"] += row["n"]
+    return totals
+
+
+@traced("db.rebuild_jd_stats")
+def rebuild_jd_stats(jd_id: str | None = None) -> int:
+    """
+    Repair job: recomputes stats from the source collections.
+    Rebuilds a single JD, or every JD when jd_id is None.
+
+    Archived JDs are skipped: their resumes and evaluations are in cold
+    storage (core/retention.py), so their stats stay as archived.
+
+    Returns the number of stats documents rebuilt.
+    """
+    archived = {jd["jd_id"] for jd in _db.jds.find({"archive": {"$exists": True}}, {"jd_id": 1})}
+    jd_ids = [jd_id] if jd_id else [jd["jd_id"] for jd in _db.jds.find({}, {"jd_id": 1})]
+    jd_ids = [current_jd_id for current_jd_id in jd_ids if current_jd_id not in archived]
+
+    for current_jd_id in jd_ids:
+        totals = _status_totals(_db.resumes.aggregate([
+            {"$match": {"jd_id": current_jd_id}},
+            {"$group": {"_id": "$status", "n": {"$sum": 1}}}
+        ]))
+
+        evaluations = _db.evaluations.find(
+            {"jd_id": current_jd_id},
+            {"_id": 0, "overall_score": 1, "candidate_tier": 1, "category_scores": 1}
+        )
+        for ev in evaluations:
+            for key, value in _evaluation_increments(ev).items():
+                totals[key] = totals.get(key, 0) + value
+
+        stats = _stats_document(current_jd_id, totals)
+        _db.jd_stats.replace_one({"jd_id": current_jd_id}, stats, upsert=True)
+
+    invalidate("jd_stats")
+    return len(jd_ids)
+
+
+if __name__ == "__main__":
+    init_db()
+    print(f"Rebuilt stats for {rebuild_jd_stats()} JD(s)")
+    print(f"Added scoring context to {backfill_scoring_contexts()} JD(s)")
+    print(f"Added search fields to {backfill_evaluation_search_fields()} evaluation(s)")
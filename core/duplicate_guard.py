@@ -1,31 +1,72 @@
 import hashlib
 from datetime import datetime
 from pymongo.errors import DuplicateKeyError
-from core.db import init_db
+from core.config_manager import ConfigManager
+from core.db import get_db
+from core.tracing import traced
 
 # -------------------------------------------------
-# DB + Collection (AUTO-CREATED)
+# DB + Collection (AUTO-CREATED ON FIRST USE)
 # -------------------------------------------------
-db = init_db()
-fingerprints_col = db["file_fingerprints"]
+_fingerprints_col = None
 
-# -------------------------------------------------
-# AUTO-ENSURE UNIQUE INDEX (SAFE ON EVERY START)
-# -------------------------------------------------
-fingerprints_col.create_index(
-    [
-        ("file_hash", 1),
-        ("file_type", 1),
-        ("jd_id", 1),
-    ],
-    unique=True,
-    name="uniq_file_hash_type_jd"
-)
+# Resume fingerprints of a JD closed this long ago expire (TTL index on
+# `jd_closed_at`, set by core/retention.py); open JDs', JD files' and
+# pool fingerprints are kept. 0 keeps them all forever.
+FINGERPRINT_TTL_DAYS = int(ConfigManager.get("FINGERPRINT_TTL_DAYS", 365))
+_TTL_INDEX = "ttl_file_fingerprints"
+
+
+def _get_fingerprints_col():
+    global _fingerprints_col
+
+    if _fingerprints_col is None:
+        col = get_db()["file_fingerprints"]
+
+        # AUTO-ENSURE UNIQUE INDEX (ONCE PER PROCESS)
+        col.create_index(
+            [
+                ("file_hash", 1),
+                ("file_type", 1),
+                ("jd_id", 1),
+            ],
+            unique=True,
+            name="uniq_file_hash_type_jd"
+        )
+        _ensure_ttl_index(col, FINGERPRINT_TTL_DAYS * 86400)
+        _fingerprints_col = col
+    return _fingerprints_col
+
+
+def _ensure_ttl_index(col, seconds: int):
+    existing = col.index_information().get(_TTL_INDEX)
+
+    # Disabled, or built on `created_at` by an earlier version
+    if existing and (not seconds or existing["key"] != [("jd_closed_at", 1)]):
+        col.drop_index(_TTL_INDEX)
+        existing = None
+    if not seconds:
+        return
+
+    if existing is None:
+        col.create_index("jd_closed_at", expireAfterSeconds=seconds, name=_TTL_INDEX)
+    elif existing.get("expireAfterSeconds") != seconds:
+        # The window changed since the index was built: update it in place
+        col.database.command(
+            "collMod", col.name,
+            index={"name": _TTL_INDEX, "expireAfterSeconds": seconds}
+        )
 
 # -------------------------------------------------
 # HELPERS
 # -------------------------------------------------
-def _compute_file_hash(file):
+@traced("ingest.compute_file_hash")
+def compute_file_hash(file):
+    # Hash the upload's own buffer (UploadedFile / IngestBuffer) in place
+    if hasattr(file, "getbuffer"):
+        with file.getbuffer() as view:
+            return hashlib.md5(view).hexdigest()
+
     file.seek(0)
     content = file.read()
     file.seek(0)
@@ -34,18 +75,27 @@ def _compute_file_hash(file):
 # -------------------------------------------------
 # PUBLIC API
 # -------------------------------------------------
-def register_file_or_skip(file, file_type: str, jd_id: str | None = None):
+@traced("ingest.register_file_or_skip")
+def register_file_or_skip(
+    file,
+    file_type: str,
+    jd_id: str | None = None,
+    file_hash: str | None = None
+):
     """
     Atomic duplicate guard.
 
+    Pass `file_hash` when the caller already computed it to avoid
+    hashing the file twice.
+
     Returns:
         (True, None)  -> New file, safe to process
         (False, name) -> Duplicate file, skipped
     """
-    file_hash = _compute_file_hash(file)
+    file_hash = file_hash or compute_file_hash(file)
 
     try:
-        fingerprints_col.insert_one({
+        _get_fingerprints_col().insert_one({
             "file_hash": file_hash,
             "file_type": file_type,  # "jd" | "resume"
             "jd_id": jd_id,          # scoped for resumes
@@ -55,4 +105,27 @@ def register_file_or_skip(file, file_type: str, jd_id: str | None = None):
         return True, None
 
     except DuplicateKeyError:
-        return False, file.name
\ No newline at end of file
+        return False, file.name
+
+
+def schedule_fingerprint_expiry(jd_id: str, closed_at: datetime | None):
+    """
+    Starts the TTL countdown of a JD's resume fingerprints from
+    `closed_at`, or cancels it (None) when the JD is reopened.
+    """
+    if closed_at:
+        update = {"$set": {"jd_closed_at": closed_at}}
+    else:
+        update = {"$unset": {"jd_closed_at": ""}}
+    _get_fingerprints_col().update_many({"jd_id": jd_id}, update)
+
+
+def release_file(file_hash: str, file_type: str, jd_id: str | None = None):
+    """
+    Removes a fingerprint so a file whose processing failed can be retried.
+    """
+    _get_fingerprints_col().delete_one({
+        "file_hash": file_hash,
+        "file_type": file_type,
+        "jd_id": jd_id
+    })
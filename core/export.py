@@ -0,0 +1,179 @@
+"""
+Streaming export of ranked evaluations.
+
+Rows come from a batched MongoDB cursor and are written chunk by chunk,
+so memory stays constant however many candidates a JD has. Each row
+flattens category_scores and category_explanations into one column per
+rubric category. Parquet needs the optional `pyarrow` package.
+
+Nightly export from the command line:
+
+    python -m core.export <jd_id> --format parquet --out ranked.parquet
+"""
+
+import argparse
+import csv
+import io
+import json
+from itertools import islice
+from typing import Dict, Any, Iterator, List
+
+from core.db import init_db, iter_evaluations_by_jd
+from core.rubric import RUBRIC_CATEGORIES
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # optional dependency
+    pyarrow = None
+
+EXPORT_FORMATS = ["csv", "jsonl", "parquet"]
+CHUNK_ROWS = 500
+
+BASE_COLUMNS = [
+    "rank",
+    "candidate_name",
+    "resume_id",
+    "overall_score",
+    "candidate_tier",
+    "source",
+    "evaluated_at",
+]
+SCORE_COLUMNS = [f"score: {category}" for category in RUBRIC_CATEGORIES]
+EXPLANATION_COLUMNS = [f"explanation: {category}" for category in RUBRIC_CATEGORIES]
+COLUMNS = BASE_COLUMNS + SCORE_COLUMNS + EXPLANATION_COLUMNS
+
+
+# -------------------------------------------------
+# ROWS
+# -------------------------------------------------
+def flatten_evaluation(ev: Dict[str, Any], rank: int) -> Dict[str, Any]:
+    scores = ev.get("category_scores") or {}
+    explanations = ev.get("category_explanations") or {}
+    evaluated_at = ev.get("evaluated_at")
+
+    row = {
+        "rank": rank,
+        "candidate_name": ev.get("candidate_name"),
+        "resume_id": ev.get("resume_id"),
+        "overall_score": ev.get("overall_score"),
+        "candidate_tier": ev.get("candidate_tier"),
+        "source": ev.get("source", "JD"),
+        "evaluated_at": evaluated_at.isoformat() if evaluated_at else None,
+    }
+    for category in RUBRIC_CATEGORIES:
+        row[f"score: {category}"] = scores.get(category)
+        row[f"explanation: {category}"] = explanations.get(category)
+    return row
+
+
+def iter_rows(jd_id: str, tier=None, batch_size: int = CHUNK_ROWS) -> Iterator[Dict[str, Any]]:
+    """
+    Flattened rows in rank order.
+    """
+    evaluations = iter_evaluations_by_jd(jd_id, tier, batch_size=batch_size)
+    for rank, ev in enumerate(evaluations, 1):
+        yield flatten_evaluation(ev, rank)
+
+
+def _chunks(rows: Iterator[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    while True:
+        chunk = list(islice(rows, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# -------------------------------------------------
+# WRITERS
+# -------------------------------------------------
+def _write_csv(rows, out, chunk_rows):
+    text = io.TextIOWrapper(out, encoding="utf-8", newline="", write_through=True)
+    writer = csv.DictWriter(text, fieldnames=COLUMNS)
+    writer.writeheader()
+    for chunk in _chunks(rows, chunk_rows):
+        writer.writerows(chunk)
+    text.detach()
+
+
+def _write_jsonl(rows, out, chunk_rows):
+    for chunk in _chunks(rows, chunk_rows):
+        out.write("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in chunk).encode("utf-8"))
+
+
+def _parquet_schema():
+    fields = [
+        ("rank", pyarrow.int64()),
+        ("candidate_name", pyarrow.string()),
+        ("resume_id", pyarrow.string()),
+        ("overall_score", pyarrow.float64()),
+        ("candidate_tier", pyarrow.string()),
+        ("source", pyarrow.string()),
+        ("evaluated_at", pyarrow.string()),
+    ]
+    fields += [(column, pyarrow.float64()) for column in SCORE_COLUMNS]
+    fields += [(column, pyarrow.string()) for column in EXPLANATION_COLUMNS]
+    return pyarrow.schema(fields)
+
+
+def _write_parquet(rows, out, chunk_rows):
+    if pyarrow is None:
+        raise RuntimeError("Parquet export requires the pyarrow package")
+
+    schema = _parquet_schema()
+    # One row group per chunk, so only one chunk is ever held in memory
+    with pyarrow.parquet.ParquetWriter(out, schema) as writer:
+        for chunk in _chunks(rows, chunk_rows):
+            writer.write_batch(pyarrow.RecordBatch.from_pylist(chunk, schema=schema))
+
+
+_WRITERS = {
+    "csv": _write_csv,
+    "jsonl": _write_jsonl,
+    "parquet": _write_parquet,
+}
+
+
+# -------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------
+def export_evaluations(jd_id: str, fmt: str, out, tier=None, chunk_rows: int = CHUNK_ROWS) -> int:
+    """
+    Writes a JD's ranked evaluations to a binary file object.
+
+    Args:
+        jd_id: JD to export
+        fmt: "csv", "jsonl" or "parquet"
+        out: writable binary file object
+        tier: optional candidate tier filter ("ALL" or None for every tier)
+
+    Returns:
+        int: number of rows written
+    """
+    if fmt not in _WRITERS:
+        raise ValueError(f"Unsupported export format: {fmt}")
+
+    written = 0
+
+    def counted(rows):
+        nonlocal written
+        for row in rows:
+            written += 1
+            yield row
+
+    _WRITERS[fmt](counted(iter_rows(jd_id, tier, batch_size=chunk_rows)), out, chunk_rows)
+    return written
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export ranked evaluations for a JD")
+    parser.add_argument("jd_id")
+    parser.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    parser.add_argument("--tier", default=None)
+    parser.add_argument("--out", required=True)
+    args = parser.parse_args()
+
+    init_db()
+    with open(args.out, "wb") as out:
+        count = export_evaluations(args.jd_id, args.format, out, tier=args.tier)
+    print(f"Exported {count} evaluation(s) to {args.out}")
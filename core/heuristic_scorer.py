@@ -0,0 +1,173 @@
+"""
+Deterministic local rubric engine.
+
+Scores all RUBRIC_CATEGORIES from the parsed JD and resume JSON alone
+(skill/tool overlap, experience vs requirement, counts of impact
+metrics, leadership signals and projects, field completeness) in
+microseconds, with no LLM call. Output has the same shape as the LLM
+scoring response, so it goes through the normal final score and tier
+computation; results built from it are marked provisional.
+"""
+
+import re
+from typing import Dict, Any, Iterable
+
+from core.rubric import RUBRIC_CATEGORIES
+from core.skills import jd_skills, resume_skills
+
+# Fields whose presence makes up Resume Quality
+QUALITY_FIELDS = [
+    "candidate_name",
+    "total_experience_years",
+    "location",
+    "titles_with_dates",
+    "career_progression",
+    "skills_with_context",
+    "tools_with_context",
+    "domain_experience",
+    "projects",
+    "impact_metrics",
+    "leadership_signals",
+    "professional_presence_links",
+]
+
+_NUMBER = re.compile(r"\d+(?:\.\d+)?")
+_WORD = re.compile(r"[a-z0-9+#]+")
+
+
+# -------------------- HELPERS --------------------
+
+def _clamp(score: float) -> int:
+    return int(round(min(max(score, 0), 100)))
+
+
+def _count(parsed: Dict[str, Any], field: str) -> int:
+    return len(parsed.get(field) or [])
+
+
+def _coverage(required: Iterable[str], have: set) -> tuple[int, int]:
+    required = set(required)
+    return len(required & have), len(required)
+
+
+def _required_years(value) -> float | None:
+    """
+    Minimum years from experience_required ("3-5 years", 4, "5+ yrs").
+    """
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return float(value)
+    match = _NUMBER.search(str(value or ""))
+    return float(match.group()) if match else None
+
+
+def _words(values) -> set:
+    words = set()
+    for value in values or []:
+        if isinstance(value, str):
+            words.update(w for w in _WORD.findall(value.lower()) if len(w) > 2)
+    return words
+
+
+# -------------------- CATEGORIES --------------------
+
+def _professional_presence(resume) -> tuple[int, str]:
+    links = [link.lower() for link in resume.get("professional_presence_links") or [] if isinstance(link, str)]
+    score = 20
+    score += 40 if any("linkedin" in link for link in links) else 0
+    score += 30 if any("github" in link or "gitlab" in link for link in links) else 0
+    score += 10 * sum(1 for link in links if "linkedin" not in link and "github" not in link)
+    return _clamp(score), f"{len(links)} professional profile link(s) listed."
+
+
+def _experience(jd, resume) -> tuple[int, str]:
+    years = resume.get("total_experience_years")
+    if not isinstance(years, (int, float)) or isinstance(years, bool):
+        return 30, "Total experience not stated."
+
+    required = _required_years(jd.get("experience_required"))
+    if required:
+        score = 40 + 60 * min(years / required, 1.0)
+        detail = f"{years:g} years against {required:g} required."
+    else:
+        score = 30 + 10 * years
+        detail = f"{years:g} years; no requirement stated."
+
+    score += 5 * min(_count(resume, "leadership_signals"), 2)
+    return _clamp(score), detail
+
+
+def _impact(resume) -> tuple[int, str]:
+    n = _count(resume, "impact_metrics")
+    return _clamp(25 + 15 * n), f"{n} quantified impact metric(s)."
+
+
+def _skills(jd_sets, candidate, jd, resume) -> tuple[int, str]:
+    mandatory, mandatory_total = _coverage(jd_sets["mandatory"], candidate)
+    supporting, supporting_total = _coverage(jd_sets["supporting"], candidate)
+
+    domain_required = _words(jd.get("domain_knowledge"))
+    domain_have = _words(resume.get("domain_experience"))
+    domain = len(domain_required & domain_have) / len(domain_required) if domain_required else 0.0
+
+    score = 100 * (
+        0.7 * (mandatory / mandatory_total if mandatory_total else 0.5)
+        + 0.2 * (supporting / supporting_total if supporting_total else 0.5)
+        + 0.1 * domain
+    )
+    return _clamp(score), (
+        f"{mandatory}/{mandatory_total} mandatory and "
+        f"{supporting}/{supporting_total} supporting skills matched."
+    )
+
+
+def _tools(jd_sets, candidate, resume) -> tuple[int, str]:
+    matched, total = _coverage(jd_sets["tools"], candidate)
+    if total:
+        return _clamp(100 * matched / total), f"{matched}/{total} required tools matched."
+    n = _count(resume, "tools_with_context")
+    return _clamp(20 + 10 * n), f"{n} tool(s) listed; JD names no tools."
+
+
+def _projects(resume) -> tuple[int, str]:
+    projects = _count(resume, "projects")
+    leadership = _count(resume, "leadership_signals")
+    return (
+        _clamp(20 + 15 * projects + 10 * leadership),
+        f"{projects} project(s), {leadership} leadership signal(s)."
+    )
+
+
+def _resume_quality(resume) -> tuple[int, str]:
+    filled = sum(1 for field in QUALITY_FIELDS if resume.get(field) not in (None, "", []))
+    return _clamp(100 * filled / len(QUALITY_FIELDS)), f"{filled}/{len(QUALITY_FIELDS)} resume sections present."
+
+
+# -------------------- MAIN ENTRY --------------------
+
+def heuristic_scores(
+    parsed_jd: Dict[str, Any],
+    parsed_resume: Dict[str, Any],
+    candidate_skills: Iterable[str] | None = None
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Returns {category: {"score", "explanation"}} for every rubric
+    category, in the LLM response shape.
+
+    Pass the resume's stored `canonical_skills` to skip recomputing them.
+    """
+    jd_sets = jd_skills(parsed_jd)
+    candidate = set(candidate_skills if candidate_skills is not None else resume_skills(parsed_resume))
+
+    scores = {
+        "Professional Presence": _professional_presence(parsed_resume),
+        "Experience & Seniority": _experience(parsed_jd, parsed_resume),
+        "Impact & Results": _impact(parsed_resume),
+        "Skills Credibility & Domain Knowledge": _skills(jd_sets, candidate, parsed_jd, parsed_resume),
+        "Tools & Technology": _tools(jd_sets, candidate, parsed_resume),
+        "Projects & Ownership": _projects(parsed_resume),
+        "Resume Quality": _resume_quality(parsed_resume),
+    }
+    return {
+        category: {"score": scores[category][0], "explanation": f"Provisional: {scores[category][1]}"}
+        for category in RUBRIC_CATEGORIES
+    }
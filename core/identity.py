@@ -0,0 +1,216 @@
+"""
+Candidate identity resolution.
+
+Maps normalized contact keys (email, phone, profile URL) to a stable
+candidate_id, so the same person uploaded under another file name or for
+another JD is recognised. An earlier parse is reused instead of a new
+LLM call only when the file or its extracted text is unchanged.
+
+Keys come only from the contact block (the lines before the first
+section heading, plus contact/links sections) and the parsed profile
+links, never from the body or a references section, and phones must be
+written like phone numbers, so dates and grades are not mistaken for
+them.
+
+Keys are stored hashed (`candidate_identities._id`), one document per
+key, so the unique `_id` index is the identity index and one `$in`
+query resolves every key of an upload.
+"""
+
+import hashlib
+import re
+import uuid
+from datetime import datetime
+from typing import Dict, Any, Iterable, List
+
+from pymongo import UpdateOne
+
+from core.db import get_db, get_resumes_by_candidate
+from core.segmenter import segment_resume
+from core.text_store import load_text
+
+_COLLECTION = "candidate_identities"
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+# Digit groups joined by single separators ("+91 98765 43210",
+# "(555) 010-0100"), a "+" prefixed run, or a labelled run ("Mobile:
+# 9876543210"). Bare digit runs and spaced ranges ("2016 - 2020") are not
+# phones.
+_PHONE = re.compile(
+    r"(?<![\w+.])(?:\+\d{1,3}[ .-]?)?(?:\(\d{1,5}\)[ .-]?)?\d{2,5}(?:[ .-]\d{2,5}){1,4}(?![\w.])"
+    r"|\+\d{10,15}\b"
+    r"|(?:phone|mobile|mob|tel|cell|contact)[\w .]*?[:\-]\s*(\d{10,15})\b",
+    re.IGNORECASE
+)
+_PROFILE_URL = re.compile(
+    r"(?:https?://)?(?:www\.)?(?:linkedin\.com/in|github\.com)/[\w%-]+",
+    re.IGNORECASE
+)
+_YEAR = re.compile(r"\b(?:19|20)\d\d\b")
+_URL_PREFIX = re.compile(r"^(?:https?://)?(?:www\.)?", re.IGNORECASE)
+
+# Phones are keyed on their last digits so "+91 98765 43210" and
+# "098765-43210" resolve to the same candidate
+_PHONE_KEY_DIGITS = 10
+
+# Lines of text before the first heading searched for contact details;
+# a resume without recognized headings is all "header"
+CONTACT_BLOCK_LINES = 15
+CONTACT_SECTIONS = {"links", "personal"}
+
+
+# -------------------------------------------------
+# NORMALIZATION
+# -------------------------------------------------
+def normalize_email(value: str) -> str | None:
+    value = (value or "").strip().lower()
+    if "@" not in value:
+        return None
+    local, domain = value.rsplit("@", 1)
+    local = local.split("+", 1)[0]
+    return f"{local}@{domain}" if local and domain else None
+
+
+def normalize_phone(value: str) -> str | None:
+    digits = re.sub(r"\D", "", value or "")
+    if not 10 <= len(digits) <= 15:
+        return None
+    return digits[-_PHONE_KEY_DIGITS:]
+
+
+def normalize_url(value: str) -> str | None:
+    value = _URL_PREFIX.sub("", (value or "").strip().lower())
+    value = value.split("?", 1)[0].split("#", 1)[0].rstrip("/")
+    return value if "/" in value else None
+
+
+def contact_block(raw_text: str) -> str:
+    """
+    The part of the resume that holds the candidate's own contact details.
+    """
+    lines = []
+    for section, section_lines in segment_resume(raw_text or ""):
+        if section == "header":
+            lines += section_lines[:CONTACT_BLOCK_LINES]
+        elif section in CONTACT_SECTIONS:
+            lines += section_lines
+    return "\n".join(lines)
+
+
+def identity_keys(raw_text: str = "", parsed_resume: Dict[str, Any] | None = None) -> List[str]:
+    """
+    Normalized identity keys ("email:...", "phone:...", "url:...") found
+    in the contact block of the raw text and in the parsed
+    professional_presence_links.
+    """
+    text = contact_block(raw_text)
+    keys = []
+    for match in _EMAIL.findall(text):
+        keys.append(("email", normalize_email(match)))
+    for match in _PHONE.finditer(text):
+        # "2018-2020 2021" is a date range, not a phone
+        if match.group(1) is None and len(_YEAR.findall(match.group())) >= 2:
+            continue
+        keys.append(("phone", normalize_phone(match.group(1) or match.group())))
+
+    urls = _PROFILE_URL.findall(text)
+    urls += (parsed_resume or {}).get("professional_presence_links") or []
+    for url in urls:
+        if isinstance(url, str):
+            keys.append(("url", normalize_url(url)))
+
+    return list(dict.fromkeys(f"{kind}:{value}" for kind, value in keys if value))
+
+
+def _key_id(key: str) -> str:
+    # Contact details are PII; only their digest is stored
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+# -------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------
+def resolve_candidate(keys: Iterable[str]) -> str | None:
+    """
+    Returns the candidate_id any of the keys is registered to, or None.
+    One indexed query, whatever the number of keys.
+    """
+    ids = [_key_id(key) for key in keys]
+    if not ids:
+        return None
+
+    matches = list(get_db()[_COLLECTION].find({"_id": {"$in": ids}}, {"candidate_id": 1}))
+    if not matches:
+        return None
+
+    # Prefer the key seen first on the resume (email before phone before URL)
+    order = {key_id: idx for idx, key_id in enumerate(ids)}
+    matches.sort(key=lambda doc: order[doc["_id"]])
+    return matches[0]["candidate_id"]
+
+
+def register_identity(keys: Iterable[str], candidate_id: str | None = None) -> str | None:
+    """
+    Registers keys to a candidate, creating a new candidate_id when none
+    is given. Keys already registered keep their existing candidate, so
+    concurrent uploads of the same person converge on one id.
+
+    Returns the candidate_id now stored for the keys, or None without keys.
+    """
+    keys = list(keys)
+    if not keys:
+        return None
+
+    candidate_id = candidate_id or str(uuid.uuid4())
+    now = datetime.utcnow()
+    get_db()[_COLLECTION].bulk_write(
+        [
+            UpdateOne(
+                {"_id": _key_id(key)},
+                {"$setOnInsert": {
+                    "candidate_id": candidate_id,
+                    "kind": key.split(":", 1)[0],
+                    "created_at": now
+                }},
+                upsert=True
+            )
+            for key in keys
+        ],
+        ordered=False
+    )
+    return resolve_candidate(keys)
+
+
+def lookup_upload(raw_text: str, file_hash: str | None = None) -> Dict[str, Any]:
+    """
+    Identity lookup for a new upload, before it is parsed.
+
+    Returns:
+    {
+        keys,
+        candidate_id,     # None for an unknown candidate
+        prior_resumes,    # earlier resumes of the candidate, newest first
+        prior_parse       # parsed_resume_json of an earlier upload of the
+                          # same file or text, else None
+    }
+    """
+    keys = identity_keys(raw_text)
+    candidate_id = resolve_candidate(keys)
+    prior_resumes = get_resumes_by_candidate(candidate_id) if candidate_id else []
+    return {
+        "keys": keys,
+        "candidate_id": candidate_id,
+        "prior_resumes": prior_resumes,
+        "prior_parse": _unchanged_parse(prior_resumes, file_hash, raw_text)
+    }
+
+
+def _unchanged_parse(prior_resumes: List[Dict[str, Any]], file_hash: str | None, raw_text: str):
+    # An updated CV is parsed again; only an identical file or text reuses
+    for resume in prior_resumes:
+        if file_hash and resume.get("file_hash") == file_hash:
+            return resume["parsed_resume_json"]
+    for resume in prior_resumes:
+        if resume.get("file_hash") and load_text(resume["file_hash"]) == raw_text:
+            return resume["parsed_resume_json"]
+    return None
@@ -0,0 +1,139 @@
+"""
+Memory-bounded handling of uploaded files.
+
+Hashing and text extraction share one read-only, seekable buffer per
+file without copying:
+- Streamlit uploads are used through getbuffer()
+- files on disk are wrapped in an IngestBuffer and memory-mapped
+
+admit() applies a process-wide in-flight byte budget across every
+session and worker thread, so a large batch waits for earlier files to
+finish extraction instead of extracting them all at once. It bounds the
+extraction working set only: Streamlit keeps every file of an upload in
+memory until the widget is cleared, so the uploads themselves still
+count toward peak memory in full.
+"""
+
+import io
+import mmap
+import os
+import threading
+from contextlib import contextmanager
+
+from core.config_manager import ConfigManager
+
+INGEST_MAX_INFLIGHT_BYTES = int(ConfigManager.get("INGEST_MAX_INFLIGHT_BYTES", 256 * 1024 * 1024))
+
+
+# -------------------------------------------------
+# BUFFER
+# -------------------------------------------------
+class IngestBuffer:
+    """
+    File-like (.name, .type, .read(), .seek(), .tell(), .getbuffer())
+    wrapper accepted everywhere a Streamlit UploadedFile is.
+    """
+
+    def __init__(self, data, name: str, type: str, owned=()):
+        self._data = data          # io.BytesIO or mmap.mmap
+        self._owned = owned        # closed with the buffer
+        self.name = name
+        self.type = type
+
+    @classmethod
+    def from_path(cls, path: str, type: str | None = None) -> "IngestBuffer":
+        import mimetypes
+
+        type = type or mimetypes.guess_type(path)[0] or "text/plain"
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return cls(io.BytesIO(), os.path.basename(path), type)
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        return cls(data, os.path.basename(path), type, owned=(data,))
+
+    def getbuffer(self) -> memoryview:
+        if isinstance(self._data, mmap.mmap):
+            return memoryview(self._data)
+        return self._data.getbuffer()
+
+    @property
+    def size(self) -> int:
+        with self.getbuffer() as view:
+            return view.nbytes
+
+    def read(self, size: int = -1) -> bytes:
+        return self._data.read(size)
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        return self._data.seek(offset, whence)
+
+    def tell(self) -> int:
+        return self._data.tell()
+
+    def seekable(self) -> bool:
+        return True
+
+    def close(self):
+        for resource in self._owned:
+            resource.close()
+        self._owned = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def file_size(file) -> int:
+    """
+    Size in bytes of an UploadedFile, IngestBuffer or seekable file.
+    """
+    if hasattr(file, "getbuffer"):
+        with file.getbuffer() as view:
+            return view.nbytes
+    position = file.tell()
+    size = file.seek(0, io.SEEK_END)
+    file.seek(position)
+    return size
+
+
+# -------------------------------------------------
+# IN-FLIGHT BUDGET
+# -------------------------------------------------
+class _ByteBudget:
+    def __init__(self, limit: int):
+        self._limit = limit
+        self._in_flight = 0
+        self._cond = threading.Condition()
+
+    def acquire(self, size: int):
+        with self._cond:
+            # A file larger than the whole budget still runs, but alone
+            self._cond.wait_for(
+                lambda: self._in_flight == 0 or self._in_flight + size <= self._limit
+            )
+            self._in_flight += size
+
+    def release(self, size: int):
+        with self._cond:
+            self._in_flight -= size
+            self._cond.notify_all()
+
+
+_budget = _ByteBudget(INGEST_MAX_INFLIGHT_BYTES)
+
+
+@contextmanager
+def admit(file):
+    """
+    Blocks until the file fits in the in-flight byte budget and holds
+    its share until the block exits.
+    """
+    size = file_size(file)
+    _budget.acquire(size)
+    try:
+        yield file
+    finally:
+        _budget.release(size)
+
@@ -0,0 +1,148 @@
+"""
+Bulk JD ingestion.
+
+Runs the duplicate guard, text extraction and parse_jd for many files
+concurrently on a bounded thread pool, then saves every new JD in one
+bulk write. Used by the "Upload JD" page and usable directly for bulk
+imports:
+
+    python -m core.jd_ingest jds/*.pdf --workers 8
+"""
+
+import argparse
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+
+from pymongo.errors import BulkWriteError
+
+from core.db import init_db, save_jds
+from core.ingest_buffer import admit
+from core.duplicate_guard import register_file_or_skip, release_file, compute_file_hash
+from core.jd_parser import parse_jd
+from core.skills import jd_skills
+from core.tracing import in_current_batch
+from core.utils import extract_text, open_local_file
+
+
+def _process_jd_file(file) -> dict:
+    # Waits for room in the shared in-flight byte budget first
+    with admit(file):
+        return _process_admitted_file(file)
+
+
+def _process_admitted_file(file) -> dict:
+    """
+    Returns a status row; "doc" is set only for a newly parsed JD.
+    """
+    row = {
+        "file": file.name, "status": None, "role": None, "jd_id": None, "error": None,
+        "doc": None, "file_hash": None
+    }
+
+    file_hash = compute_file_hash(file)
+    is_new, _ = register_file_or_skip(file, file_type="jd", file_hash=file_hash)
+    if not is_new:
+        row["status"] = "DUPLICATE"
+        return row
+
+    try:
+        raw_text = extract_text(file)
+        parsed_jd = parse_jd(raw_text)
+        canonical_skills = jd_skills(parsed_jd)
+    except Exception as exc:
+        # Free the fingerprint so the same file can be retried later
+        release_file(file_hash, file_type="jd")
+        row["status"] = "FAILED"
+        row["error"] = str(exc)
+        return row
+
+    row["jd_id"] = str(uuid.uuid4())
+    row["role"] = parsed_jd.get("role", "Unknown")
+    row["status"] = "SAVED"
+    row["file_hash"] = file_hash
+    row["doc"] = {
+        "jd_id": row["jd_id"],
+        "role": row["role"],
+        "parsed_jd_json": parsed_jd,
+        "canonical_skills": canonical_skills,
+        "created_at": datetime.utcnow()
+    }
+    return row
+
+
+def _failed_row(file, exc: Exception) -> dict:
+    return {
+        "file": file.name, "status": "FAILED", "role": None, "jd_id": None, "error": str(exc),
+        "doc": None, "file_hash": None
+    }
+
+
+def _unsave(row: dict, exc: Exception):
+    # The JD was not persisted: free its fingerprint so the file can be retried
+    release_file(row["file_hash"], file_type="jd")
+    row.update(status="FAILED", jd_id=None, error=str(exc))
+
+
+def ingest_jd_files(files, max_workers: int = 4, on_status=None) -> list[dict]:
+    """
+    Parses and saves many JD files.
+
+    Args:
+        files: file-like objects with .name, .type, .read() and .seek()
+        max_workers: maximum number of files processed at once
+        on_status: optional callback(row) as each file finishes
+
+    Returns:
+        One row per file, in input order:
+        { file, status: SAVED | DUPLICATE | FAILED, role, jd_id, error }
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {pool.submit(in_current_batch(_process_jd_file), file): file for file in files}
+        rows = {}
+        for future in as_completed(futures):
+            try:
+                row = future.result()
+            except Exception as exc:
+                row = _failed_row(futures[future], exc)
+            rows[future] = row
+            if on_status:
+                on_status(row)
+        rows = [rows[future] for future in futures]
+
+    saved = [row for row in rows if row["doc"]]
+    if saved:
+        try:
+            save_jds([row["doc"] for row in saved])
+        except BulkWriteError as exc:
+            # Unordered insert: only the reported documents are missing
+            for error in exc.details["writeErrors"]:
+                _unsave(saved[error["index"]], exc)
+        except Exception as exc:
+            for row in saved:
+                _unsave(row, exc)
+
+    for row in rows:
+        row.pop("doc")
+        row.pop("file_hash")
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import job descriptions")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    init_db()
+    files = []
+    try:
+        for path in args.paths:
+            files.append(open_local_file(path))
+        for row in ingest_jd_files(files, max_workers=args.workers):
+            detail = row["role"] or row["error"] or ""
+            print(f"{row['status']:<10} {row['file']}  {detail}")
+    finally:
+        # Unmaps the files
+        for file in files:
+            file.close()
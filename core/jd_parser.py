@@ -1,7 +1,11 @@
 import json
 from typing import Dict, Any
 
-from core.llm_client import call_llm
+from core.llm_client import call_llm, call_llm_stream
+from core.models import JobDescription
+from core.segmenter import segment_jd
+from core.map_reduce_parse import map_reduce_parse, MAP_REDUCE_THRESHOLD_CHARS
+from core.tracing import traced
 
 
 JD_SCHEMA = {
@@ -16,7 +20,19 @@ JD_SCHEMA = {
 }
 
 
-def _build_prompt(jd_text: str) -> str:
+# Fields each JD section can fill, for map-reduce parsing. The header
+# (text before the first recognized heading) gets the full schema.
+JD_SECTION_FIELDS = {
+    "about": ["role", "location", "domain_knowledge"],
+    "responsibilities": ["responsibilities", "domain_knowledge", "tools"],
+    "requirements": ["mandatory_skills", "tools", "experience_required", "domain_knowledge"],
+    "preferred": ["supporting_skills", "tools", "domain_knowledge"],
+    # Not sent to the LLM
+    "benefits": [],
+}
+
+
+def _build_prompt(jd_text: str, schema: Dict[str, Any] = JD_SCHEMA) -> str:
     """
     Builds a strict prompt to extract Job Description data
     without inference or scoring.
@@ -37,7 +53,7 @@ RULES (STRICT):
 - Do NOT include candidate-related data
 
 REQUIRED JSON SCHEMA:
-{json.dumps(JD_SCHEMA, indent=2)}
+{json.dumps(schema, indent=2)}
 
 JOB DESCRIPTION TEXT:
 \"\"\"
@@ -60,27 +76,19 @@ def _safe_json_load(response_text: str) -> Dict[str, Any]:
         raise ValueError("Invalid JSON returned by LLM") from exc
 
 
-def parse_jd(jd_text: str) -> Dict[str, Any]:
+def _call(prompt: str, stream: bool) -> str:
     """
-    Parses raw Job Description text into a structured JSON format.
-
-    Flow:
-    - Send JD to Groq LLM
-    - Validate JSON
-    - Retry once if JSON is invalid
-    - Raise error if still invalid
-
-    Args:
-        jd_text (str): Raw job description text
-
-    Returns:
-        Dict[str, Any]: Structured JD JSON
+    Streaming mode aborts as soon as the model emits a key outside
+    JD_SCHEMA; the abort surfaces as ValueError like invalid JSON.
     """
+    if not stream:
+        return call_llm(prompt, stage="jd_parse")
+    return call_llm_stream(prompt, expected_keys=JD_SCHEMA, stage="jd_parse")
 
-    prompt = _build_prompt(jd_text)
 
+def _parse_with_retry(prompt: str, stream: bool) -> Dict[str, Any]:
     # First attempt
-    response = call_llm(prompt)
+    response = _call(prompt, stream)
 
     try:
         return _safe_json_load(response)
@@ -88,7 +96,7 @@ def parse_jd(jd_text: str) -> Dict[str, Any]:
         # Retry once with reinforcement
         retry_prompt = prompt + "\n\nIMPORTANT: The previous output was invalid JSON. Fix it."
 
-        retry_response = call_llm(retry_prompt)
+        retry_response = _call(retry_prompt, stream)
 
         try:
             return _safe_json_load(retry_response)
@@ -97,6 +105,41 @@ def parse_jd(jd_text: str) -> Dict[str, Any]:
                 "Groq LLM failed to return valid JSON after retry"
             ) from exc
 
+
+@traced("parse.parse_jd")
+def parse_jd(jd_text: str, stream: bool = False) -> Dict[str, Any]:
+    """
+    Parses raw Job Description text into a structured JSON format.
+
+    Flow:
+    - Send JD to Groq LLM
+    - Validate JSON
+    - Retry once if JSON is invalid
+    - Coerce fields to JD_SCHEMA types (core.models.JobDescription)
+    - Raise error if still invalid
+
+    JDs longer than MAP_REDUCE_THRESHOLD_CHARS are instead split into
+    section chunks parsed concurrently and merged (map-reduce).
+
+    Args:
+        jd_text (str): Raw job description text
+
+    Returns:
+        Dict[str, Any]: Structured JD JSON
+    """
+
+    if len(jd_text) > MAP_REDUCE_THRESHOLD_CHARS:
+        parsed = map_reduce_parse(
+            segment_jd(jd_text),
+            JD_SCHEMA,
+            JD_SECTION_FIELDS,
+            lambda chunk, schema: _parse_with_retry(_build_prompt(chunk, schema), stream)
+        )
+    else:
+        parsed = _parse_with_retry(_build_prompt(jd_text), stream)
+
+    return JobDescription.validate(parsed)
+
 def _extract_json(text: str) -> str:
     text = text.strip()
     if text.startswith("```"):
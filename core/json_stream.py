@@ -0,0 +1,145 @@
+"""
+Incremental validation of a streamed JSON object.
+
+Tokens from a streaming LLM completion are fed in as they arrive. The
+validator tracks the top-level object only: every key is checked against
+the expected schema keys the moment it is complete, and every top-level
+value is decoded and handed to a callback as soon as it closes. Anything
+unrecoverable (prose before the object, an unknown or repeated key, an
+invalid value) raises StreamSchemaError so the caller can abort the
+stream instead of paying for the rest of the generation.
+"""
+
+import json
+from typing import Any, Callable, Iterable
+
+# Markdown fences are tolerated before the object starts
+_PREAMBLE_ALLOWED = set(" \t\r\n`json")
+
+
+class StreamSchemaError(ValueError):
+    """Raised when a streamed response can no longer match the schema."""
+
+
+class IncrementalJSONValidator:
+    def __init__(
+        self,
+        expected_keys: Iterable[str],
+        required_keys: Iterable[str] = (),
+        on_value: Callable[[str, Any], None] | None = None,
+        value_validator: Callable[[str, Any], None] | None = None
+    ):
+        self.expected_keys = set(expected_keys)
+        self.required_keys = set(required_keys)
+        self.on_value = on_value
+        self.value_validator = value_validator
+
+        self.values: dict[str, Any] = {}
+        self.complete = False
+
+        self._chunks: list[str] = []
+        self._buffer: list[str] = []   # chars of the top-level object
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect_key = False
+        self._key_start = None
+        self._current_key = None
+        self._value_start = None
+
+    @property
+    def text(self) -> str:
+        return "".join(self._chunks)
+
+    def feed(self, chunk: str) -> None:
+        self._chunks.append(chunk)
+        for ch in chunk:
+            if self.complete:
+                continue
+            if self._depth == 0:
+                self._feed_preamble(ch)
+            else:
+                self._feed_object(ch)
+
+    def finish(self) -> dict[str, Any]:
+        """
+        Call once the stream ends. Returns the decoded top-level values.
+        """
+        if not self.complete:
+            raise StreamSchemaError("Stream ended before the JSON object was closed")
+
+        missing = self.required_keys - self.values.keys()
+        if missing:
+            raise StreamSchemaError(f"Missing keys: {', '.join(sorted(missing))}")
+        return self.values
+
+    # ------------------ INTERNALS ------------------ #
+
+    def _feed_preamble(self, ch: str) -> None:
+        if ch == "{":
+            self._depth = 1
+            self._expect_key = True
+            self._buffer.append(ch)
+        elif ch not in _PREAMBLE_ALLOWED:
+            raise StreamSchemaError("Unexpected text before the JSON object")
+
+    def _feed_object(self, ch: str) -> None:
+        pos = len(self._buffer)
+        self._buffer.append(ch)
+
+        if self._in_string:
+            if self._escape:
+                self._escape = False
+            elif ch == "\\":
+                self._escape = True
+            elif ch == '"':
+                self._in_string = False
+                if self._key_start is not None:
+                    self._close_key(pos)
+            return
+
+        if ch == '"':
+            self._in_string = True
+            if self._depth == 1 and self._expect_key:
+                self._key_start = pos
+        elif ch in "{[":
+            self._depth += 1
+        elif ch in "}]":
+            self._depth -= 1
+            if self._depth == 0:
+                self._close_value(pos)
+                self.complete = True
+        elif ch == ":" and self._depth == 1:
+            self._value_start = pos + 1
+        elif ch == "," and self._depth == 1:
+            self._close_value(pos)
+            self._expect_key = True
+
+    def _close_key(self, end: int) -> None:
+        key = json.loads("".join(self._buffer[self._key_start:end + 1]))
+        self._key_start = None
+        self._expect_key = False
+
+        if key not in self.expected_keys:
+            raise StreamSchemaError(f"Unexpected key: {key}")
+        if key in self.values:
+            raise StreamSchemaError(f"Duplicate key: {key}")
+        self._current_key = key
+
+    def _close_value(self, end: int) -> None:
+        if self._current_key is None:
+            return
+
+        raw = "".join(self._buffer[self._value_start:end]).strip()
+        try:
+            value = json.loads(raw)
+        except ValueError as exc:
+            raise StreamSchemaError(f"Invalid value for {self._current_key}") from exc
+
+        if self.value_validator:
+            self.value_validator(self._current_key, value)
+
+        self.values[self._current_key] = value
+        if self.on_value:
+            self.on_value(self._current_key, value)
+        self._current_key = None
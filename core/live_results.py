@@ -0,0 +1,252 @@
+"""
+Live top-N results for a JD.
+
+A ResultsSubscription tails a MongoDB change stream on `evaluations`
+filtered by jd_id (core.db.open_evaluation_stream) on a background
+thread and applies each change to an in-memory sorted top-N, so a
+refresh costs O(changes) instead of re-querying every evaluation.
+Deployments without a replica set fall back to polling the
+server-assigned `written_at` (core.db.get_evaluation_changes).
+
+A subscription that is not drained for LIVE_IDLE_SECONDS (its page was
+left or its Streamlit session ended) stops its thread and closes its
+stream by itself.
+
+Change streams need a replica set; a local single-node one is enough:
+
+    mongod --replSet rs0 --dbpath /tmp/rs0
+    mongosh --eval "rs.initiate()"
+"""
+
+import bisect
+import inspect
+import threading
+import time
+from typing import Dict, Any, List
+
+from pymongo.errors import OperationFailure, PyMongoError
+
+from core.config_manager import ConfigManager
+from core.db import (
+    get_db,
+    get_evaluations_by_jd_and_tier,
+    open_evaluation_stream,
+    get_evaluation_changes,
+)
+
+LIVE_POLL_SECONDS = float(ConfigManager.get("LIVE_POLL_SECONDS", 2))
+LIVE_IDLE_SECONDS = float(ConfigManager.get("LIVE_IDLE_SECONDS", 60))
+
+# Rows kept beyond N so a candidate dropping out of the top N can be
+# replaced without a re-query
+_SLACK = 20
+
+
+# -------------------- TOP-N --------------------
+
+class TopN:
+    """
+    Evaluations of one JD sorted by overall_score, best first, holding
+    at most n + slack rows.
+    """
+
+    def __init__(self, n: int, slack: int = _SLACK):
+        self.n = n
+        self._capacity = n + slack
+        self._keys: List[tuple] = []
+        self._rows: Dict[str, Dict[str, Any]] = {}
+        self.truncated = False
+
+    @staticmethod
+    def _key(evaluation_id: str, score: float) -> tuple:
+        return (-score, evaluation_id)
+
+    def _rank(self, evaluation_id: str) -> int | None:
+        row = self._rows.get(evaluation_id)
+        if row is None:
+            return None
+        rank = bisect.bisect_left(self._keys, self._key(evaluation_id, row["overall_score"]))
+        return rank if rank < self.n else None
+
+    def _discard(self, evaluation_id: str):
+        row = self._rows.pop(evaluation_id, None)
+        if row is not None:
+            self._keys.remove(self._key(evaluation_id, row["overall_score"]))
+
+    def upsert(self, evaluation: Dict[str, Any]) -> Dict[str, Any] | None:
+        """
+        Returns a delta {op, evaluation_id, old_rank, new_rank, row} when
+        the visible top N changed, else None. Ranks are 0-based.
+        """
+        evaluation_id = str(evaluation["_id"])
+        old_rank = self._rank(evaluation_id)
+        self._discard(evaluation_id)
+
+        row = {
+            "evaluation_id": evaluation_id,
+            "candidate_name": evaluation.get("candidate_name"),
+            "overall_score": evaluation["overall_score"],
+            "candidate_tier": evaluation.get("candidate_tier"),
+            "provisional": evaluation.get("provisional", False),
+        }
+        bisect.insort(self._keys, self._key(evaluation_id, row["overall_score"]))
+        self._rows[evaluation_id] = row
+
+        while len(self._keys) > self._capacity:
+            _, dropped = self._keys.pop()
+            del self._rows[dropped]
+            self.truncated = True
+
+        new_rank = self._rank(evaluation_id)
+        if old_rank is None and new_rank is None:
+            return None
+        return {"op": "upsert", "evaluation_id": evaluation_id, "old_rank": old_rank, "new_rank": new_rank, "row": row}
+
+    def remove(self, evaluation_id: str) -> Dict[str, Any] | None:
+        old_rank = self._rank(evaluation_id)
+        self._discard(evaluation_id)
+        if old_rank is None:
+            return None
+        return {"op": "remove", "evaluation_id": evaluation_id, "old_rank": old_rank, "new_rank": None, "row": None}
+
+    @property
+    def needs_reseed(self) -> bool:
+        # Rows below the kept window were dropped, so the top N can no
+        # longer be rebuilt from memory alone
+        return self.truncated and len(self._keys) < self.n
+
+    def ranking(self) -> List[Dict[str, Any]]:
+        return [dict(self._rows[evaluation_id]) for _, evaluation_id in self._keys[:self.n]]
+
+
+# -------------------- SUBSCRIPTION --------------------
+
+class ResultsSubscription:
+    """
+    Background subscription keeping a JD's top N up to date.
+
+    drain() returns the deltas since the previous call and the current
+    ranking; close() stops the background thread, as does going
+    `idle_seconds` without a drain().
+    """
+
+    def __init__(
+        self,
+        jd_id: str,
+        top_n: int,
+        poll_seconds: float = LIVE_POLL_SECONDS,
+        idle_seconds: float = LIVE_IDLE_SECONDS
+    ):
+        self.jd_id = jd_id
+        self.top_n = top_n
+        self.mode = "change_stream"
+        self._poll_seconds = poll_seconds
+        self._idle_seconds = idle_seconds
+        self._last_drain = time.monotonic()
+        self._top = TopN(top_n)
+        self._deltas: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._stream = None
+        self._resume_token = None
+        self._poll_token = None
+
+        get_db()
+        # Subscribe before seeding so nothing written in between is
+        # missed; a change seen twice is an idempotent upsert
+        try:
+            self._stream = open_evaluation_stream(jd_id)
+        except OperationFailure:
+            self.mode = "polling"
+            _, self._poll_token = get_evaluation_changes(jd_id, {})
+
+        self._seed()
+        self._thread = threading.Thread(target=self._run, name=f"live-results-{jd_id}", daemon=True)
+        self._thread.start()
+
+    def _seed(self):
+        # Uncached: the seed must not predate the subscription
+        evaluations = inspect.unwrap(get_evaluations_by_jd_and_tier)(
+            self.jd_id, "ALL", limit=self._top._capacity
+        )
+        with self._lock:
+            self._top = TopN(self._top.n)
+            for evaluation in evaluations:
+                self._top.upsert(evaluation)
+
+    def _apply(self, evaluation: Dict[str, Any] | None, deleted_id=None):
+        with self._lock:
+            if deleted_id is not None:
+                delta = self._top.remove(str(deleted_id))
+            else:
+                delta = self._top.upsert(evaluation)
+            if delta:
+                self._deltas.append(delta)
+            reseed = self._top.needs_reseed
+
+        if reseed:
+            self._seed()
+            with self._lock:
+                self._deltas.append({"op": "reseed"})
+
+    # ---------- background loop ----------
+
+    def _run(self):
+        while not self._stop.is_set():
+            if time.monotonic() - self._last_drain > self._idle_seconds:
+                # Nobody is reading: the page was left or the session ended
+                self._stop.set()
+                break
+            try:
+                if self.mode == "change_stream":
+                    self._tail_stream()
+                else:
+                    self._poll()
+            except PyMongoError:
+                # Reconnect and resume from the last token
+                self._close_stream()
+                self._stop.wait(self._poll_seconds)
+        self._close_stream()
+
+    def _close_stream(self):
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+
+    def _tail_stream(self):
+        if self._stream is None:
+            self._stream = open_evaluation_stream(self.jd_id, resume_after=self._resume_token)
+
+        change = self._stream.try_next()
+        self._resume_token = self._stream.resume_token
+        if change is None:
+            return
+
+        if change["operationType"] == "delete":
+            self._apply(None, deleted_id=change["documentKey"]["_id"])
+        elif change.get("fullDocument"):
+            self._apply(change["fullDocument"])
+
+    def _poll(self):
+        changes, self._poll_token = get_evaluation_changes(self.jd_id, self._poll_token)
+        for evaluation in changes:
+            self._apply(evaluation)
+        if not changes:
+            self._stop.wait(self._poll_seconds)
+
+    # ---------- consumer API ----------
+
+    def drain(self) -> tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        self._last_drain = time.monotonic()
+        with self._lock:
+            deltas, self._deltas = self._deltas, []
+            return deltas, self._top.ranking()
+
+    @property
+    def closed(self) -> bool:
+        return self._stop.is_set()
+
+    def close(self):
+        # The background thread closes the stream on its way out
+        self._stop.set()
+        self._thread.join(timeout=self._poll_seconds + 2)
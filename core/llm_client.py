@@ -1,20 +1,471 @@
 import os
 import json
-from groq import Groq
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from core.config_manager import ConfigManager
+from core.json_stream import IncrementalJSONValidator
+from core.tracing import traced, in_current_batch
 
-_client = Groq(api_key=ConfigManager.get("GROQ_API_KEY"))
+_client = None
+_MODEL = "llama-3.3-70b-versatile"
+
+# Per-stage request deadlines, overridable with LLM_TIMEOUT_<STAGE>_SECONDS
+STAGE_TIMEOUTS = {
+    "default": 60.0,
+    "jd_parse": 60.0,
+    "resume_parse": 60.0,
+    "score": 45.0,
+    "embedding": 30.0,
+}
+
+# Hedging: a call still running at the stage's p90 latency gets one
+# duplicate request and the first answer wins. Capped to a fraction of
+# recent calls so an overloaded API is not hit twice as hard.
+HEDGE_ENABLED = ConfigManager.get("LLM_HEDGE_ENABLED", "0") == "1"
+HEDGE_MAX_RATIO = float(ConfigManager.get("LLM_HEDGE_MAX_RATIO", 0.1))
+HEDGE_MIN_SAMPLES = 20
+LATENCY_WINDOW = 200
+
+# Circuit breaker: after LLM_CIRCUIT_FAILURES consecutive API failures
+# calls fail fast with LLMUnavailableError for LLM_CIRCUIT_COOLDOWN_SECONDS,
+# then a single trial call decides whether to close the circuit again.
+CIRCUIT_FAILURES = int(ConfigManager.get("LLM_CIRCUIT_FAILURES", 3))
+CIRCUIT_COOLDOWN_SECONDS = float(ConfigManager.get("LLM_CIRCUIT_COOLDOWN_SECONDS", 30))
+
+_hedge_pool = None
+_stats_lock = threading.Lock()
+_meters = threading.local()
+_stage_stats = {}
+_breaker_lock = threading.Lock()
+_breaker = {"failures": 0, "opened_at": None, "trial": False}
+
+
+class LLMUnavailableError(RuntimeError):
+    """
+    The LLM API failed (timeout, connection, rate limit, 5xx) or the
+    circuit breaker is open. Invalid responses still raise ValueError.
+    """
+
+
+def _get_client():
+    """
+    Builds the Groq client on first use so importing this module
+    (and everything that imports it) stays cheap.
+    """
+    global _client
+
+    if _client is None:
+        from groq import Groq
+
+        _client = Groq(api_key=ConfigManager.get("GROQ_API_KEY"))
+    return _client
+
+
+# ------------------ TIMEOUTS & LATENCY ------------------ #
+
+def stage_timeout(stage: str) -> float:
+    default = STAGE_TIMEOUTS.get(stage, STAGE_TIMEOUTS["default"])
+    return float(ConfigManager.get(f"LLM_TIMEOUT_{stage.upper()}_SECONDS", default))
+
+
+def _stats(stage: str) -> dict:
+    if stage not in _stage_stats:
+        _stage_stats[stage] = {
+            "latencies": deque(maxlen=LATENCY_WINDOW),
+            "hedged": deque(maxlen=LATENCY_WINDOW),
+            "calls": 0,
+            "hedges": 0,
+            "hedge_wins": 0,
+            "timeouts": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+    return _stage_stats[stage]
+
+
+def _percentile(values, pct: float) -> float | None:
+    if not values:
+        return None
+    ordered = sorted(values)
+    return ordered[min(int(len(ordered) * pct), len(ordered) - 1)]
+
+
+def _record(stage: str, latency: float | None = None, hedged: bool = False,
+            hedge_won: bool = False, timed_out: bool = False, usage: dict | None = None):
+    with _stats_lock:
+        stats = _stats(stage)
+        stats["calls"] += 1
+        stats["hedged"].append(hedged)
+        stats["hedges"] += hedged
+        stats["hedge_wins"] += hedge_won
+        stats["timeouts"] += timed_out
+        if latency is not None:
+            stats["latencies"].append(latency)
+        if usage:
+            stats["prompt_tokens"] += usage["prompt_tokens"]
+            stats["completion_tokens"] += usage["completion_tokens"]
+
+    for meter in getattr(_meters, "active", ()):
+        meter._add(usage)
+
+
+def _record_discarded(stage: str, future) -> None:
+    """
+    Meters the losing request of a hedged pair: its answer is discarded
+    but it is billed. One still running counts as an unmetered request
+    now and adds its tokens to the stage stats when it finishes.
+    """
+    def add_tokens(done):
+        if done.exception() is None and done.result()[2]:
+            usage = done.result()[2]
+            with _stats_lock:
+                stats = _stats(stage)
+                stats["prompt_tokens"] += usage["prompt_tokens"]
+                stats["completion_tokens"] += usage["completion_tokens"]
+
+    meters = getattr(_meters, "active", ())
+    if not future.done():
+        for meter in meters:
+            meter._add(None)
+        future.add_done_callback(add_tokens)
+    elif future.exception() is None:
+        add_tokens(future)
+        for meter in meters:
+            meter._add(future.result()[2])
+
+
+def _hedge_delay(stage: str) -> float | None:
+    """
+    Seconds to wait before hedging, or None when hedging is off, there
+    is no latency history yet, or the hedge cap is reached.
+    """
+    if not HEDGE_ENABLED:
+        return None
+    with _stats_lock:
+        stats = _stats(stage)
+        if len(stats["latencies"]) < HEDGE_MIN_SAMPLES:
+            return None
+        if sum(stats["hedged"]) >= HEDGE_MAX_RATIO * len(stats["hedged"]):
+            return None
+        return _percentile(stats["latencies"], 0.9)
+
+
+def get_llm_latency_stats() -> dict:
+    """
+    Returns per stage:
+    {
+        calls, timeouts, hedges, hedge_wins,
+        prompt_tokens, completion_tokens    # as reported by the API
+        p50, p90, p99            # seconds, over the recent window
+    }
+    """
+    with _stats_lock:
+        return {
+            stage: {
+                "calls": stats["calls"],
+                "timeouts": stats["timeouts"],
+                "hedges": stats["hedges"],
+                "hedge_wins": stats["hedge_wins"],
+                "prompt_tokens": stats["prompt_tokens"],
+                "completion_tokens": stats["completion_tokens"],
+                "p50": _percentile(stats["latencies"], 0.5),
+                "p90": _percentile(stats["latencies"], 0.9),
+                "p99": _percentile(stats["latencies"], 0.99),
+            }
+            for stage, stats in _stage_stats.items()
+        }
+
+
+# ------------------ USAGE METERING ------------------ #
+
+class usage_meter:
+    """
+    Counts the LLM requests and tokens of calls made on this thread while
+    the block runs:
+
+        with usage_meter() as meter:
+            score_resume(...)
+        meter.usage   # {requests, prompt_tokens, completion_tokens, unmetered_requests}
+
+    Token counts come from the API's `usage`; streamed completions do not
+    report it and are counted as unmetered requests.
+    """
+
+    def __init__(self):
+        self.usage = {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "unmetered_requests": 0}
+
+    def _add(self, usage: dict | None):
+        self.usage["requests"] += 1
+        if usage:
+            self.usage["prompt_tokens"] += usage["prompt_tokens"]
+            self.usage["completion_tokens"] += usage["completion_tokens"]
+        else:
+            self.usage["unmetered_requests"] += 1
+
+    def __enter__(self):
+        if not hasattr(_meters, "active"):
+            _meters.active = []
+        _meters.active.append(self)
+        return self
+
+    def __exit__(self, *exc):
+        _meters.active.remove(self)
+        return False
+
+
+def _usage(response) -> dict | None:
+    usage = getattr(response, "usage", None)
+    if usage is None:
+        return None
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+    }
+
+
+# ------------------ CIRCUIT BREAKER ------------------ #
+
+def _breaker_check():
+    with _breaker_lock:
+        if _breaker["opened_at"] is None:
+            return
+        cooling = time.monotonic() - _breaker["opened_at"] < CIRCUIT_COOLDOWN_SECONDS
+        if cooling or _breaker["trial"]:
+            raise LLMUnavailableError("LLM circuit open: Groq calls are paused")
+        # Half-open: let this one call through as the trial
+        _breaker["trial"] = True
+
+
+def _breaker_success():
+    with _breaker_lock:
+        _breaker.update(failures=0, opened_at=None, trial=False)
+
+
+def _breaker_failure():
+    with _breaker_lock:
+        _breaker["failures"] += 1
+        _breaker["trial"] = False
+        if _breaker["failures"] >= CIRCUIT_FAILURES or _breaker["opened_at"] is not None:
+            _breaker["opened_at"] = time.monotonic()
+
+
+def circuit_state() -> str:
+    """
+    "closed", "open" or "half_open".
+    """
+    with _breaker_lock:
+        if _breaker["opened_at"] is None:
+            return "closed"
+        if time.monotonic() - _breaker["opened_at"] < CIRCUIT_COOLDOWN_SECONDS:
+            return "open"
+        return "half_open"
 
 
 # ------------------ CHAT COMPLETION ------------------ #
 
-def call_llm(prompt: str) -> str:
-    response = _client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
+def _complete(prompt: str, timeout: float) -> tuple[str, float, dict | None]:
+    started = time.monotonic()
+    # No SDK retries: they would multiply the stage deadline
+    response = _get_client().with_options(timeout=timeout, max_retries=0).chat.completions.create(
+        model=_MODEL,
         messages=[{"role": "user", "content": prompt}],
         temperature=0,
     )
-    return response.choices[0].message.content.strip()
+    return response.choices[0].message.content.strip(), time.monotonic() - started, _usage(response)
+
+
+def _get_hedge_pool():
+    global _hedge_pool
+
+    if _hedge_pool is None:
+        _hedge_pool = ThreadPoolExecutor(
+            max_workers=int(ConfigManager.get("LLM_HEDGE_MAX_WORKERS", 16)),
+            thread_name_prefix="llm-hedge"
+        )
+    return _hedge_pool
+
+
+def _is_timeout(exc: Exception) -> bool:
+    return type(exc).__name__ in ("APITimeoutError", "TimeoutException", "TimeoutError")
+
+
+# Groq SDK / httpx / builtin connection failures (APITimeoutError is an
+# APIConnectionError, httpx timeouts are TransportErrors)
+_CONNECTION_ERRORS = {"APIConnectionError", "TransportError", "ConnectionError", "TimeoutError"}
+
+
+def _is_outage(exc: Exception) -> bool:
+    """
+    Timeouts, connection errors, 429 and 5xx. Anything else (400 context
+    length, 401, a bug) is not the API being down.
+    """
+    if any(cls.__name__ in _CONNECTION_ERRORS for cls in type(exc).__mro__):
+        return True
+    status = getattr(exc, "status_code", None)
+    return isinstance(status, int) and (status == 429 or status >= 500)
+
+
+@traced("llm.call_llm")
+def call_llm(prompt: str, stage: str = "default") -> str:
+    """
+    Single completion with the stage's deadline (stage_timeout). With
+    LLM_HEDGE_ENABLED=1 a call slower than the stage's p90 is hedged
+    with one duplicate request and the first answer is returned.
+
+    Raises LLMUnavailableError when the API is unavailable (see
+    _is_outage) or the circuit is open; other errors propagate unchanged.
+    """
+    _breaker_check()
+    try:
+        text = _call_llm(prompt, stage)
+    except Exception as exc:
+        if not _is_outage(exc):
+            # The API answered (e.g. 400 or 401): not an outage
+            _breaker_success()
+            raise
+        _breaker_failure()
+        raise LLMUnavailableError(f"LLM call failed: {exc}") from exc
+
+    _breaker_success()
+    return text
+
+
+def _call_llm(prompt: str, stage: str) -> str:
+    timeout = stage_timeout(stage)
+    delay = _hedge_delay(stage)
+
+    if delay is None:
+        try:
+            text, latency, usage = _complete(prompt, timeout)
+        except Exception as exc:
+            _record(stage, timed_out=_is_timeout(exc))
+            raise
+        _record(stage, latency, usage=usage)
+        return text
+
+    pool = _get_hedge_pool()
+    primary = pool.submit(in_current_batch(_complete), prompt, timeout)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        futures = [primary]
+    else:
+        # The slower request is left to finish in the background; its
+        # answer is discarded
+        futures = [primary, pool.submit(in_current_batch(_complete), prompt, timeout)]
+
+    pending = set(futures)
+    error = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                text, latency, usage = future.result()
+            except Exception as exc:
+                error = error or exc
+                continue
+            _record(stage, latency, hedged=len(futures) > 1, hedge_won=future is not primary, usage=usage)
+            for other in futures:
+                if other is not future:
+                    _record_discarded(stage, other)
+            return text
+
+    _record(stage, hedged=len(futures) > 1, timed_out=_is_timeout(error))
+    raise error
+
+
+# ------------------ STREAMING COMPLETION ------------------ #
+
+@traced("llm.call_llm_stream")
+def call_llm_stream(
+    prompt: str,
+    expected_keys,
+    required_keys=(),
+    on_value=None,
+    value_validator=None,
+    stage: str = "default"
+) -> str:
+    """
+    Streams a completion through an IncrementalJSONValidator.
+
+    Top-level keys are checked against `expected_keys` as they arrive and
+    each completed value is passed to `on_value(key, value)`. On an
+    unrecoverable deviation the stream is closed immediately and
+    StreamSchemaError (a ValueError) is raised, so callers can reuse
+    their existing invalid-JSON retry path.
+
+    The stage deadline (stage_timeout) bounds the whole stream, not just
+    each read: a watchdog closes it when the deadline passes. Streamed
+    calls are never hedged, so with hedging on score_resume does not
+    stream.
+
+    Returns the full response text.
+    """
+    validator = IncrementalJSONValidator(
+        expected_keys,
+        required_keys=required_keys,
+        on_value=on_value,
+        value_validator=value_validator
+    )
+
+    _breaker_check()
+    started = time.monotonic()
+    deadline = stage_timeout(stage)
+    expired = threading.Event()
+    try:
+        stream = _get_client().with_options(timeout=deadline, max_retries=0).chat.completions.create(
+            model=_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0,
+            stream=True,
+        )
+
+        def expire():
+            expired.set()
+            stream.close()
+
+        watchdog = threading.Timer(max(deadline - (time.monotonic() - started), 0), expire)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            for chunk in stream:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if delta:
+                    validator.feed(delta)
+                if validator.complete:
+                    break
+        except Exception:
+            if not expired.is_set():
+                raise
+        finally:
+            watchdog.cancel()
+            # Stops generation (and billing) on early abort
+            stream.close()
+
+        if expired.is_set() and not validator.complete:
+            raise TimeoutError(f"LLM stream exceeded the {deadline:g}s {stage} deadline")
+    except ValueError:
+        # The API answered; the content was off-schema. The aborted
+        # request was still billed: meter it (streams report no usage)
+        _breaker_success()
+        _record(stage)
+        raise
+    except Exception as exc:
+        _record(stage, timed_out=_is_timeout(exc))
+        if not _is_outage(exc):
+            _breaker_success()
+            raise
+        _breaker_failure()
+        raise LLMUnavailableError(f"LLM call failed: {exc}") from exc
+
+    _breaker_success()
+
+    try:
+        validator.finish()
+    finally:
+        _record(stage, time.monotonic() - started)
+    return validator.text.strip()
 
 
 # ------------------ EMBEDDING VIA LLM ------------------ #
@@ -46,13 +497,7 @@ TEXT:
 Return ONLY the JSON array.
 """
 
-    response = _client.chat.completions.create(
-        model="llama-3.3-70b-versatile",
-        messages=[{"role": "user", "content": embedding_prompt}],
-        temperature=0,
-    )
-
-    raw = response.choices[0].message.content.strip()
+    raw = call_llm(embedding_prompt, stage="embedding")
 
     try:
         vector = json.loads(_extract_json(raw))
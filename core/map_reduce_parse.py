@@ -0,0 +1,199 @@
+"""
+Map-reduce parsing for long resumes and JDs.
+
+Documents above a size threshold are split into section chunks. Each
+chunk is parsed concurrently against only the schema fields its sections
+can fill (all of them for sections without a field mapping, such as the
+text before the first recognized heading), and the partial JSON results
+are merged deterministically in document order, de-duplicating skills,
+tools, projects and titles.
+Latency becomes roughly the slowest chunk instead of one long generation.
+"""
+
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Tuple, Callable
+
+from core.config_manager import ConfigManager
+from core.segmenter import DEFAULT_CHAR_BUDGET
+from core.tracing import in_current_batch
+
+# Above the compaction budget the single-prompt path would truncate
+MAP_REDUCE_THRESHOLD_CHARS = min(
+    int(ConfigManager.get("MAP_REDUCE_THRESHOLD_CHARS", DEFAULT_CHAR_BUDGET)),
+    DEFAULT_CHAR_BUDGET
+)
+CHUNK_CHARS = int(ConfigManager.get("MAP_REDUCE_CHUNK_CHARS", 6000))
+MAX_WORKERS = int(ConfigManager.get("MAP_REDUCE_MAX_WORKERS", 4))
+
+# Identity of list items when merging partial results
+ITEM_KEYS = {
+    "skills_with_context": ("skill",),
+    "tools_with_context": ("tool",),
+    "projects": ("name",),
+    "titles_with_dates": ("title", "organization"),
+}
+
+# Free-text fields of duplicate items that are combined instead of dropped
+_JOINED_FIELDS = {"context", "description"}
+
+_NORMALIZE = re.compile(r"[\W_]+")
+
+
+# -------------------- MAP --------------------
+
+def plan_chunks(
+    sections: List[Tuple[str, List[str]]],
+    section_fields: Dict[str, List[str]],
+    chunk_chars: int = CHUNK_CHARS,
+    all_fields: List[str] = ()
+) -> List[Tuple[str, List[str]]]:
+    """
+    Packs consecutive sections into chunks of at most `chunk_chars`,
+    splitting oversized sections on line boundaries. Sections missing
+    from `section_fields` can fill `all_fields`.
+
+    Returns [(chunk_text, schema_fields)].
+    """
+    chunks = []
+    text, chunk_sections = [], []
+    size = 0
+
+    def flush():
+        if text:
+            fields = [f for section in chunk_sections for f in section_fields.get(section, all_fields)]
+            chunks.append(("\n".join(text), list(dict.fromkeys(fields))))
+        text.clear()
+        chunk_sections.clear()
+
+    for section, lines in sections:
+        heading = [] if section == "header" else [f"{section.upper()}:"]
+        for line in heading + lines:
+            if text and size + len(line) > chunk_chars:
+                flush()
+                size = 0
+                # Continuation of a split section keeps its heading
+                if line not in heading and heading:
+                    text.append(heading[0])
+                    size = len(heading[0]) + 1
+            if section not in chunk_sections:
+                chunk_sections.append(section)
+            text.append(line)
+            size += len(line) + 1
+
+    flush()
+    return chunks
+
+
+def run_map(
+    chunks: List[Tuple[str, List[str]]],
+    parse_chunk: Callable[[str, List[str]], Dict[str, Any]],
+    max_workers: int = MAX_WORKERS
+) -> List[Dict[str, Any]]:
+    """
+    Parses every chunk concurrently; results keep chunk order.
+    """
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(in_current_batch(lambda chunk: parse_chunk(*chunk)), chunks))
+
+
+# -------------------- REDUCE --------------------
+
+def _norm(value) -> str:
+    return _NORMALIZE.sub(" ", str(value or "").lower()).strip()
+
+
+def _merge_item(existing: Dict[str, Any], new: Dict[str, Any]) -> None:
+    for field, value in new.items():
+        current = existing.get(field)
+        if current in (None, "", []):
+            existing[field] = value
+        elif isinstance(current, list) and isinstance(value, list):
+            existing[field] = _merge_list(current, value)
+        elif field in _JOINED_FIELDS and value and _norm(value) not in _norm(current):
+            existing[field] = f"{current}; {value}"
+
+
+def _merge_list(current: list, new: list, key_fields: tuple = ()) -> list:
+    merged = list(current)
+    index = {}
+    for item in merged:
+        index.setdefault(_item_key(item, key_fields), item)
+
+    for item in new:
+        key = _item_key(item, key_fields)
+        if not key:
+            continue
+        if key not in index:
+            index[key] = item
+            merged.append(item)
+        elif isinstance(item, dict):
+            _merge_item(index[key], item)
+    return merged
+
+
+def _item_key(item, key_fields: tuple) -> str:
+    if isinstance(item, dict):
+        fields = key_fields or tuple(sorted(item))
+        return "|".join(_norm(item.get(field)) for field in fields)
+    return _norm(item)
+
+
+def merge_partials(partials: List[Dict[str, Any]], schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Deterministic merge, in chunk (document) order:
+    - lists are concatenated and de-duplicated (ITEM_KEYS for objects)
+    - numbers keep the largest value (e.g. total_experience_years)
+    - other scalars keep the first non-empty value
+    """
+    merged: Dict[str, Any] = {
+        field: [] if isinstance(spec, list) else None
+        for field, spec in schema.items()
+    }
+
+    for partial in partials:
+        for field, value in (partial or {}).items():
+            if field not in schema or value in (None, "", []):
+                continue
+            current = merged[field]
+
+            if isinstance(schema[field], list):
+                if isinstance(value, list):
+                    merged[field] = _merge_list(current, value, ITEM_KEYS.get(field, ()))
+            elif isinstance(value, (int, float)) and not isinstance(value, bool):
+                merged[field] = value if not isinstance(current, (int, float)) else max(current, value)
+            elif current is None:
+                merged[field] = value
+
+    return merged
+
+
+# -------------------- MAIN ENTRY --------------------
+
+def map_reduce_parse(
+    sections: List[Tuple[str, List[str]]],
+    schema: Dict[str, Any],
+    section_fields: Dict[str, List[str]],
+    parse_chunk: Callable[[str, Dict[str, Any]], Dict[str, Any]],
+    chunk_chars: int = CHUNK_CHARS,
+    max_workers: int = MAX_WORKERS
+) -> Dict[str, Any]:
+    """
+    Args:
+        sections: [(section, lines)] from core.segmenter
+        schema: full output schema
+        section_fields: schema fields each section can fill; sections
+            not listed get the whole schema
+        parse_chunk: callable(chunk_text, schema_subset) -> partial JSON
+
+    Returns:
+        Dict[str, Any]: merged JSON following `schema`
+    """
+    # Chunks no schema field can come from (e.g. benefits) are not sent
+    chunks = [c for c in plan_chunks(sections, section_fields, chunk_chars, list(schema)) if c[1]]
+    partials = run_map(
+        chunks,
+        lambda text, fields: parse_chunk(text, {f: schema[f] for f in fields}),
+        max_workers=max_workers
+    )
+    return merge_partials(partials, schema)
@@ -0,0 +1,157 @@
+"""
+Cross-JD matching of a shared resume pool.
+
+Resumes uploaded to the pool are parsed once, then:
+- cheaply pre-ranked against every open JD with the canonical skill overlap
+- only promising (resume, JD) pairs are LLM-scored, several JDs packed
+  into one prompt per resume via score_resume_multi
+
+so LLM spend per candidate grows sub-linearly with the number of roles.
+"""
+
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import datetime
+from typing import Dict, Any, List
+
+from core.db import (
+    get_jds,
+    get_pool_resumes,
+    get_resumes_by_candidate,
+    get_evaluated_jd_ids,
+    save_evaluation,
+    candidate_search_fields,
+)
+from core.scorer import score_resume_multi
+from core.skills import jd_skills, resume_skills, skill_overlap
+
+
+# -------------------- PRIOR --------------------
+
+def prior_score(jd: Dict[str, Any], resume: Dict[str, Any]) -> float:
+    """
+    Cheap 0-1 estimate of how well a resume fits a JD, used only to
+    decide which pairs are worth an LLM call. Uses the canonical skills
+    stored at upload, computing them for older documents.
+    """
+    jd_skill_sets = jd.get("canonical_skills") or jd_skills(jd["parsed_jd_json"])
+    candidate_skills = resume.get("canonical_skills") or resume_skills(resume["parsed_resume_json"])
+    return skill_overlap(jd_skill_sets, candidate_skills)["score"]
+
+
+# -------------------- PAIR SELECTION --------------------
+
+def select_pairs(
+    jds: List[Dict[str, Any]],
+    resume: Dict[str, Any],
+    min_prior: float = 0.2,
+    max_jds_per_resume: int = 3,
+    exclude_jd_ids=()
+) -> List[tuple]:
+    """
+    Returns [(jd, prior)] for the most promising JDs for one resume,
+    best first.
+    """
+    ranked = [
+        (jd, prior_score(jd, resume))
+        for jd in jds
+        if jd["jd_id"] not in exclude_jd_ids
+    ]
+    ranked = [(jd, prior) for jd, prior in ranked if prior >= min_prior]
+    ranked.sort(key=lambda pair: pair[1], reverse=True)
+    return ranked[:max_jds_per_resume]
+
+
+# -------------------- MAIN ENTRY --------------------
+
+def _match_resume(resume, jds, min_prior, max_jds_per_resume, pack_size) -> int:
+    resume_id = str(resume["_id"])
+
+    # JDs the same candidate was already scored for under another upload
+    # are skipped too
+    evaluated_ids = [resume_id]
+    if resume.get("candidate_id"):
+        evaluated_ids = [str(r["_id"]) for r in get_resumes_by_candidate(resume["candidate_id"])]
+
+    pairs = select_pairs(
+        jds,
+        resume,
+        min_prior=min_prior,
+        max_jds_per_resume=max_jds_per_resume,
+        exclude_jd_ids=get_evaluated_jd_ids(evaluated_ids)
+    )
+
+    search_fields = candidate_search_fields(resume)
+    scored = 0
+    for start in range(0, len(pairs), pack_size):
+        pack = pairs[start:start + pack_size]
+        results = score_resume_multi(
+            {jd["jd_id"]: jd["parsed_jd_json"] for jd, _ in pack},
+            resume["parsed_resume_json"]
+        )
+
+        for jd, prior in pack:
+            result = results[jd["jd_id"]]
+            save_evaluation({
+                "jd_id": jd["jd_id"],
+                "resume_id": resume_id,
+                "candidate_name": resume["candidate_name"],
+                "category_scores": result["category_scores"],
+                "category_explanations": result["category_explanations"],
+                "overall_score": result["final_score"],
+                "candidate_tier": result["candidate_tier"],
+                "provisional": result["provisional"],
+                "match_prior": prior,
+                "source": "POOL",
+                "evaluated_at": datetime.utcnow(),
+                **search_fields
+            })
+            scored += 1
+    return scored
+
+
+def match_pool(
+    min_prior: float = 0.2,
+    max_jds_per_resume: int = 3,
+    pack_size: int = 3,
+    max_workers: int = 4,
+    on_progress=None
+) -> Dict[str, Any]:
+    """
+    Scores the shared resume pool against every open (not closed) JD.
+
+    Pairs already evaluated are skipped, so this is safe to re-run after
+    new resumes or JDs arrive.
+
+    Returns:
+    {
+        resumes,          # pool size
+        candidate_pairs,  # resumes x JDs
+        scored_pairs,     # pairs actually LLM-scored
+        failed: [resume_id]
+    }
+    """
+    jds = [jd for jd in get_jds() if jd.get("status") != "CLOSED"]
+    resumes = get_pool_resumes()
+    summary = {
+        "resumes": len(resumes),
+        "candidate_pairs": len(resumes) * len(jds),
+        "scored_pairs": 0,
+        "failed": []
+    }
+    if not jds or not resumes:
+        return summary
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(_match_resume, resume, jds, min_prior, max_jds_per_resume, pack_size): resume
+            for resume in resumes
+        }
+        for idx, future in enumerate(as_completed(futures), 1):
+            try:
+                summary["scored_pairs"] += future.result()
+            except Exception:
+                summary["failed"].append(str(futures[future]["_id"]))
+            if on_progress:
+                on_progress(idx, len(resumes))
+
+    return summary
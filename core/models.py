@@ -1,28 +1,190 @@
+"""
+Validation of parsed documents and LLM scores.
+
+JobDescription and Resume map each parsed-JSON field to its coercer.
+`validate` is the single validation and coercion step applied to an LLM
+response: unknown keys are dropped, missing ones defaulted, and a plain
+dict is returned for storage.
+
+Downstream code (ranking, pre-screening, scoring) works on those plain
+MongoDB dicts; no model instances are kept. MaskedResume is a no-copy
+view of one for the scoring prompt.
+"""
+
+import re
+from collections.abc import Mapping
 from dataclasses import dataclass
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable
+
+_NUMBER = re.compile(r"-?\d+(?:\.\d+)?")
+
+# Personal identifiers hidden from the scoring LLM
+PII_FIELDS = frozenset({"candidate_name", "email", "phone", "professional_presence_links"})
+
+
+# -------------------- COERCERS --------------------
+
+def _str_or_none(value) -> str | None:
+    if value is None or isinstance(value, (dict, list)):
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _number_or_none(value) -> float | None:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return value
+    match = _NUMBER.search(str(value or ""))
+    return float(match.group()) if match else None
+
+
+def _str_or_number(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return value
+    return _str_or_none(value)
+
+
+def _str_list(value) -> List[str]:
+    if value is None:
+        return []
+    if not isinstance(value, list):
+        value = [value]
+    return [s for s in map(_str_or_none, value) if s]
+
+
+def _object_list(keys: tuple, list_keys: tuple = ()):
+    """
+    Coercer for lists of objects with the given keys. A bare string item
+    becomes the first key ("Python" -> {"skill": "Python", "context": None}).
+    """
+    def coerce(value) -> List[Dict[str, Any]]:
+        if value is None:
+            return []
+        if not isinstance(value, list):
+            value = [value]
+
+        items = []
+        for item in value:
+            if isinstance(item, dict):
+                items.append({
+                    key: _str_list(item.get(key)) if key in list_keys else _str_or_none(item.get(key))
+                    for key in keys
+                })
+            elif _str_or_none(item):
+                items.append({key: [] if key in list_keys else None for key in keys} | {keys[0]: _str_or_none(item)})
+        return items
+    return coerce
+
+
+# -------------------- DOCUMENTS --------------------
+
+class _Schema:
+    """
+    A parsed document's fields, each with its coercer, in output order.
+    """
+    __slots__ = ("name", "coercers")
+
+    def __init__(self, name: str, coercers: Dict[str, Callable[[Any], Any]]):
+        self.name = name
+        self.coercers = coercers
+
+    def validate(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validates and coerces one parsed LLM response into the stored
+        dict. Raises ValueError if it is not a JSON object.
+        """
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a JSON object for {self.name}")
+        return {name: coerce(data.get(name)) for name, coerce in self.coercers.items()}
+
+
+JobDescription = _Schema("JobDescription", {
+    "role": _str_or_none,
+    "location": _str_or_none,
+    "experience_required": _str_or_number,
+    "mandatory_skills": _str_list,
+    "supporting_skills": _str_list,
+    "tools": _str_list,
+    "domain_knowledge": _str_list,
+    "responsibilities": _str_list,
+})
+
+
+Resume = _Schema("Resume", {
+    "candidate_name": _str_or_none,
+    "total_experience_years": _number_or_none,
+    "location": _str_or_none,
+    "titles_with_dates": _object_list(("title", "organization", "start_date", "end_date")),
+    "career_progression": _str_list,
+    "skills_with_context": _object_list(("skill", "context")),
+    "tools_with_context": _object_list(("tool", "context")),
+    "domain_experience": _str_list,
+    "projects": _object_list(("name", "description", "technologies"), list_keys=("technologies",)),
+    "leadership_signals": _str_list,
+    "impact_metrics": _str_list,
+    "professional_presence_links": _str_list,
+})
+
+
+class MaskedResume(Mapping):
+    """
+    Immutable view of a parsed resume without PII_FIELDS. Nothing is
+    copied.
+    """
+    __slots__ = ("_resume",)
+
+    def __init__(self, resume: Mapping):
+        self._resume = resume
+
+    def __getitem__(self, key):
+        if key in PII_FIELDS:
+            raise KeyError(key)
+        return self._resume[key]
+
+    def __iter__(self):
+        return (key for key in self._resume if key not in PII_FIELDS)
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+
+# -------------------- SCORES --------------------
+
+@dataclass(slots=True, frozen=True)
+class CategoryScore:
+    score: float
+    explanation: str
+
+    @classmethod
+    def from_llm(cls, category: str, value: Any) -> "CategoryScore":
+        """
+        Raises ValueError for a missing or out-of-range score.
+        """
+        if not isinstance(value, dict):
+            raise ValueError(f"Invalid entry for {category}")
 
+        score = value.get("score")
+        if not isinstance(score, (int, float)) or isinstance(score, bool):
+            raise ValueError(f"Invalid score type for {category}")
 
-@dataclass
-class JobDescription:
-    role: str
-    experience_required: str
-    mandatory_skills: List[str]
-    supporting_skills: List[str]
-    tools: List[str]
-    domain_knowledge: List[str]
-    responsibilities: List[str]
+        if score < 0 or score > 100:
+            raise ValueError(f"Score out of range for {category}")
 
+        return cls(score, str(value.get("explanation") or ""))
 
-@dataclass
-class Resume:
-    candidate_name: str
-    total_experience_years: float
-    skills_with_context: List[Dict[str, Any]]
-    projects: List[Dict[str, Any]]
 
+def category_scores_from_llm(data: Any, categories) -> Dict[str, CategoryScore]:
+    """
+    Validates a scoring response covering every category.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Expected a JSON object of category scores")
 
-@dataclass
-class EvaluationResult:
-    final_score: float
-    category_scores: Dict[str, float]
-    category_explanations: Dict[str, str]
+    scores = {}
+    for category in categories:
+        if category not in data:
+            raise ValueError(f"Missing category: {category}")
+        scores[category] = CategoryScore.from_llm(category, data[category])
+    return scores
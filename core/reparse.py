@@ -0,0 +1,79 @@
+"""
+Bulk re-parse job.
+
+Streams stored resume text back through parse_resume with bounded
+concurrency and rewrites `parsed_resume_json` on every resume sharing
+that file hash. Run after changing RESUME_SCHEMA or the parsing prompt:
+
+    python -m core.reparse --workers 4
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from core.db import init_db, update_resume_parse
+from core.resume_parser import parse_resume
+from core.skills import resume_skills
+from core.text_store import iter_texts
+
+
+def _reparse_one(file_hash: str, text: str) -> int:
+    parsed_resume = parse_resume(text)
+    return update_resume_parse(file_hash, parsed_resume, resume_skills(parsed_resume, text))
+
+
+def reparse_resumes(max_workers: int = 4, on_progress=None) -> dict:
+    """
+    Re-parses every stored resume text.
+
+    At most `max_workers` parses run at once and at most twice that many
+    texts are held in memory, however large the store is.
+
+    Returns:
+    {
+        parsed,            # texts re-parsed successfully
+        resumes_updated,   # resume documents rewritten
+        failed: [file_hash]
+    }
+    """
+    summary = {"parsed": 0, "resumes_updated": 0, "failed": []}
+    in_flight = {}
+
+    def _collect(done):
+        for future in done:
+            file_hash = in_flight.pop(future)
+            try:
+                summary["resumes_updated"] += future.result()
+                summary["parsed"] += 1
+            except Exception:
+                summary["failed"].append(file_hash)
+            if on_progress:
+                on_progress(summary)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for file_hash, text in iter_texts():
+            if len(in_flight) >= max_workers * 2:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                _collect(done)
+            in_flight[pool.submit(_reparse_one, file_hash, text)] = file_hash
+
+        done, _ = wait(in_flight)
+        _collect(done)
+
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-parse stored resume text")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    init_db()
+    result = reparse_resumes(max_workers=args.workers)
+    print(
+        f"Re-parsed {result['parsed']} text(s), "
+        f"updated {result['resumes_updated']} resume(s), "
+        f"{len(result['failed'])} failed"
+    )
+    for file_hash in result["failed"]:
+        print(f"  failed: {file_hash}")
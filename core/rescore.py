@@ -0,0 +1,101 @@
+"""
+LLM re-scoring of provisional evaluations.
+
+Evaluations scored by the local heuristic scorer while Groq was
+unavailable are queued with `provisional: True`. This job scores them
+again with the LLM and replaces the provisional scores (and the JD
+stats they contributed). Stops early if the LLM is still unavailable:
+
+    python -m core.rescore --workers 4
+"""
+
+import argparse
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.db import (
+    init_db,
+    get_jds,
+    get_provisional_evaluations,
+    get_resumes_by_ids,
+    replace_provisional_scores,
+)
+from core.llm_client import LLMUnavailableError
+from core.scorer import score_resume
+
+
+def _rescore_one(evaluation: dict, jd: dict, resume: dict) -> bool:
+    result = score_resume(
+        jd["parsed_jd_json"],
+        resume["parsed_resume_json"],
+        fallback=False,
+        jd_context=jd.get("scoring_context")
+    )
+    return replace_provisional_scores(evaluation, {
+        "category_scores": result["category_scores"],
+        "category_explanations": result["category_explanations"],
+        "overall_score": result["final_score"],
+        "candidate_tier": result["candidate_tier"],
+    })
+
+
+def rescore_provisional(jd_id: str | None = None, max_workers: int = 4, on_progress=None) -> dict:
+    """
+    Re-scores every provisional evaluation (optionally for one JD).
+
+    Returns:
+    {
+        queued,            # provisional evaluations found
+        rescored,
+        remaining,         # still provisional (LLM unavailable or failed)
+        llm_unavailable    # True if the job stopped because of the LLM
+    }
+    """
+    evaluations = get_provisional_evaluations(jd_id)
+    summary = {"queued": len(evaluations), "rescored": 0, "remaining": 0, "llm_unavailable": False}
+    if not evaluations:
+        return summary
+
+    jds = {jd["jd_id"]: jd for jd in get_jds()}
+    resumes = get_resumes_by_ids([ev["resume_id"] for ev in evaluations])
+    work = [
+        ev for ev in evaluations
+        if ev["jd_id"] in jds and ev["resume_id"] in resumes
+    ]
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        futures = [
+            pool.submit(_rescore_one, ev, jds[ev["jd_id"]], resumes[ev["resume_id"]])
+            for ev in work
+        ]
+        for idx, future in enumerate(as_completed(futures), 1):
+            try:
+                summary["rescored"] += future.result()
+            except LLMUnavailableError:
+                if not summary["llm_unavailable"]:
+                    summary["llm_unavailable"] = True
+                    # The circuit is open; queued calls would fail fast anyway
+                    for pending in futures:
+                        pending.cancel()
+            except Exception:
+                pass
+            if on_progress:
+                on_progress(idx, len(futures))
+
+    summary["remaining"] = summary["queued"] - summary["rescored"]
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score provisional evaluations with the LLM")
+    parser.add_argument("--jd", default=None, help="Only this JD")
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    init_db()
+    result = rescore_provisional(jd_id=args.jd, max_workers=args.workers)
+    print(
+        f"Re-scored {result['rescored']} of {result['queued']} provisional evaluation(s), "
+        f"{result['remaining']} remaining"
+    )
+    if result["llm_unavailable"]:
+        print("  stopped early: LLM unavailable")
@@ -1,7 +1,11 @@
 import json
 from typing import Dict, Any
 
-from core.llm_client import call_llm
+from core.llm_client import call_llm, call_llm_stream
+from core.models import Resume
+from core.segmenter import compact_resume_text, segment_resume, DROPPED_SECTIONS
+from core.map_reduce_parse import map_reduce_parse, MAP_REDUCE_THRESHOLD_CHARS
+from core.tracing import traced
 
 
 RESUME_SCHEMA = {
@@ -53,7 +57,25 @@ RESUME_SCHEMA = {
 }
 
 
-def _build_prompt(resume_text: str) -> str:
+# Fields each resume section can fill, for map-reduce parsing. The
+# header (text before the first recognized heading, possibly the whole
+# resume) and unmapped sections such as "research" get the full schema.
+RESUME_SECTION_FIELDS = {
+    "summary": ["total_experience_years", "career_progression", "domain_experience"],
+    "experience": ["total_experience_years", "titles_with_dates", "career_progression",
+                   "skills_with_context", "tools_with_context", "domain_experience",
+                   "leadership_signals", "impact_metrics"],
+    "skills": ["skills_with_context", "tools_with_context"],
+    "projects": ["projects", "skills_with_context", "tools_with_context", "impact_metrics"],
+    "education": ["domain_experience"],
+    "certifications": ["skills_with_context", "tools_with_context"],
+    "achievements": ["impact_metrics", "leadership_signals"],
+    "leadership": ["leadership_signals"],
+    "links": ["professional_presence_links"],
+}
+
+
+def _build_prompt(resume_text: str, schema: Dict[str, Any] = RESUME_SCHEMA) -> str:
     """
     Builds a strict prompt to extract structured resume data.
     """
@@ -74,7 +96,7 @@ STRICT RULES:
 - Extract only what is explicitly stated in the resume
 
 REQUIRED JSON SCHEMA:
-{json.dumps(RESUME_SCHEMA, indent=2)}
+{json.dumps(schema, indent=2)}
 
 RESUME TEXT:
 \"\"\"
@@ -98,27 +120,19 @@ def _safe_json_load(response_text: str) -> Dict[str, Any]:
         raise ValueError("Invalid JSON returned by LLM") from exc
 
 
-def parse_resume(resume_text: str) -> Dict[str, Any]:
+def _call(prompt: str, stream: bool) -> str:
     """
-    Parses raw resume text into structured JSON.
-
-    Flow:
-    - Send resume text to Groq LLM
-    - Validate JSON
-    - Retry once if invalid
-    - Fail fast if still invalid
-
-    Args:
-        resume_text (str): Raw resume text
-
-    Returns:
-        Dict[str, Any]: Structured resume JSON
+    Streaming mode aborts as soon as the model emits a key outside
+    RESUME_SCHEMA; the abort surfaces as ValueError like invalid JSON.
     """
+    if not stream:
+        return call_llm(prompt, stage="resume_parse")
+    return call_llm_stream(prompt, expected_keys=RESUME_SCHEMA, stage="resume_parse")
 
-    prompt = _build_prompt(resume_text)
 
+def _parse_with_retry(prompt: str, stream: bool) -> Dict[str, Any]:
     # First attempt
-    response = call_llm(prompt)
+    response = _call(prompt, stream)
 
     try:
         return _safe_json_load(response)
@@ -126,7 +140,7 @@ def parse_resume(resume_text: str) -> Dict[str, Any]:
         # Retry once with stronger instruction
         retry_prompt = prompt + "\n\nIMPORTANT: The previous output was invalid JSON. Fix it strictly."
 
-        retry_response = call_llm(retry_prompt)
+        retry_response = _call(retry_prompt, stream)
 
         try:
             return _safe_json_load(retry_response)
@@ -134,6 +148,51 @@ def parse_resume(resume_text: str) -> Dict[str, Any]:
             raise RuntimeError(
                 "Groq LLM failed to return valid JSON after retry"
             ) from exc
+
+
+@traced("parse.parse_resume")
+def parse_resume(resume_text: str, stream: bool = False) -> Dict[str, Any]:
+    """
+    Parses raw resume text into structured JSON.
+
+    Flow:
+    - Compact the text locally (sections RESUME_SCHEMA needs, no page
+      headers/footers, within a character budget)
+    - Send resume text to Groq LLM
+    - Validate JSON
+    - Retry once if invalid
+    - Coerce fields to RESUME_SCHEMA types (core.models.Resume)
+    - Fail fast if still invalid
+
+    Resumes longer than MAP_REDUCE_THRESHOLD_CHARS are instead split into
+    section chunks parsed concurrently and merged (map-reduce).
+
+    Args:
+        resume_text (str): Raw resume text
+
+    Returns:
+        Dict[str, Any]: Structured resume JSON
+    """
+
+    if len(resume_text) > MAP_REDUCE_THRESHOLD_CHARS:
+        sections = [
+            (section, lines)
+            for section, lines in segment_resume(resume_text)
+            if section not in DROPPED_SECTIONS
+        ]
+        parsed = map_reduce_parse(
+            sections,
+            RESUME_SCHEMA,
+            RESUME_SECTION_FIELDS,
+            lambda chunk, schema: _parse_with_retry(_build_prompt(chunk, schema), stream)
+        )
+    else:
+        prompt = _build_prompt(compact_resume_text(resume_text))
+        parsed = _parse_with_retry(prompt, stream)
+
+    return Resume.validate(parsed)
+
+
 def _extract_json(text: str) -> str:
     if not text:
         return ""
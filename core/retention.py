@@ -0,0 +1,295 @@
+"""
+Retention: closing JDs and archiving their data to cold storage.
+
+A closed JD keeps its `jds` and `jd_stats` documents (so it still lists
+and shows its counts) but its resumes and evaluations are moved out of
+the hot collections in batches, either
+
+- "collection": compressed batch documents in `archive_resumes` and
+  `archive_evaluations`, or
+- "file": ARCHIVE_DIR/<jd_id>/<kind>.jsonl.zst (.jsonl.gz without the
+  `zstandard` package), one compressed frame per batch.
+
+Each batch is written before its originals are deleted, so an
+interrupted archive loses nothing and can simply be run again. Documents
+are serialized with bson.json_util, so ObjectIds and dates survive a
+restore, which puts everything back and reopens the JD.
+
+Closing a JD starts the FINGERPRINT_TTL_DAYS expiry of its resumes'
+file fingerprints (core/duplicate_guard.py); reopening it, e.g. by a
+restore, cancels it. Open JDs' fingerprints never expire.
+
+    python -m core.retention close <jd_id>
+    python -m core.retention archive <jd_id> --to file
+    python -m core.retention archive-closed --older-than-days 30
+    python -m core.retention restore <jd_id>
+"""
+
+import argparse
+import gzip
+import io
+import os
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+from bson import json_util
+from bson.binary import Binary
+from pymongo.errors import BulkWriteError
+
+from core.cache import invalidate
+from core.config_manager import ConfigManager
+from core.db import init_db, get_db, get_jds, set_jd_status, rebuild_jd_stats
+from core.duplicate_guard import schedule_fingerprint_expiry
+from core.text_store import compress_text, decompress_text, zstandard
+
+ARCHIVE_DIR = ConfigManager.get("ARCHIVE_DIR", "archive")
+ARCHIVE_BATCH_SIZE = int(ConfigManager.get("ARCHIVE_BATCH_SIZE", 500))
+ARCHIVE_TARGETS = ["collection", "file"]
+
+# Hot collection -> archive collection
+_KINDS = {"resumes": "archive_resumes", "evaluations": "archive_evaluations"}
+
+_JSON_OPTIONS = json_util.RELAXED_JSON_OPTIONS.with_options(tz_aware=False)
+
+
+# -------------------------------------------------
+# JD STATUS
+# -------------------------------------------------
+def close_jd(jd_id: str):
+    """
+    Marks a JD closed. Closed JDs are skipped by pool matching and can
+    be archived.
+    """
+    set_jd_status(jd_id, "CLOSED")
+    schedule_fingerprint_expiry(jd_id, datetime.utcnow())
+
+
+def reopen_jd(jd_id: str):
+    set_jd_status(jd_id, "OPEN")
+    schedule_fingerprint_expiry(jd_id, None)
+
+
+# -------------------------------------------------
+# SERIALIZATION
+# -------------------------------------------------
+def _dump_batch(docs: List[dict]) -> str:
+    return "".join(json_util.dumps(doc, json_options=_JSON_OPTIONS) + "\n" for doc in docs)
+
+
+def _load_lines(lines) -> Iterator[dict]:
+    for line in lines:
+        if line.strip():
+            yield json_util.loads(line, json_options=_JSON_OPTIONS)
+
+
+def _archive_path(jd_id: str, kind: str) -> str:
+    # An existing archive keeps its codec
+    base = os.path.join(ARCHIVE_DIR, jd_id, kind)
+    for extension in ("jsonl.zst", "jsonl.gz"):
+        if os.path.exists(f"{base}.{extension}"):
+            return f"{base}.{extension}"
+    return f"{base}.jsonl.zst" if zstandard is not None else f"{base}.jsonl.gz"
+
+
+def _require_zstd(path: str):
+    if path.endswith(".zst") and zstandard is None:
+        raise RuntimeError(f"zstandard is required for {path}")
+
+
+def _write_batch(jd_id: str, kind: str, target: str, docs: List[dict]):
+    text = _dump_batch(docs)
+
+    if target == "collection":
+        codec, data = compress_text(text)
+        # Keyed by the batch's first _id: re-archiving after an
+        # interruption overwrites instead of duplicating
+        get_db()[_KINDS[kind]].replace_one(
+            {"_id": f"{jd_id}:{docs[0]['_id']}"},
+            {
+                "jd_id": jd_id,
+                "count": len(docs),
+                "codec": codec,
+                "data": Binary(data),
+                "archived_at": datetime.utcnow()
+            },
+            upsert=True
+        )
+        return
+
+    path = _archive_path(jd_id, kind)
+    _require_zstd(path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    raw = text.encode("utf-8")
+    with open(path, "ab") as f:
+        # Concatenated zstd frames / gzip members read back as one stream
+        if path.endswith(".zst"):
+            f.write(zstandard.ZstdCompressor().compress(raw))
+        else:
+            f.write(gzip.compress(raw))
+
+
+def _read_archive(jd_id: str, kind: str, target: str) -> Iterator[dict]:
+    if target == "collection":
+        for batch in get_db()[_KINDS[kind]].find({"jd_id": jd_id}):
+            yield from _load_lines(decompress_text(batch["codec"], batch["data"]).splitlines())
+        return
+
+    path = _archive_path(jd_id, kind)
+    if not os.path.exists(path):
+        return
+    _require_zstd(path)
+    if path.endswith(".zst"):
+        with open(path, "rb") as f:
+            reader = zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True)
+            yield from _load_lines(io.TextIOWrapper(reader, encoding="utf-8"))
+    else:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            yield from _load_lines(f)
+
+
+def _drop_archive(jd_id: str, kind: str, target: str):
+    if target == "collection":
+        get_db()[_KINDS[kind]].delete_many({"jd_id": jd_id})
+    else:
+        path = _archive_path(jd_id, kind)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+# -------------------------------------------------
+# ARCHIVE / RESTORE
+# -------------------------------------------------
+def archive_jd(jd_id: str, target: str = "collection", batch_size: int = ARCHIVE_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Moves a closed JD's resumes and evaluations to cold storage.
+
+    Returns {resumes, evaluations}: documents archived.
+    """
+    if target not in ARCHIVE_TARGETS:
+        raise ValueError(f"Unknown archive target: {target}")
+
+    jd = next((jd for jd in get_jds() if jd["jd_id"] == jd_id), None)
+    if jd is None:
+        raise ValueError(f"Unknown JD: {jd_id}")
+    if jd.get("status") != "CLOSED":
+        raise ValueError(f"JD {jd_id} must be closed before archiving")
+
+    previous = jd.get("archive") or {}
+    if previous and previous["target"] != target:
+        raise ValueError(f"JD {jd_id} is already archived to {previous['target']}")
+
+    db = get_db()
+    counts = {kind: 0 for kind in _KINDS}
+    for kind in _KINDS:
+        while True:
+            # Always the first batch left: archived batches are deleted
+            docs = list(db[kind].find({"jd_id": jd_id}).sort("_id", 1).limit(batch_size))
+            if not docs:
+                break
+            _write_batch(jd_id, kind, target, docs)
+            db[kind].delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+            counts[kind] += len(docs)
+
+    db.jds.update_one({"jd_id": jd_id}, {"$set": {"archive": {
+        "target": target,
+        "resumes": previous.get("resumes", 0) + counts["resumes"],
+        "evaluations": previous.get("evaluations", 0) + counts["evaluations"],
+        "archived_at": datetime.utcnow()
+    }}})
+    invalidate("jds", "resumes", "evaluations")
+    return counts
+
+
+def archive_closed_jds(older_than_days: int = 30, target: str = "collection") -> Dict[str, Dict[str, int]]:
+    """
+    Archives every JD closed more than `older_than_days` ago that still
+    has data in the hot collections. Returns {jd_id: counts}.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=older_than_days)
+    db = get_db()
+    archived = {}
+    for jd in get_jds():
+        if jd.get("status") != "CLOSED" or (jd.get("closed_at") or datetime.utcnow()) > cutoff:
+            continue
+        if db.resumes.count_documents({"jd_id": jd["jd_id"]}, limit=1) or \
+                db.evaluations.count_documents({"jd_id": jd["jd_id"]}, limit=1):
+            archived[jd["jd_id"]] = archive_jd(jd["jd_id"], target)
+    return archived
+
+
+def _insert_ignoring_duplicates(collection, docs: List[dict]) -> int:
+    try:
+        return len(collection.insert_many(docs, ordered=False).inserted_ids)
+    except BulkWriteError as exc:
+        # Duplicate keys were already restored by an earlier, interrupted
+        # run; anything else (validation, write concern) must not be lost
+        if exc.details.get("writeConcernErrors") or any(
+            error["code"] != 11000 for error in exc.details["writeErrors"]
+        ):
+            raise
+        return exc.details["nInserted"]
+
+
+def restore_jd(jd_id: str, batch_size: int = ARCHIVE_BATCH_SIZE) -> Dict[str, int]:
+    """
+    Moves an archived JD's documents back to the hot collections,
+    reopens the JD and rebuilds its stats. The archive is dropped only
+    once every document is back; a failed restore can be run again.
+
+    Returns {resumes, evaluations}: documents restored.
+    """
+    jd = next((jd for jd in get_jds() if jd["jd_id"] == jd_id), None)
+    if jd is None or not jd.get("archive"):
+        raise ValueError(f"JD {jd_id} has no archive")
+
+    target = jd["archive"]["target"]
+    db = get_db()
+    counts = {kind: 0 for kind in _KINDS}
+    for kind in _KINDS:
+        batch = []
+        for doc in _read_archive(jd_id, kind, target):
+            batch.append(doc)
+            if len(batch) >= batch_size:
+                counts[kind] += _insert_ignoring_duplicates(db[kind], batch)
+                batch = []
+        if batch:
+            counts[kind] += _insert_ignoring_duplicates(db[kind], batch)
+
+    for kind in _KINDS:
+        _drop_archive(jd_id, kind, target)
+
+    db.jds.update_one({"jd_id": jd_id}, {"$unset": {"archive": ""}})
+    reopen_jd(jd_id)
+    rebuild_jd_stats(jd_id)
+    invalidate("jds", "resumes", "evaluations")
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Close, archive and restore JDs")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("close").add_argument("jd_id")
+    archive_parser = sub.add_parser("archive")
+    archive_parser.add_argument("jd_id")
+    archive_parser.add_argument("--to", choices=ARCHIVE_TARGETS, default="collection")
+    closed_parser = sub.add_parser("archive-closed")
+    closed_parser.add_argument("--older-than-days", type=int, default=30)
+    closed_parser.add_argument("--to", choices=ARCHIVE_TARGETS, default="collection")
+    sub.add_parser("restore").add_argument("jd_id")
+    args = parser.parse_args()
+
+    init_db()
+    if args.command == "close":
+        close_jd(args.jd_id)
+        print(f"Closed JD {args.jd_id}")
+    elif args.command == "archive":
+        counts = archive_jd(args.jd_id, target=args.to)
+        print(f"Archived {counts['resumes']} resume(s), {counts['evaluations']} evaluation(s)")
+    elif args.command == "archive-closed":
+        archived = archive_closed_jds(args.older_than_days, target=args.to)
+        for jd_id, counts in archived.items():
+            print(f"{jd_id}: {counts['resumes']} resume(s), {counts['evaluations']} evaluation(s)")
+        print(f"Archived {len(archived)} closed JD(s)")
+    else:
+        counts = restore_jd(args.jd_id)
+        print(f"Restored {counts['resumes']} resume(s), {counts['evaluations']} evaluation(s)")
@@ -0,0 +1,51 @@
+"""
+Token and request budgets of scoring runs, shared by budgeted runs
+(core/run_planner.py) and anytime ranking (core/anytime_ranking.py).
+
+A budget is {tokens, requests}; a missing or zero limit is unlimited.
+"""
+
+from typing import Dict, Any
+
+from core.config_manager import ConfigManager
+from core.scorer import scoring_prompt
+from core.scoring_context import estimate_tokens
+
+# Seven categories of score + explanation
+SCORE_COMPLETION_TOKENS = int(ConfigManager.get("SCORE_COMPLETION_TOKENS", 600))
+
+
+def estimate_score_tokens(
+    parsed_jd: Dict[str, Any],
+    parsed_resume: Dict[str, Any],
+    jd_context: Dict[str, Any] | None = None
+) -> int:
+    """
+    Prompt plus expected completion tokens of one score_resume call.
+    """
+    return estimate_tokens(scoring_prompt(parsed_jd, parsed_resume, jd_context)) + SCORE_COMPLETION_TOKENS
+
+
+def fits_budget(budget: Dict[str, Any], tokens: int, requests: int) -> bool:
+    if budget.get("tokens") and tokens > budget["tokens"]:
+        return False
+    if budget.get("requests") and requests > budget["requests"]:
+        return False
+    return True
+
+
+def exceeds_budget(budget: Dict[str, Any], estimated_tokens: int) -> bool:
+    """
+    True when one resume's estimate is above the whole token budget, so
+    no run with this budget can ever score it.
+    """
+    return not fits_budget(budget, estimated_tokens, 1)
+
+
+def spent_tokens(usage: Dict[str, int], estimated_tokens: int) -> int:
+    """
+    Tokens one scoring call spent: the API-reported ones plus the
+    estimate for each request that reported none (streamed, or a hedged
+    duplicate still running).
+    """
+    return usage["prompt_tokens"] + usage["completion_tokens"] + usage["unmetered_requests"] * estimated_tokens
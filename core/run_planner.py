@@ -0,0 +1,310 @@
+"""
+Budgeted evaluation runs for one JD.
+
+Before scoring, every unreviewed resume gets a prompt token estimate
+(the exact scoring prompt, at CHARS_PER_TOKEN, plus the expected
+completion) and the work is ordered by a priority:
+
+- "newest":  most recently uploaded first
+- "prior":   best local heuristic prior first (core/anytime_ranking.py)
+- "flagged": manually flagged resumes first, then newest
+
+A run stops cleanly before the resume that would exceed its token or
+request budget (per run, else the JD's `run_budget`, else unlimited)
+and is left PAUSED; unscored resumes stay NOT_REVIEWED and resume_run
+continues later with a fresh budget. Resumes whose estimate alone is
+above the token budget are skipped and listed as `oversized` instead of
+pausing the run for good. A run that raises is left FAILED and can be
+resumed the same way. Each run records estimated versus actual
+(API-reported) token usage:
+
+    python -m core.run_planner <jd_id> --tokens 200000 --priority prior
+    python -m core.run_planner --resume <run_id>
+"""
+
+import argparse
+import uuid
+from datetime import datetime
+from typing import Dict, Any, List
+
+from core.anytime_ranking import order_by_prior
+from core.db import (
+    init_db,
+    get_jds,
+    get_unreviewed_resumes_by_jd,
+    save_evaluation,
+    mark_resume_reviewed,
+    save_run,
+    update_run,
+    get_run,
+    candidate_search_fields,
+)
+from core.llm_client import usage_meter
+from core.run_budget import estimate_score_tokens, fits_budget, exceeds_budget, spent_tokens
+from core.scorer import score_resume
+
+PRIORITIES = ["newest", "prior", "flagged"]
+
+
+# -------------------- PLANNING --------------------
+
+def _order(parsed_jd: Dict[str, Any], resumes: List[Dict[str, Any]], priority: str) -> List[Dict[str, Any]]:
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown priority: {priority}")
+
+    if priority == "prior":
+        return [resume for _, resume in order_by_prior(parsed_jd, resumes)]
+
+    newest = sorted(resumes, key=lambda r: r.get("created_at") or datetime.min, reverse=True)
+    if priority == "flagged":
+        # Stable sort keeps newest-first within each group
+        newest.sort(key=lambda r: not r.get("priority_flag"))
+    return newest
+
+
+def plan_run(
+    jd: Dict[str, Any],
+    resumes: List[Dict[str, Any]],
+    priority: str = "newest",
+    budget: Dict[str, Any] | None = None
+) -> Dict[str, Any]:
+    """
+    Orders and estimates a run without calling the LLM.
+
+    Returns:
+    {
+        items: [{resume, estimated_tokens}],   # in scoring order
+        estimated_tokens,                      # all items
+        within_budget,                         # items the budget covers
+        within_budget_tokens,
+        oversized                              # items above the whole token budget
+    }
+    """
+    budget = budget or {}
+    items = [
+        {
+            "resume": resume,
+            "estimated_tokens": estimate_score_tokens(
+                jd["parsed_jd_json"], resume["parsed_resume_json"], jd.get("scoring_context")
+            )
+        }
+        for resume in _order(jd["parsed_jd_json"], resumes, priority)
+    ]
+
+    oversized = [item for item in items if exceeds_budget(budget, item["estimated_tokens"])]
+
+    within, within_tokens = 0, 0
+    for item in items:
+        if exceeds_budget(budget, item["estimated_tokens"]):
+            continue
+        if not fits_budget(budget, within_tokens + item["estimated_tokens"], within + 1):
+            break
+        within += 1
+        within_tokens += item["estimated_tokens"]
+
+    return {
+        "items": items,
+        "estimated_tokens": sum(item["estimated_tokens"] for item in items),
+        "within_budget": within,
+        "within_budget_tokens": within_tokens,
+        "oversized": oversized,
+    }
+
+
+# -------------------- EXECUTION --------------------
+
+def _evaluate(jd: Dict[str, Any], resume: Dict[str, Any], on_category=None, on_retry=None) -> Dict[str, Any]:
+    result = score_resume(
+        jd["parsed_jd_json"],
+        resume["parsed_resume_json"],
+        on_category=on_category,
+        jd_context=jd.get("scoring_context"),
+        on_retry=on_retry
+    )
+    evaluation = {
+        "jd_id": jd["jd_id"],
+        "resume_id": str(resume["_id"]),
+        "candidate_name": resume["candidate_name"],
+        "category_scores": result["category_scores"],
+        "category_explanations": result["category_explanations"],
+        "overall_score": result["final_score"],
+        "candidate_tier": result["candidate_tier"],
+        "provisional": result["provisional"],
+        "evaluated_at": datetime.utcnow(),
+        **candidate_search_fields(resume)
+    }
+    save_evaluation(evaluation)
+    mark_resume_reviewed(resume["_id"])
+    return evaluation
+
+
+def run_evaluation(
+    jd: Dict[str, Any],
+    priority: str = "newest",
+    budget: Dict[str, Any] | None = None,
+    run_id: str | None = None,
+    on_result=None,
+    on_category=None,
+    on_retry=None
+) -> Dict[str, Any]:
+    """
+    Scores the JD's unreviewed resumes in priority order until they are
+    all done (COMPLETED) or the next one would exceed the budget (PAUSED).
+    Resumes above the whole token budget are skipped and recorded in the
+    run's `oversized` list; an exception leaves the run FAILED (with its
+    `error`) and is re-raised.
+
+    Spend counts API-reported tokens; requests that report none (streamed
+    completions, i.e. with `on_category`) count the resume's estimate.
+
+    Args:
+        budget: {tokens, requests}; defaults to jd["run_budget"]
+        run_id: continue this run's record instead of starting one
+        on_result: optional callback(evaluation, done, total)
+        on_category, on_retry: passed to score_resume
+
+    Returns the run document (see core.db.save_run).
+    """
+    budget = budget if budget is not None else (jd.get("run_budget") or {})
+    plan = plan_run(jd, get_unreviewed_resumes_by_jd(jd["jd_id"]), priority, budget)
+
+    if run_id:
+        run = get_run(run_id)
+    else:
+        run = {
+            "run_id": str(uuid.uuid4()),
+            "jd_id": jd["jd_id"],
+            "priority": priority,
+            "budget": budget,
+            "status": "RUNNING",
+            "scored": 0,
+            "remaining": len(plan["items"]),
+            "estimated_tokens": 0,
+            "actual": {"requests": 0, "prompt_tokens": 0, "completion_tokens": 0, "unmetered_requests": 0},
+            "started_at": datetime.utcnow(),
+            "updated_at": datetime.utcnow(),
+        }
+        save_run(dict(run))
+
+    items = [item for item in plan["items"] if not exceeds_budget(budget, item["estimated_tokens"])]
+    run["oversized"] = [
+        {
+            "resume_id": str(item["resume"]["_id"]),
+            "candidate_name": item["resume"]["candidate_name"],
+            "estimated_tokens": item["estimated_tokens"]
+        }
+        for item in plan["oversized"]
+    ]
+
+    spent, spent_requests, scored = 0, 0, 0
+    try:
+        for item in items:
+            # Pause before the resume that would overrun the budget
+            if not fits_budget(budget, spent + item["estimated_tokens"], spent_requests + 1):
+                break
+
+            with usage_meter() as meter:
+                try:
+                    evaluation = _evaluate(jd, item["resume"], on_category, on_retry)
+                finally:
+                    # A failed attempt's requests were billed too
+                    run["estimated_tokens"] += item["estimated_tokens"]
+                    for key, value in meter.usage.items():
+                        run["actual"][key] += value
+
+            spent += spent_tokens(meter.usage, item["estimated_tokens"])
+            spent_requests += meter.usage["requests"]
+            scored += 1
+
+            if on_result:
+                on_result(evaluation, scored, len(items))
+    except Exception as exc:
+        run["status"] = "FAILED"
+        run["error"] = str(exc)
+        raise
+    else:
+        run["status"] = "COMPLETED" if scored == len(items) else "PAUSED"
+        run["error"] = None
+    finally:
+        run["scored"] += scored
+        run["remaining"] = len(items) - scored
+        run["updated_at"] = datetime.utcnow()
+        update_run(run["run_id"], {
+            key: run[key]
+            for key in ("scored", "remaining", "oversized", "status", "error", "estimated_tokens", "actual", "updated_at")
+        })
+    return run
+
+
+def resume_run(
+    run_id: str,
+    budget: Dict[str, Any] | None = None,
+    on_result=None,
+    on_category=None,
+    on_retry=None
+) -> Dict[str, Any]:
+    """
+    Continues a PAUSED or FAILED run with its priority and a fresh budget
+    (the run's own unless `budget` is given).
+    """
+    run = get_run(run_id)
+    if run is None:
+        raise ValueError(f"Unknown run: {run_id}")
+
+    jd = next(jd for jd in get_jds() if jd["jd_id"] == run["jd_id"])
+    update_run(run_id, {"status": "RUNNING", "updated_at": datetime.utcnow()})
+    return run_evaluation(
+        jd,
+        priority=run["priority"],
+        budget=budget if budget is not None else run["budget"],
+        run_id=run_id,
+        on_result=on_result,
+        on_category=on_category,
+        on_retry=on_retry
+    )
+
+
+def usage_report(run: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Estimated versus actual tokens of a run. `actual_tokens` is None when
+    no call reported usage, `ratio` (actual / estimated) unless every
+    call did.
+    """
+    actual = run["actual"]
+    actual_tokens = actual["prompt_tokens"] + actual["completion_tokens"]
+    metered = actual["requests"] - actual["unmetered_requests"]
+    fully_metered = metered and not actual["unmetered_requests"]
+    return {
+        "estimated_tokens": run["estimated_tokens"],
+        "actual_tokens": actual_tokens if metered else None,
+        "ratio": round(actual_tokens / run["estimated_tokens"], 2) if fully_metered and run["estimated_tokens"] else None,
+        "requests": actual["requests"],
+        "unmetered_requests": actual["unmetered_requests"],
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Budgeted evaluation run for one JD")
+    parser.add_argument("jd_id", nargs="?", help="JD to evaluate")
+    parser.add_argument("--resume", dest="run_id", default=None, help="Continue a paused run")
+    parser.add_argument("--priority", choices=PRIORITIES, default="newest")
+    parser.add_argument("--tokens", type=int, default=None, help="Token budget")
+    parser.add_argument("--requests", type=int, default=None, help="Request budget")
+    args = parser.parse_args()
+
+    init_db()
+    budget = {"tokens": args.tokens, "requests": args.requests} if args.tokens or args.requests else None
+    if args.run_id:
+        result = resume_run(args.run_id, budget=budget)
+    else:
+        jd = next(jd for jd in get_jds() if jd["jd_id"] == args.jd_id)
+        result = run_evaluation(jd, priority=args.priority, budget=budget)
+
+    report = usage_report(result)
+    print(f"Run {result['run_id']}: {result['status']}, {result['scored']} scored, {result['remaining']} remaining")
+    for item in result["oversized"]:
+        print(f"  skipped {item['candidate_name']}: ~{item['estimated_tokens']} tokens is above the token budget")
+    print(
+        f"  tokens estimated {report['estimated_tokens']}, actual {report['actual_tokens']} "
+        f"(ratio {report['ratio']}), {report['requests']} request(s)"
+    )
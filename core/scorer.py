@@ -1,9 +1,14 @@
 import json
-import copy
-from typing import Dict, Any
+import threading
+from typing import Dict, Any, List, Mapping, Tuple
 
-from core.llm_client import call_llm
+from core.llm_client import call_llm, call_llm_stream, LLMUnavailableError, HEDGE_ENABLED
+from core.heuristic_scorer import heuristic_scores
+from core.models import CategoryScore, MaskedResume, category_scores_from_llm
 from core.rubric import RUBRIC_CATEGORIES, get_rubric_text
+from core.scoring_context import build_scoring_context, jd_block
+from core.skills import canonical_name, jd_skills, resume_skills, skill_overlap
+from core.tracing import traced
 
 
 LLM_OUTPUT_SCHEMA = {
@@ -40,18 +45,12 @@ LLM_OUTPUT_SCHEMA = {
 
 # -------------------- SAFETY HELPERS --------------------
 
-def mask_resume_pii(parsed_resume: Dict[str, Any]) -> Dict[str, Any]:
+def mask_resume_pii(parsed_resume: Mapping[str, Any]) -> MaskedResume:
     """
-    Removes personal identifiers before scoring.
+    Hides personal identifiers before scoring. Returns a read-only view,
+    the resume itself is not copied.
     """
-    resume = copy.deepcopy(parsed_resume)
-
-    resume.pop("candidate_name", None)
-    resume.pop("email", None)
-    resume.pop("phone", None)
-    resume.pop("professional_presence_links", None)
-
-    return resume
+    return MaskedResume(parsed_resume)
 
 
 def _extract_json(text: str) -> str:
@@ -80,23 +79,14 @@ def _safe_json_load(response_text: str) -> dict:
         raise ValueError("Invalid JSON returned by LLM") from exc
 
 
-def _validate_llm_scores(llm_scores: Dict[str, Any]) -> None:
-    for category in RUBRIC_CATEGORIES:
-        if category not in llm_scores:
-            raise ValueError(f"Missing category: {category}")
-
-        score = llm_scores[category].get("score")
-        if not isinstance(score, (int, float)):
-            raise ValueError(f"Invalid score type for {category}")
-
-        if score < 0 or score > 100:
-            raise ValueError(f"Score out of range for {category}")
+def _validate_category(category: str, value: Any) -> None:
+    CategoryScore.from_llm(category, value)
 
 
-def _compute_final_score(llm_scores: Dict[str, Any]) -> float:
+def _compute_final_score(scores: Dict[str, CategoryScore]) -> float:
     final_score = 0.0
     for category, weight in RUBRIC_CATEGORIES.items():
-        final_score += llm_scores[category]["score"] * (weight / 100)
+        final_score += scores[category].score * (weight / 100)
     return round(final_score, 2)
 
 
@@ -115,10 +105,7 @@ def assign_candidate_tier(final_score: float) -> str:
 
 # -------------------- PROMPT --------------------
 
-def _build_prompt(parsed_jd: Dict[str, Any], parsed_resume: Dict[str, Any]) -> str:
-    return f"""
-{get_rubric_text()}
-
+SCORING_RULES = """
 SCORING INTELLIGENCE RULES (MANDATORY):
 
 1. Perform SEMANTIC matching, not keyword matching
@@ -144,15 +131,132 @@ STRICT OUTPUT RULES:
 - Follow EXACT schema
 - Scores must be 0–100
 - Explanations must justify semantic reasoning
+"""
+
+
+def _compact_resume(parsed_resume: Mapping[str, Any]) -> Dict[str, Any]:
+    """
+    Replaces skill entries the local taxonomy recognizes with a compact
+    canonical list. Unrecognized skills keep their context, and usage
+    evidence in projects/tools/experience is untouched.
 
+    Returns a shallow dict, ready for json.dumps.
+    """
+    compact = dict(parsed_resume)
+    skills = compact.get("skills_with_context") or []
+    unrecognized = [s for s in skills if not canonical_name(s.get("skill"))]
+    if len(unrecognized) == len(skills):
+        return compact
+
+    compact["skills_with_context"] = unrecognized
+    compact["canonical_skills"] = sorted({
+        canonical_name(s.get("skill")) for s in skills
+    } - {None})
+    return compact
+
+
+def _skill_overlap_block(jd_skill_sets: Dict[str, List[str]], parsed_resume: Mapping[str, Any]) -> str:
+    overlap = skill_overlap(jd_skill_sets, resume_skills(parsed_resume))
+    return (
+        "DETERMINISTIC SKILL OVERLAP (local taxonomy, for reference only):\n"
+        f"- Matched: {', '.join(overlap['matched']) or 'none'}\n"
+        f"- Missing mandatory: {', '.join(overlap['missing_mandatory']) or 'none'}\n"
+    )
+
+
+# Identical for every prompt; the JD and then the resume follow it
+_STATIC_HEADER = f"""
+{get_rubric_text()}
+{SCORING_RULES}
 REQUIRED JSON SCHEMA:
 {json.dumps(LLM_OUTPUT_SCHEMA, indent=2)}
+"""
+
+_PREFIX_CACHE_SIZE = 256
+# jd_hash -> (static header + JD block, canonical JD skill sets)
+_prefixes: Dict[str, Tuple[str, Dict[str, List[str]]]] = {}
+_prefixes_lock = threading.Lock()
+
+
+def _jd_prefix(parsed_jd: Dict[str, Any], jd_context: Dict[str, Any]) -> Tuple[str, Dict[str, List[str]]]:
+    """
+    Static header + JD block and the JD's skill sets, built once per JD hash.
+    """
+    cached = _prefixes.get(jd_context["jd_hash"])
+    if cached is None:
+        cached = (
+            f"{_STATIC_HEADER}\nPARSED JOB DESCRIPTION:\n{jd_context['jd_block']}\n\n",
+            jd_skills(parsed_jd),
+        )
+        with _prefixes_lock:
+            if len(_prefixes) >= _PREFIX_CACHE_SIZE:
+                _prefixes.clear()
+            _prefixes[jd_context["jd_hash"]] = cached
+    return cached
+
+
+def _resume_suffix(jd_skill_sets: Dict[str, List[str]], parsed_resume: Mapping[str, Any]) -> str:
+    return f"""{_skill_overlap_block(jd_skill_sets, parsed_resume)}
+PARSED RESUME (PII MASKED):
+{json.dumps(_compact_resume(parsed_resume), indent=2)}
+
+Return ONLY valid JSON.
+"""
+
+
+def _build_prompt(
+    parsed_jd: Dict[str, Any],
+    parsed_resume: Mapping[str, Any],
+    jd_context: Dict[str, Any] | None = None
+) -> str:
+    """
+    Prefix-stable prompt: everything before the resume suffix is
+    byte-identical for every resume scored against the JD.
+    """
+    jd_context = jd_context or build_scoring_context(parsed_jd)
+    prefix, jd_skill_sets = _jd_prefix(parsed_jd, jd_context)
+    return prefix + _resume_suffix(jd_skill_sets, parsed_resume)
+
 
-PARSED JOB DESCRIPTION:
-{json.dumps(parsed_jd, indent=2)}
+def scoring_prompt(
+    parsed_jd: Dict[str, Any],
+    parsed_resume: Mapping[str, Any],
+    jd_context: Dict[str, Any] | None = None
+) -> str:
+    """
+    The exact prompt score_resume sends for this pair (PII masked).
+    `jd_context` is the JD document's precomputed scoring_context.
+    """
+    return _build_prompt(parsed_jd, mask_resume_pii(parsed_resume), jd_context)
+
+
+def _build_multi_prompt(parsed_jds: Dict[str, Dict[str, Any]], parsed_resume: Dict[str, Any]) -> str:
+    """
+    One prompt scoring the same resume against several JDs.
+    `parsed_jds` maps the response key (e.g. "JD_1") to a parsed JD.
+    """
+    jd_blocks = "\n\n".join(
+        f"{key}:\n{jd_block(parsed_jd)}"
+        for key, parsed_jd in parsed_jds.items()
+    )
+    schema = {key: LLM_OUTPUT_SCHEMA for key in parsed_jds}
+
+    return f"""
+{get_rubric_text()}
+{SCORING_RULES}
+MULTI-JD RULES:
+- Evaluate the SAME resume independently against EACH job description
+- Do NOT let one job description influence the scores for another
+- Use the job description keys exactly as given
+
+REQUIRED JSON SCHEMA:
+{json.dumps(schema, indent=2)}
+
+PARSED JOB DESCRIPTIONS:
+{jd_blocks}
 
 PARSED RESUME (PII MASKED):
-{json.dumps(parsed_resume, indent=2)}
+{json.dumps(_compact_resume(parsed_resume), indent=2)}
 
 Return ONLY valid JSON.
 """
@@ -160,31 +264,152 @@ Return ONLY valid JSON.
 
 # -------------------- MAIN ENTRY --------------------
 
-def score_resume(parsed_jd: Dict[str, Any], parsed_resume: Dict[str, Any]) -> Dict[str, Any]:
-    masked_resume = mask_resume_pii(parsed_resume)
+def _call_scoring_llm(prompt: str, stream: bool, on_category=None) -> Dict[str, CategoryScore]:
+    if not stream:
+        llm_scores = _safe_json_load(call_llm(prompt, stage="score"))
+    else:
+        # Categories are validated as they arrive; an off-schema response
+        # aborts the stream instead of generating to the end.
+        llm_scores = _safe_json_load(call_llm_stream(
+            prompt,
+            expected_keys=RUBRIC_CATEGORIES,
+            required_keys=RUBRIC_CATEGORIES,
+            on_value=on_category,
+            value_validator=_validate_category,
+            stage="score"
+        ))
+    return category_scores_from_llm(llm_scores, RUBRIC_CATEGORIES)
+
+
+@traced("score.score_resume")
+def score_resume(
+    parsed_jd: Dict[str, Any],
+    parsed_resume: Dict[str, Any],
+    stream: bool = False,
+    on_category=None,
+    fallback: bool = True,
+    jd_context: Dict[str, Any] | None = None,
+    on_retry=None
+) -> Dict[str, Any]:
+    """
+    Scores a parsed resume against a parsed JD.
+
+    With `stream=True` (implied by `on_category`) the completion is
+    streamed and `on_category(category, {"score", "explanation"})` is
+    called as each category finishes. With LLM_HEDGE_ENABLED the call is
+    never streamed, so it can be hedged, and `on_category` is not called.
+    `on_retry()` is called before the invalid-JSON retry, so categories
+    streamed by the failed attempt can be discarded.
 
-    prompt = _build_prompt(parsed_jd, masked_resume)
-    response = call_llm(prompt)
+    If the LLM is unavailable (API failure or open circuit) and
+    `fallback` is set, the local heuristic scores are returned instead
+    with `provisional=True`, to be re-scored later (core/rescore.py).
+
+    Pass the JD document's `scoring_context` as `jd_context` to reuse
+    its precomputed JD block.
+    """
+    # Only non-streamed calls are hedged
+    stream = (stream or on_category is not None) and not HEDGE_ENABLED
+    prompt = scoring_prompt(parsed_jd, parsed_resume, jd_context)
 
     try:
-        llm_scores = _safe_json_load(response)
-        _validate_llm_scores(llm_scores)
-    except Exception:
-        retry_prompt = prompt + "\nERROR: Fix JSON. Return ONLY JSON."
-        retry_response = call_llm(retry_prompt)
-        llm_scores = _safe_json_load(retry_response)
-        _validate_llm_scores(llm_scores)
-
-    final_score = _compute_final_score(llm_scores)
+        try:
+            llm_scores = _call_scoring_llm(prompt, stream, on_category)
+        except ValueError:
+            if on_retry:
+                on_retry()
+            retry_prompt = prompt + "\nERROR: Fix JSON. Return ONLY JSON."
+            llm_scores = _call_scoring_llm(retry_prompt, stream, on_category)
+    except LLMUnavailableError:
+        if not fallback:
+            raise
+        return score_resume_heuristic(parsed_jd, parsed_resume)
+
+    return _build_result(llm_scores)
+
+
+def score_resume_heuristic(
+    parsed_jd: Dict[str, Any],
+    parsed_resume: Dict[str, Any],
+    candidate_skills=None
+) -> Dict[str, Any]:
+    """
+    score_resume-shaped result from the local heuristic scorer, marked
+    provisional. No LLM call.
+    """
+    scores = heuristic_scores(parsed_jd, parsed_resume, candidate_skills)
+    return _build_result(
+        {cat: CategoryScore(value["score"], value["explanation"]) for cat, value in scores.items()},
+        provisional=True
+    )
+
+
+def score_resume_multi(
+    parsed_jds: Dict[str, Dict[str, Any]],
+    parsed_resume: Dict[str, Any]
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Scores one resume against several JDs with a single LLM call.
+
+    Args:
+        parsed_jds: {jd_id: parsed_jd}
+
+    Returns:
+        {jd_id: score_resume-shaped result}. JDs the packed response
+        got wrong (even after one retry) are scored individually.
+    """
+    if len(parsed_jds) == 1:
+        jd_id, parsed_jd = next(iter(parsed_jds.items()))
+        return {jd_id: score_resume(parsed_jd, parsed_resume)}
+
+    masked_resume = mask_resume_pii(parsed_resume)
+    keys = {f"JD_{idx}": jd_id for idx, jd_id in enumerate(parsed_jds, 1)}
+    prompt = _build_multi_prompt(
+        {key: parsed_jds[jd_id] for key, jd_id in keys.items()},
+        masked_resume
+    )
+
+    results = {}
+    for attempt_prompt in (prompt, prompt + "\nERROR: Fix JSON. Return ONLY JSON."):
+        try:
+            packed = _safe_json_load(call_llm(attempt_prompt, stage="score"))
+        except ValueError:
+            continue
+        except LLMUnavailableError:
+            # Per-JD scoring below falls back to provisional scores
+            break
+
+        for key, jd_id in keys.items():
+            if jd_id in results:
+                continue
+            try:
+                scores = category_scores_from_llm(packed.get(key), RUBRIC_CATEGORIES)
+            except (ValueError, AttributeError):
+                continue
+            results[jd_id] = _build_result(scores)
+
+        if len(results) == len(keys):
+            break
+
+    for jd_id, parsed_jd in parsed_jds.items():
+        if jd_id not in results:
+            results[jd_id] = score_resume(parsed_jd, parsed_resume)
+
+    return results
+
+
+def _build_result(scores: Dict[str, CategoryScore], provisional: bool = False) -> Dict[str, Any]:
+    final_score = _compute_final_score(scores)
     candidate_tier = assign_candidate_tier(final_score)
 
     return {
         "final_score": final_score,
         "candidate_tier": candidate_tier,
+        "provisional": provisional,
         "category_scores": {
-            cat: llm_scores[cat]["score"] for cat in RUBRIC_CATEGORIES
+            cat: scores[cat].score for cat in RUBRIC_CATEGORIES
         },
         "category_explanations": {
-            cat: llm_scores[cat]["explanation"] for cat in RUBRIC_CATEGORIES
+            cat: scores[cat].explanation for cat in RUBRIC_CATEGORIES
         }
     }
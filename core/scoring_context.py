@@ -0,0 +1,47 @@
+"""
+Precomputed per-JD scoring context.
+
+Every scoring prompt for a JD shares one static prefix (rubric, scoring
+rules, output schema, JD) and only the resume block after it varies,
+so provider-side prompt caching and the local prefix cache in
+core/scorer.py hit for every resume after the first.
+
+The JD part of that prefix is built once, on save_jd, and stored on the
+JD document:
+
+    "scoring_context": {
+        jd_block,    # canonical compact JSON of parsed_jd_json
+        jd_hash,     # sha256 of jd_block
+        jd_tokens    # estimate_tokens(jd_block)
+    }
+"""
+
+import hashlib
+import json
+import math
+from typing import Dict, Any
+
+from core.config_manager import ConfigManager
+
+CHARS_PER_TOKEN = float(ConfigManager.get("CHARS_PER_TOKEN", 4))
+
+
+def estimate_tokens(text: str) -> int:
+    return math.ceil(len(text) / CHARS_PER_TOKEN)
+
+
+def jd_block(parsed_jd: Dict[str, Any]) -> str:
+    """
+    Canonical form: sorted keys and no insignificant whitespace, so the
+    same parse always yields byte-identical prompts.
+    """
+    return json.dumps(parsed_jd, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+def build_scoring_context(parsed_jd: Dict[str, Any]) -> Dict[str, Any]:
+    block = jd_block(parsed_jd)
+    return {
+        "jd_block": block,
+        "jd_hash": hashlib.sha256(block.encode("utf-8")).hexdigest(),
+        "jd_tokens": estimate_tokens(block),
+    }
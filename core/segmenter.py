@@ -0,0 +1,191 @@
+"""
+Section-aware compaction of extracted resume text.
+
+Runs locally over extract_text output before parse_resume:
+- drops page headers/footers repeated on most pdfplumber pages (after
+  their first occurrence) and "Page x of y" lines
+- detects standard sections (experience, skills, projects, education, ...)
+  and drops the ones RESUME_SCHEMA has no field for (references, hobbies,
+  declarations, personal details)
+- collapses whitespace
+- fits the result into a character budget, trimming the least useful
+  sections first
+"""
+
+import re
+from collections import Counter
+from typing import List, Tuple
+
+from core.config_manager import ConfigManager
+
+DEFAULT_CHAR_BUDGET = int(ConfigManager.get("RESUME_PROMPT_CHAR_BUDGET", 12000))
+
+PAGE_BREAK = "\f"
+
+SECTION_ALIASES = {
+    "summary": ["summary", "profile", "professional summary", "profile summary",
+                "objective", "career objective", "about me"],
+    "experience": ["experience", "work experience", "professional experience",
+                   "employment history", "work history", "career history",
+                   "internships", "internship", "employment"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies",
+               "skills and tools", "technologies", "tools", "tech stack"],
+    "projects": ["projects", "academic projects", "key projects", "personal projects"],
+    "education": ["education", "academic background", "qualifications",
+                  "educational qualifications", "academics"],
+    "certifications": ["certifications", "certificates", "courses", "training", "licenses"],
+    "achievements": ["achievements", "awards", "accomplishments", "honors", "honours"],
+    "leadership": ["leadership", "positions of responsibility", "volunteering",
+                   "extracurricular activities"],
+    "links": ["links", "online presence", "profiles", "portfolio"],
+    "research": ["publications", "research", "research experience", "teaching",
+                 "teaching experience", "conferences", "presentations", "patents",
+                 "grants"],
+    # Nothing in RESUME_SCHEMA is filled from these
+    "references": ["references", "referees"],
+    "hobbies": ["hobbies", "interests", "hobbies and interests", "personal interests"],
+    "personal": ["personal details", "personal information", "personal profile",
+                 "declaration", "languages known"],
+}
+
+DROPPED_SECTIONS = {"references", "hobbies", "personal"}
+
+JD_SECTION_ALIASES = {
+    "about": ["about us", "about the company", "who we are", "company overview",
+              "about the role", "role overview", "overview", "job summary"],
+    "responsibilities": ["responsibilities", "key responsibilities", "roles and responsibilities",
+                         "what you will do", "what you'll do", "duties", "job responsibilities"],
+    "requirements": ["requirements", "qualifications", "required skills", "must have",
+                     "must haves", "what we are looking for", "what we're looking for",
+                     "skills required", "minimum qualifications", "eligibility"],
+    "preferred": ["preferred qualifications", "preferred skills", "nice to have",
+                  "good to have", "bonus points", "bonus"],
+    "benefits": ["benefits", "perks", "what we offer", "compensation", "why join us"],
+}
+
+# Trimmed last-first when over budget; "header" is the contact block
+# before the first heading.
+SECTION_PRIORITY = ["header", "experience", "skills", "projects", "research", "summary",
+                    "achievements", "leadership", "links", "certifications",
+                    "education"]
+
+def _heading_index(section_aliases: dict) -> dict:
+    return {
+        alias: section
+        for section, aliases in section_aliases.items()
+        for alias in aliases
+    }
+
+
+_RESUME_HEADINGS = _heading_index(SECTION_ALIASES)
+_JD_HEADINGS = _heading_index(JD_SECTION_ALIASES)
+_PAGE_NUMBER = re.compile(r"^(page\s*)?\d+(\s*(of|/)\s*\d+)?$", re.IGNORECASE)
+_SPACES = re.compile(r"[ \t\u00a0]+")
+_HEADING_STRIP = re.compile(r"^[\W_]+|[\W_]+$")
+
+
+# -------------------- HELPERS --------------------
+
+def _heading_section(line: str, headings: dict) -> str | None:
+    if len(line) > 40:
+        return None
+    key = _HEADING_STRIP.sub("", line.lower()).replace("&", "and")
+    return headings.get(_SPACES.sub(" ", key))
+
+
+def _furniture_key(line: str) -> str:
+    return re.sub(r"\d+", "#", line.lower())
+
+
+def _page_furniture(pages: List[List[str]], headings: dict) -> set:
+    """
+    Lines repeated at the top or bottom of most pages (digits masked,
+    so "Page 1" and "Page 2" count as the same line). Section headings
+    are never furniture.
+    """
+    if len(pages) < 2:
+        return set()
+
+    counts = Counter()
+    for lines in pages:
+        edge = lines[:3] + lines[-3:]
+        counts.update({_furniture_key(line) for line in edge if not _heading_section(line, headings)})
+    return {line for line, n in counts.items() if n >= 2 and n > len(pages) / 2}
+
+
+# -------------------- PUBLIC API --------------------
+
+def segment_resume(text: str) -> List[Tuple[str, List[str]]]:
+    """
+    Splits resume text into [(section, lines)] in document order, with
+    whitespace collapsed and page headers/footers removed.
+    """
+    return _segment(text, _RESUME_HEADINGS)
+
+
+def segment_jd(text: str) -> List[Tuple[str, List[str]]]:
+    """
+    Same as segment_resume, using job description headings.
+    """
+    return _segment(text, _JD_HEADINGS)
+
+
+def _segment(text: str, headings: dict) -> List[Tuple[str, List[str]]]:
+    pages = []
+    for page in (text or "").split(PAGE_BREAK):
+        lines = [_SPACES.sub(" ", line).strip() for line in page.splitlines()]
+        pages.append([line for line in lines if line])
+
+    furniture = _page_furniture(pages, headings)
+    seen = set()
+
+    sections: List[Tuple[str, List[str]]] = [("header", [])]
+    for lines in pages:
+        for line in lines:
+            if _PAGE_NUMBER.match(line):
+                continue
+            # The first copy stays: a repeated header is usually the
+            # candidate's name and contact line
+            key = _furniture_key(line)
+            if key in furniture:
+                if key in seen:
+                    continue
+                seen.add(key)
+
+            section = _heading_section(line, headings)
+            if section:
+                sections.append((section, []))
+            else:
+                sections[-1][1].append(line)
+
+    return [(section, lines) for section, lines in sections if lines]
+
+
+def compact_resume_text(text: str, char_budget: int = DEFAULT_CHAR_BUDGET) -> str:
+    """
+    Returns only the resume content RESUME_SCHEMA needs, within
+    `char_budget` characters.
+    """
+    sections = [
+        [section, "\n".join(lines)]
+        for section, lines in segment_resume(text)
+        if section not in DROPPED_SECTIONS
+    ]
+
+    def rank(section):
+        return SECTION_PRIORITY.index(section) if section in SECTION_PRIORITY else len(SECTION_PRIORITY)
+
+    # Trim lowest-priority sections until the rendered text fits
+    overflow = sum(len(body) + len(section) + 3 for section, body in sections) - char_budget
+    for entry in sorted(sections, key=lambda e: rank(e[0]), reverse=True):
+        if overflow <= 0:
+            break
+        keep = max(len(entry[1]) - overflow, 0)
+        overflow -= len(entry[1]) - keep
+        entry[1] = entry[1][:keep].rsplit("\n", 1)[0] if keep else ""
+
+    return "\n\n".join(
+        body if section == "header" else f"{section.upper()}:\n{body}"
+        for section, body in sections
+        if body
+    )
@@ -0,0 +1,103 @@
+"""
+Static, human-defined skill taxonomy.
+
+This module MUST NOT contain any matching logic.
+Each canonical skill lists its aliases (matched case-insensitively on
+word boundaries) and the family it belongs to. Aliases that are common
+English words on their own (e.g. "go", "rest", "excel") are deliberately
+left out to avoid false positives.
+"""
+
+SKILL_TAXONOMY = {
+    # ---------------- LANGUAGES ----------------
+    "Python": {"family": "Languages", "aliases": ["python", "python3", "python 3", "py3"]},
+    "Java": {"family": "Languages", "aliases": ["java", "core java", "java 8", "java 11", "java 17"]},
+    "JavaScript": {"family": "Languages", "aliases": ["javascript", "js", "es6", "ecmascript"]},
+    "TypeScript": {"family": "Languages", "aliases": ["typescript"]},
+    "C++": {"family": "Languages", "aliases": ["c++", "cpp"]},
+    "C#": {"family": "Languages", "aliases": ["c#", "csharp", "c sharp"]},
+    "Go": {"family": "Languages", "aliases": ["golang"]},
+    "Rust": {"family": "Languages", "aliases": ["rust", "rustlang"]},
+    "Scala": {"family": "Languages", "aliases": ["scala"]},
+    "Kotlin": {"family": "Languages", "aliases": ["kotlin"]},
+    "Ruby": {"family": "Languages", "aliases": ["ruby"]},
+    "PHP": {"family": "Languages", "aliases": ["php"]},
+    "SQL": {"family": "Languages", "aliases": ["sql", "t-sql", "pl/sql", "plsql", "tsql"]},
+    "Bash": {"family": "Languages", "aliases": ["bash", "shell scripting", "shell script"]},
+
+    # ---------------- BACKEND FRAMEWORKS ----------------
+    "Django": {"family": "Backend Frameworks", "aliases": ["django", "django rest framework", "drf"]},
+    "Flask": {"family": "Backend Frameworks", "aliases": ["flask"]},
+    "FastAPI": {"family": "Backend Frameworks", "aliases": ["fastapi", "fast api"]},
+    "Spring Boot": {"family": "Backend Frameworks", "aliases": ["spring boot", "springboot", "spring framework", "spring mvc"]},
+    "Node.js": {"family": "Backend Frameworks", "aliases": ["node.js", "nodejs", "node js"]},
+    "Express": {"family": "Backend Frameworks", "aliases": ["express.js", "expressjs"]},
+    ".NET": {"family": "Backend Frameworks", "aliases": [".net", "dotnet", "asp.net", ".net core"]},
+
+    # ---------------- FRONTEND ----------------
+    "React": {"family": "Frontend", "aliases": ["react", "react.js", "reactjs"]},
+    "Angular": {"family": "Frontend", "aliases": ["angular", "angularjs", "angular.js"]},
+    "Vue.js": {"family": "Frontend", "aliases": ["vue", "vue.js", "vuejs"]},
+    "HTML": {"family": "Frontend", "aliases": ["html", "html5"]},
+    "CSS": {"family": "Frontend", "aliases": ["css", "css3", "scss", "sass"]},
+    "Streamlit": {"family": "Frontend", "aliases": ["streamlit"]},
+
+    # ---------------- DATABASES ----------------
+    "MongoDB": {"family": "Databases", "aliases": ["mongodb", "mongo db", "mongo", "mongodb atlas", "mongodb compass"]},
+    "PostgreSQL": {"family": "Databases", "aliases": ["postgresql", "postgres", "psql"]},
+    "MySQL": {"family": "Databases", "aliases": ["mysql"]},
+    "Oracle Database": {"family": "Databases", "aliases": ["oracle db", "oracle database"]},
+    "SQL Server": {"family": "Databases", "aliases": ["sql server", "mssql", "ms sql"]},
+    "Redis": {"family": "Databases", "aliases": ["redis"]},
+    "Cassandra": {"family": "Databases", "aliases": ["cassandra", "apache cassandra"]},
+    "Elasticsearch": {"family": "Databases", "aliases": ["elasticsearch", "elastic search", "opensearch"]},
+    "DynamoDB": {"family": "Databases", "aliases": ["dynamodb", "dynamo db"]},
+    "Snowflake": {"family": "Databases", "aliases": ["snowflake"]},
+
+    # ---------------- DATA ENGINEERING ----------------
+    "Kafka": {"family": "Data Engineering", "aliases": ["kafka", "apache kafka", "kafka streams"]},
+    "Spark": {"family": "Data Engineering", "aliases": ["apache spark", "pyspark", "spark sql"]},
+    "Airflow": {"family": "Data Engineering", "aliases": ["airflow", "apache airflow"]},
+    "Hadoop": {"family": "Data Engineering", "aliases": ["hadoop", "hdfs", "mapreduce"]},
+    "dbt": {"family": "Data Engineering", "aliases": ["dbt"]},
+    "ETL": {"family": "Data Engineering", "aliases": ["etl", "elt", "data pipelines", "data pipeline"]},
+    "Pandas": {"family": "Data Engineering", "aliases": ["pandas"]},
+    "NumPy": {"family": "Data Engineering", "aliases": ["numpy"]},
+
+    # ---------------- ML / AI ----------------
+    "Machine Learning": {"family": "ML & AI", "aliases": ["machine learning", "ml"]},
+    "Deep Learning": {"family": "ML & AI", "aliases": ["deep learning", "neural networks"]},
+    "NLP": {"family": "ML & AI", "aliases": ["nlp", "natural language processing"]},
+    "Computer Vision": {"family": "ML & AI", "aliases": ["computer vision", "opencv"]},
+    "LLM": {"family": "ML & AI", "aliases": ["llm", "llms", "large language models", "generative ai", "genai"]},
+    "TensorFlow": {"family": "ML & AI", "aliases": ["tensorflow", "keras"]},
+    "PyTorch": {"family": "ML & AI", "aliases": ["pytorch"]},
+    "scikit-learn": {"family": "ML & AI", "aliases": ["scikit-learn", "sklearn", "scikit learn"]},
+    "LangChain": {"family": "ML & AI", "aliases": ["langchain"]},
+
+    # ---------------- CLOUD & DEVOPS ----------------
+    "AWS": {"family": "Cloud & DevOps", "aliases": ["aws", "amazon web services", "ec2", "s3", "aws lambda"]},
+    "Azure": {"family": "Cloud & DevOps", "aliases": ["azure", "microsoft azure"]},
+    "GCP": {"family": "Cloud & DevOps", "aliases": ["gcp", "google cloud", "google cloud platform"]},
+    "Docker": {"family": "Cloud & DevOps", "aliases": ["docker", "containerization"]},
+    "Kubernetes": {"family": "Cloud & DevOps", "aliases": ["kubernetes", "k8s", "eks", "aks", "gke"]},
+    "Terraform": {"family": "Cloud & DevOps", "aliases": ["terraform"]},
+    "CI/CD": {"family": "Cloud & DevOps", "aliases": ["ci/cd", "cicd", "continuous integration", "continuous delivery"]},
+    "Jenkins": {"family": "Cloud & DevOps", "aliases": ["jenkins"]},
+    "GitHub Actions": {"family": "Cloud & DevOps", "aliases": ["github actions"]},
+    "Linux": {"family": "Cloud & DevOps", "aliases": ["linux", "unix", "ubuntu"]},
+
+    # ---------------- PRACTICES & TOOLS ----------------
+    "Git": {"family": "Practices & Tools", "aliases": ["git", "github", "gitlab", "bitbucket"]},
+    "REST APIs": {"family": "Practices & Tools", "aliases": ["rest api", "rest apis", "restful", "restful apis"]},
+    "GraphQL": {"family": "Practices & Tools", "aliases": ["graphql"]},
+    "Microservices": {"family": "Practices & Tools", "aliases": ["microservices", "microservice architecture"]},
+    "Agile": {"family": "Practices & Tools", "aliases": ["agile", "scrum", "kanban"]},
+    "Jira": {"family": "Practices & Tools", "aliases": ["jira"]},
+    "Unit Testing": {"family": "Practices & Tools", "aliases": ["unit testing", "pytest", "junit", "tdd"]},
+
+    # ---------------- ANALYTICS ----------------
+    "Power BI": {"family": "Analytics", "aliases": ["power bi", "powerbi"]},
+    "Tableau": {"family": "Analytics", "aliases": ["tableau"]},
+    "Excel": {"family": "Analytics", "aliases": ["ms excel", "microsoft excel", "advanced excel"]},
+}
@@ -0,0 +1,194 @@
+"""
+Local skill extraction and canonicalization.
+
+Compiles SKILL_TAXONOMY into an Aho-Corasick automaton once per process,
+so raw extract_text output and the parsed_*_json skill fields are
+scanned in a single linear pass. Gives a fast, deterministic skill
+overlap signal without an LLM call.
+"""
+
+import re
+from collections import deque
+from typing import Dict, Any, Iterable, List
+
+from core.skill_taxonomy import SKILL_TAXONOMY
+
+_WORD_CHAR = re.compile(r"[a-z0-9]")
+_SPACES = re.compile(r"\s+")
+
+
+# -------------------- AUTOMATON --------------------
+
+class _AhoCorasick:
+    def __init__(self, patterns: Dict[str, str]):
+        """
+        Args:
+            patterns: {lowercase alias: canonical skill}
+        """
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[tuple]] = [[]]
+
+        for alias, canonical in patterns.items():
+            state = 0
+            for ch in alias:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[state][ch] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                state = nxt
+            self._out[state].append((len(alias), canonical))
+
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """
+        Yields (start, end, canonical) for every alias occurrence.
+        """
+        state = 0
+        for idx, ch in enumerate(text):
+            while state and ch not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(ch, 0)
+            for length, canonical in self._out[state]:
+                yield idx - length + 1, idx + 1, canonical
+
+
+def _normalize(value: str) -> str:
+    return _SPACES.sub(" ", value.lower()).strip()
+
+
+_ALIASES = {
+    _normalize(alias): canonical
+    for canonical, entry in SKILL_TAXONOMY.items()
+    for alias in entry["aliases"]
+}
+_EXACT = {**_ALIASES, **{_normalize(c): c for c in SKILL_TAXONOMY}}
+_AUTOMATON = _AhoCorasick(_ALIASES)
+
+
+# -------------------- PUBLIC API --------------------
+
+def extract_skills(text: str) -> List[str]:
+    """
+    Canonical skills mentioned anywhere in free text, sorted.
+    Matches must sit on word boundaries ("java" does not match "javascript").
+    """
+    if not text:
+        return []
+
+    text = _normalize(text)
+    found = set()
+    for start, end, canonical in _AUTOMATON.iter_matches(text):
+        before = text[start - 1] if start > 0 else " "
+        after = text[end] if end < len(text) else " "
+        if _WORD_CHAR.match(before) or _WORD_CHAR.match(after):
+            continue
+        found.add(canonical)
+    return sorted(found)
+
+
+def canonical_name(value: str) -> str | None:
+    """
+    Canonical skill for an exact alias or canonical name, else None.
+    """
+    if not isinstance(value, str):
+        return None
+    return _EXACT.get(_normalize(value))
+
+
+def canonicalize(values: Iterable[str]) -> List[str]:
+    """
+    Maps skill list entries to canonical names.
+
+    Exact aliases map directly; longer phrases are scanned for known
+    skills; anything unrecognized is kept in normalized form so it can
+    still be compared literally.
+    """
+    result = set()
+    for value in values or []:
+        if not isinstance(value, str) or not value.strip():
+            continue
+        normalized = _normalize(value)
+        if normalized in _EXACT:
+            result.add(_EXACT[normalized])
+            continue
+        matched = extract_skills(normalized)
+        result.update(matched or [normalized])
+    return sorted(result)
+
+
+def skill_family(skill: str) -> str | None:
+    entry = SKILL_TAXONOMY.get(skill)
+    return entry["family"] if entry else None
+
+
+def resume_skills(parsed_resume: Dict[str, Any], raw_text: str = "") -> List[str]:
+    """
+    Canonical skills from the skill, tool and project technology fields,
+    plus any known skill mentioned in the raw resume text.
+    """
+    values = [s.get("skill") for s in parsed_resume.get("skills_with_context") or []]
+    values += [t.get("tool") for t in parsed_resume.get("tools_with_context") or []]
+    for project in parsed_resume.get("projects") or []:
+        values += project.get("technologies") or []
+    return sorted(set(canonicalize(values)).union(extract_skills(raw_text)))
+
+
+def jd_skills(parsed_jd: Dict[str, Any]) -> Dict[str, List[str]]:
+    """
+    Returns:
+    {
+        mandatory,
+        supporting,
+        tools,
+        all
+    }
+    """
+    skills = {
+        "mandatory": canonicalize(parsed_jd.get("mandatory_skills")),
+        "supporting": canonicalize(parsed_jd.get("supporting_skills")),
+        "tools": canonicalize(parsed_jd.get("tools")),
+    }
+    skills["all"] = sorted(set().union(*skills.values()))
+    return skills
+
+
+def skill_overlap(jd_skill_sets: Dict[str, List[str]], candidate_skills: Iterable[str]) -> Dict[str, Any]:
+    """
+    Deterministic overlap between a JD and a candidate.
+
+    Returns:
+    {
+        score,                 # 0-1, mandatory 60% / supporting 20% / tools 20%
+        matched,               # JD skills the candidate has
+        missing_mandatory
+    }
+    """
+    candidate = set(candidate_skills)
+
+    def coverage(required):
+        return len(candidate.intersection(required)) / len(required) if required else 0.0
+
+    score = (
+        0.6 * coverage(jd_skill_sets["mandatory"])
+        + 0.2 * coverage(jd_skill_sets["supporting"])
+        + 0.2 * coverage(jd_skill_sets["tools"])
+    )
+    return {
+        "score": round(score, 4),
+        "matched": sorted(candidate.intersection(jd_skill_sets["all"])),
+        "missing_mandatory": sorted(set(jd_skill_sets["mandatory"]) - candidate)
+    }
@@ -0,0 +1,94 @@
+"""
+Compressed store for extracted resume text.
+
+One document per file hash (shared by every JD the file was uploaded
+for), so a schema or prompt change can re-parse from here instead of
+asking recruiters to re-upload. Uses zstd when the `zstandard` package
+is installed and falls back to zlib otherwise; the codec is recorded
+per document so both can be read back.
+"""
+
+import zlib
+from datetime import datetime
+from bson.binary import Binary
+from core.db import get_db
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+_COLLECTION = "resume_texts"
+_ZSTD_LEVEL = 10
+_ZLIB_LEVEL = 9
+
+
+# -------------------------------------------------
+# CODEC
+# -------------------------------------------------
+def compress_text(text: str) -> tuple[str, bytes]:
+    """
+    (codec, data) for `text`: zstd when available, zlib otherwise.
+    """
+    raw = text.encode("utf-8")
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=_ZSTD_LEVEL).compress(raw)
+    return "zlib", zlib.compress(raw, _ZLIB_LEVEL)
+
+
+def decompress_text(codec: str, data: bytes) -> str:
+    """
+    Inverse of compress_text for either codec.
+    """
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read zstd-compressed text")
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    elif codec == "zlib":
+        raw = zlib.decompress(data)
+    else:
+        raise ValueError(f"Unknown text codec: {codec}")
+    return raw.decode("utf-8")
+
+
+# -------------------------------------------------
+# PUBLIC API
+# -------------------------------------------------
+def save_text(file_hash: str, text: str) -> bool:
+    """
+    Stores extracted text once per file hash.
+
+    Returns:
+        True  -> Newly stored
+        False -> Already present (deduplicated)
+    """
+    codec, data = compress_text(text)
+
+    result = get_db()[_COLLECTION].update_one(
+        {"_id": file_hash},
+        {"$setOnInsert": {
+            "codec": codec,
+            "data": Binary(data),
+            "raw_size": len(text.encode("utf-8")),
+            "compressed_size": len(data),
+            "created_at": datetime.utcnow()
+        }},
+        upsert=True
+    )
+    return result.upserted_id is not None
+
+
+def load_text(file_hash: str) -> str | None:
+    doc = get_db()[_COLLECTION].find_one({"_id": file_hash})
+    if not doc:
+        return None
+    return decompress_text(doc["codec"], doc["data"])
+
+
+def iter_texts(batch_size: int = 100):
+    """
+    Streams (file_hash, text) pairs for every stored document.
+    """
+    cursor = get_db()[_COLLECTION].find({}, batch_size=batch_size)
+    for doc in cursor:
+        yield doc["_id"], decompress_text(doc["codec"], doc["data"])
@@ -0,0 +1,277 @@
+"""
+Lightweight timing spans for the ingest and scoring hot paths.
+
+    with span("extract_text", file=name):
+        ...
+
+    @traced("db.save_resume")
+    def save_resume(doc): ...
+
+Spans nest per thread and are collected into batches
+(`with trace_batch("upload_resumes"):`). A span belongs to the batches
+active in its context, so concurrent sessions' batches stay separate;
+work handed to a thread pool joins the caller's batch when submitted
+through in_current_batch(). A finished batch can be exported as Chrome
+trace-event JSON (open it in chrome://tracing or
+https://ui.perfetto.dev) and every span also feeds per-stage latency
+histograms.
+
+Tracing is process-wide: off unless TRACE_ENABLED=1 or
+enable_tracing() is called, for every session at once. When off,
+span() returns a shared no-op object and traced functions cost one
+flag check.
+"""
+
+import contextvars
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Dict, Any, List
+
+from core.config_manager import ConfigManager
+
+TRACE_DIR = ConfigManager.get("TRACE_DIR", "traces")
+MAX_EVENTS = int(ConfigManager.get("TRACE_MAX_EVENTS", 100000))
+HISTOGRAM_WINDOW = 1000
+
+_enabled = ConfigManager.get("TRACE_ENABLED", "0") == "1"
+_lock = threading.Lock()
+_events = deque(maxlen=MAX_EVENTS)
+_stage_samples: Dict[str, deque] = {}
+_last_batch: Dict[str, Any] | None = None
+_pid = os.getpid()
+
+# Ids of the trace_batch blocks the current context runs in
+_batches: contextvars.ContextVar[tuple] = contextvars.ContextVar("trace_batches", default=())
+_batch_ids = itertools.count(1)
+
+
+def enable_tracing(enabled: bool = True):
+    global _enabled
+    _enabled = enabled
+
+
+def tracing_enabled() -> bool:
+    return _enabled
+
+
+# -------------------------------------------------
+# SPANS
+# -------------------------------------------------
+class _NoopSpan:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NOOP = _NoopSpan()
+
+
+class _Span:
+    __slots__ = ("name", "args", "start_ns")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        end_ns = time.perf_counter_ns()
+        event = {
+            "name": self.name,
+            "cat": self.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": self.start_ns / 1000,
+            "dur": (end_ns - self.start_ns) / 1000,
+            "pid": _pid,
+            "tid": threading.get_ident(),
+            "args": {**self.args, "error": exc_type.__name__} if exc_type else self.args,
+            "_batches": _batches.get(),
+        }
+        with _lock:
+            _events.append(event)
+            samples = _stage_samples.get(self.name)
+            if samples is None:
+                samples = _stage_samples[self.name] = deque(maxlen=HISTOGRAM_WINDOW)
+            samples.append(event["dur"] / 1000)
+        return False
+
+
+def span(name: str, **args):
+    """
+    Times the enclosed block. Spans are complete ("X") events, so nested
+    spans on the same thread show up as children in the trace viewer.
+    """
+    if not _enabled:
+        return _NOOP
+    return _Span(name, args)
+
+
+def traced(name: str | None = None):
+    """
+    Decorator timing every call of a function (or the full iteration of
+    a generator function) as a span.
+    """
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        if inspect.isgeneratorfunction(func):
+            @functools.wraps(func)
+            def gen_wrapper(*args, **kwargs):
+                if not _enabled:
+                    return (yield from func(*args, **kwargs))
+                with _Span(span_name, {}):
+                    return (yield from func(*args, **kwargs))
+            return gen_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, {}):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+# -------------------------------------------------
+# BATCHES & EXPORT
+# -------------------------------------------------
+def in_current_batch(func):
+    """
+    Wraps func so spans it records on a pool thread belong to the
+    caller's trace batches:
+
+        pool.submit(in_current_batch(work), item)
+    """
+    batches = _batches.get()
+
+    @functools.wraps(func)
+    def run(*args, **kwargs):
+        token = _batches.set(batches)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _batches.reset(token)
+    return run
+
+
+class trace_batch:
+    """
+    Collects the spans recorded in this context (including pool work
+    submitted with in_current_batch) while the block runs. On exit the
+    batch is kept as the last batch and, when TRACE_DIR is set, written
+    there as <name>-<timestamp>.json.
+    """
+
+    def __init__(self, name: str, **args):
+        self.name = name
+        self.args = args
+        self.events: List[dict] = []
+        self.path = None
+
+    def __enter__(self):
+        if not _enabled:
+            return self
+        self._id = next(_batch_ids)
+        self._token = _batches.set(_batches.get() + (self._id,))
+        self._span = _Span(f"batch.{self.name}", self.args)
+        self._span.__enter__()
+        return self
+
+    def __exit__(self, *exc):
+        global _last_batch
+
+        if not hasattr(self, "_span"):
+            return False
+        self._span.__exit__(*exc)
+        _batches.reset(self._token)
+
+        with _lock:
+            self.events = [
+                {key: value for key, value in event.items() if key != "_batches"}
+                for event in _events
+                if self._id in event["_batches"]
+            ]
+            _last_batch = {"name": self.name, "events": self.events}
+
+        if TRACE_DIR:
+            os.makedirs(TRACE_DIR, exist_ok=True)
+            self.path = os.path.join(TRACE_DIR, f"{self.name}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+            with open(self.path, "w", encoding="utf-8") as f:
+                export_chrome_trace(self.events, f)
+        return False
+
+
+def export_chrome_trace(events: List[dict], out) -> None:
+    """
+    Writes events as Chrome trace-event JSON to a text file object.
+    """
+    json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, out, default=str)
+
+
+def reset_tracing():
+    """
+    Drops recorded spans, histograms and the last batch.
+    """
+    global _last_batch
+
+    with _lock:
+        _events.clear()
+        _stage_samples.clear()
+        _last_batch = None
+
+
+def get_last_batch() -> Dict[str, Any] | None:
+    """
+    {name, events} of the most recently finished trace_batch.
+    """
+    return _last_batch
+
+
+def stage_histograms() -> Dict[str, Dict[str, Any]]:
+    """
+    Per span name over the recent window:
+    {
+        count,
+        total_ms,
+        p50_ms, p90_ms, p99_ms, max_ms,
+        buckets            # {"<=1ms": n, "<=2ms": n, "<=4ms": n, ...}
+    }
+    """
+    with _lock:
+        snapshot = {name: sorted(samples) for name, samples in _stage_samples.items()}
+
+    histograms = {}
+    for name, samples in snapshot.items():
+        def pct(p):
+            return samples[min(int(len(samples) * p), len(samples) - 1)]
+
+        buckets = {}
+        for ms in samples:
+            bound = 1
+            while ms > bound:
+                bound *= 2
+            buckets[f"<={bound}ms"] = buckets.get(f"<={bound}ms", 0) + 1
+
+        histograms[name] = {
+            "count": len(samples),
+            "total_ms": round(sum(samples), 3),
+            "p50_ms": round(pct(0.5), 3),
+            "p90_ms": round(pct(0.9), 3),
+            "p99_ms": round(pct(0.99), 3),
+            "max_ms": round(samples[-1], 3),
+            "buckets": buckets,
+        }
+    return histograms
@@ -1,18 +1,43 @@
-import io
-import pdfplumber
-import docx
+import codecs
 
+from core.ingest_buffer import IngestBuffer
+from core.tracing import traced
 
+
+@traced("ingest.extract_text")
 def extract_text(uploaded_file) -> str:
+    # Parsers are imported on first use so pages that never extract text
+    # (e.g. Results) don't pay for pdfplumber / python-docx at startup.
+    # They read the file object directly instead of a copy of its bytes.
+    uploaded_file.seek(0)
+
     if uploaded_file.type == "application/pdf":
-        with pdfplumber.open(io.BytesIO(uploaded_file.read())) as pdf:
-            return "\n".join(page.extract_text() or "" for page in pdf.pages)
+        import pdfplumber
+
+        with pdfplumber.open(uploaded_file) as pdf:
+            # Pages are separated by a form feed so page headers/footers
+            # can be recognized later (see core/segmenter.py)
+            return "\f".join(page.extract_text() or "" for page in pdf.pages)
 
     elif uploaded_file.type in [
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
     ]:
-        doc = docx.Document(io.BytesIO(uploaded_file.read()))
+        import docx
+
+        doc = docx.Document(uploaded_file)
         return "\n".join(p.text for p in doc.paragraphs)
 
     else:
+        if hasattr(uploaded_file, "getbuffer"):
+            with uploaded_file.getbuffer() as view:
+                return codecs.decode(view, "utf-8", errors="ignore")
         return uploaded_file.read().decode("utf-8", errors="ignore")
+
+
+def open_local_file(path: str) -> IngestBuffer:
+    """
+    Wraps a file on disk so it looks like a Streamlit UploadedFile
+    (.name, .type, .read(), .seek()) for programmatic imports. The file
+    is memory-mapped, not read into memory.
+    """
+    return IngestBuffer.from_path(path)
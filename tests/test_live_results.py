@@ -0,0 +1,113 @@
+"""
+Live results against a real MongoDB.
+
+The change stream test needs a replica set; a local single-node one is
+enough:
+
+    mongod --replSet rs0 --dbpath /tmp/rs0
+    mongosh --eval "rs.initiate()"
+    LIVE_TEST_MONGODB_URI="mongodb://localhost:27017/?replicaSet=rs0" python -m pytest tests
+
+Every test runs in a throwaway database. Skipped without
+LIVE_TEST_MONGODB_URI.
+"""
+
+import os
+import time
+import uuid
+from datetime import datetime, timedelta
+
+import pytest
+
+pytest.importorskip("pymongo")
+
+URI = os.environ.get("LIVE_TEST_MONGODB_URI")
+pytestmark = pytest.mark.skipif(not URI, reason="LIVE_TEST_MONGODB_URI is not set")
+
+
+@pytest.fixture
+def db(monkeypatch):
+    import core.db as core_db
+
+    monkeypatch.setenv("MONGODB_URI", URI)
+    monkeypatch.setenv("DB_NAME", f"livetest_{uuid.uuid4().hex[:8]}")
+    monkeypatch.setattr(core_db, "_client", None)
+    monkeypatch.setattr(core_db, "_db", None)
+
+    database = core_db.init_db()
+    yield database
+    database.client.drop_database(database.name)
+
+
+def _evaluation(jd_id: str, score: float, **fields) -> dict:
+    return {
+        "jd_id": jd_id,
+        "resume_id": str(uuid.uuid4()),
+        "candidate_name": f"Candidate {score}",
+        "category_scores": {},
+        "overall_score": score,
+        "candidate_tier": "MODERATE",
+        "provisional": False,
+        "evaluated_at": datetime.utcnow(),
+        "canonical_skills": [],
+        **fields
+    }
+
+
+def _wait_for(subscription, count: int, timeout: float = 10) -> list:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        _, ranking = subscription.drain()
+        if len(ranking) >= count:
+            return ranking
+        time.sleep(0.1)
+    return subscription.drain()[1]
+
+
+def test_change_stream_applies_new_evaluations(db):
+    from core.db import save_evaluation
+    from core.live_results import ResultsSubscription
+
+    jd_id = str(uuid.uuid4())
+    save_evaluation(_evaluation(jd_id, 40))
+
+    subscription = ResultsSubscription(jd_id, top_n=3, poll_seconds=0.2)
+    try:
+        assert subscription.mode == "change_stream"
+        save_evaluation(_evaluation(jd_id, 90))
+        save_evaluation(_evaluation(jd_id, 70))
+
+        ranking = _wait_for(subscription, 3)
+        assert [row["overall_score"] for row in ranking] == [90, 70, 40]
+    finally:
+        subscription.close()
+    assert subscription.closed
+
+
+def test_polling_sees_inserts_with_older_ids(db):
+    from bson import ObjectId
+    from core.db import save_evaluation, get_evaluation_changes
+
+    jd_id = str(uuid.uuid4())
+    save_evaluation(_evaluation(jd_id, 50))
+    _, token = get_evaluation_changes(jd_id, {})
+
+    # Another process's client clock (and so its ObjectId) runs behind
+    older_id = ObjectId.from_datetime(datetime.utcnow() - timedelta(hours=1))
+    save_evaluation(_evaluation(jd_id, 80, _id=older_id))
+
+    changes, token = get_evaluation_changes(jd_id, token)
+    assert [ev["_id"] for ev in changes] == [older_id]
+
+    # Reported once, despite the overlap window
+    changes, _ = get_evaluation_changes(jd_id, token)
+    assert changes == []
+
+
+def test_idle_subscription_stops_itself(db):
+    from core.live_results import ResultsSubscription
+
+    subscription = ResultsSubscription(str(uuid.uuid4()), top_n=3, poll_seconds=0.1, idle_seconds=0.3)
+    subscription._thread.join(timeout=5)
+    assert subscription.closed
+    assert not subscription._thread.is_alive()